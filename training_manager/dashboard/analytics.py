@@ -0,0 +1,121 @@
+# training_manager/dashboard/analytics.py
+"""
+Аналітика прогресу по дисциплінах (NumPy, без Python-циклу по рядках).
+
+Дані тягнемо одним values_list, далі все векторно:
+  • rolling mean за вікном `window`
+  • best-of-N (кращий із останніх N спроб; для бігу — мінімум)
+  • смуга стабільності: rolling mean ± rolling std
+  • темп покращення: нахил лінійної регресії, од./рік (додатний = краще)
+Результат кешується до зміни даних (cache_versions).
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .cache_versions import cached_for
+from .models import AttemptCategory, AttemptVideo
+from .results import lower_is_better
+
+DEFAULT_WINDOW = 5
+DEFAULT_BEST_OF = 3
+DEFAULT_MAX_POINTS = 500
+
+
+def _rolling_mean_std(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Ковзні середнє та std через префіксні суми; на початку ряду вікно коротше."""
+    n = values.size
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(values * values)))
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    count = end - start
+    mean = (csum[end] - csum[start]) / count
+    var = (csum_sq[end] - csum_sq[start]) / count - mean * mean
+    return mean, np.sqrt(np.clip(var, 0.0, None))
+
+
+def _rolling_best(values: np.ndarray, best_of: int, lower_better: bool) -> np.ndarray:
+    worst = np.inf if lower_better else -np.inf
+    padded = np.concatenate((np.full(best_of - 1, worst), values))
+    windows = sliding_window_view(padded, best_of)
+    return windows.min(axis=1) if lower_better else windows.max(axis=1)
+
+
+def _improvement_per_year(days: np.ndarray, values: np.ndarray, lower_better: bool) -> float | None:
+    if values.size < 2 or days[-1] == days[0]:
+        return None
+    slope_per_day = np.polyfit(days, values, 1)[0]
+    rate = round(float(slope_per_day * 365.25), 4)
+    return -rate if lower_better else rate
+
+
+def _downsample_index(n: int, max_points: int) -> np.ndarray:
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+
+
+def _series_for_event(event_type, dates, values, window, best_of, max_points) -> dict:
+    lower_better = lower_is_better(event_type)
+    days = (dates - dates[0]).astype(np.float64)
+
+    mean, std = _rolling_mean_std(values, window)
+    best = _rolling_best(values, best_of, lower_better)
+    idx = _downsample_index(values.size, max_points)
+
+    def _round(arr):
+        return np.round(arr[idx], 3).tolist()
+
+    return {
+        "count": int(values.size),
+        "lower_is_better": lower_better,
+        "improvement_per_year": _improvement_per_year(days, values, lower_better),
+        "personal_best": float(values.min() if lower_better else values.max()),
+        "dates": np.datetime_as_string(dates[idx], unit="D").tolist(),
+        "results": _round(values),
+        "rolling_mean": _round(mean),
+        "best_of_n": _round(best),
+        "band_low": _round(mean - std),
+        "band_high": _round(mean + std),
+    }
+
+
+def compute_progression(
+    attempt_type: str | None = None,
+    window: int = DEFAULT_WINDOW,
+    best_of: int = DEFAULT_BEST_OF,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict:
+    qs = AttemptVideo.objects.filter(result_value__isnull=False)
+    if attempt_type:
+        qs = qs.filter(category__attempt_type=attempt_type)
+    rows = list(
+        qs.order_by("category__date", "id").values_list("category__date", "event_type", "result_value")
+    )
+
+    events = {}
+    if not rows:
+        return {"window": window, "best_of": best_of, "events": events}
+
+    dates_col, events_col, values_col = zip(*rows)
+    dates = np.array(dates_col, dtype="datetime64[D]")
+    event_arr = np.array(events_col)
+    values = np.array(values_col, dtype=np.float64)
+
+    for event_type, _label in AttemptVideo.EventType.choices:
+        mask = event_arr == event_type
+        if mask.any():
+            events[event_type] = _series_for_event(
+                event_type, dates[mask], values[mask], window, best_of, max_points
+            )
+
+    return {"window": window, "best_of": best_of, "events": events}
+
+
+def cached_progression(attempt_type=None, window=DEFAULT_WINDOW, best_of=DEFAULT_BEST_OF, max_points=DEFAULT_MAX_POINTS) -> dict:
+    key = f"progression__{attempt_type or 'all'}__{window}__{best_of}__{max_points}"
+    return cached_for(
+        [AttemptVideo, AttemptCategory],
+        key,
+        lambda: compute_progression(attempt_type, window, best_of, max_points),
+    )
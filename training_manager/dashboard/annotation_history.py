@@ -0,0 +1,143 @@
+# training_manager/dashboard/annotation_history.py
+"""
+Історія версій анотацій (AnnotationRevision).
+
+На кожне збереження з новою версією пишемо дельту — ops (annotation_ops.diff_ops)
+від попереднього стану до нового; фігури в ops уже компактні (shape_codec).
+Повний знімок — для першої версії, коли попередньої версії немає в історії,
+коли дельту не виразити (дублікати id, перестановки) і кожні SNAPSHOT_EVERY
+версій: відновлення = останній знімок + не більше SNAPSHOT_EVERY-1 дельт.
+"""
+from django.db.models import Max
+from django.utils import timezone
+
+from .annotation_ops import diff_ops, replay_ops
+from .models import AnnotationRevision
+
+SNAPSHOT_EVERY = 20
+
+
+def _stored_shapes(data) -> list:
+    shapes = data.get("shapes", []) if isinstance(data, dict) else []
+    return shapes if isinstance(shapes, list) else []
+
+
+def record_revision(annotation, previous) -> AnnotationRevision | None:
+    """
+    post_save анотації. previous — {"data", "version"} до збереження (None — новий запис).
+    Збереження без зміни версії (адмінка, службові оновлення) історію не пишуть.
+    """
+    shapes = _stored_shapes(annotation.data)
+    if previous is None and not shapes:
+        return None
+    if previous is not None and previous["version"] == annotation.version:
+        return None
+
+    history = AnnotationRevision.objects.filter(annotation_id=annotation.pk)
+    last_version = history.aggregate(v=Max("version"))["v"]
+    last_snapshot = history.filter(kind=AnnotationRevision.Kind.SNAPSHOT).aggregate(v=Max("version"))["v"]
+
+    ops = None
+    if (
+        previous is not None
+        and last_version == previous["version"]
+        and last_snapshot is not None
+        and annotation.version - last_snapshot < SNAPSHOT_EVERY
+    ):
+        ops = diff_ops(_stored_shapes(previous["data"]), shapes)
+
+    return AnnotationRevision.objects.create(
+        annotation_id=annotation.pk,
+        version=annotation.version,
+        kind=AnnotationRevision.Kind.SNAPSHOT if ops is None else AnnotationRevision.Kind.DELTA,
+        payload=shapes if ops is None else ops,
+        shapes_count=len(shapes),
+        created_by_id=annotation.updated_by_id,
+    )
+
+
+def revision_shapes(annotation_id: int, version: int) -> list | None:
+    """Компактні фігури версії `version` (None — такої версії в історії немає)."""
+    history = AnnotationRevision.objects.filter(annotation_id=annotation_id)
+    if not history.filter(version=version).exists():
+        return None
+    snapshot = (
+        history.filter(kind=AnnotationRevision.Kind.SNAPSHOT, version__lte=version)
+        .order_by("-version")
+        .only("version", "payload")
+        .first()
+    )
+    if snapshot is None:
+        return None
+    shapes = snapshot.payload
+    deltas = history.filter(version__gt=snapshot.version, version__lte=version).order_by("version")
+    for ops in deltas.values_list("payload", flat=True):
+        shapes = replay_ops(shapes, ops)
+    return shapes
+
+
+def compact_revisions(annotation_id: int, older_than) -> tuple[int, int]:
+    """
+    Проріджує версії, старші за older_than: лишається остання версія кожного дня.
+    Версія, чию попередню видалено, стає знімком (ланцюжок дельт не рветься).
+    Повертає (видалено, перетворено на знімки).
+    """
+    revisions = list(
+        AnnotationRevision.objects.filter(annotation_id=annotation_id)
+        .order_by("version")
+        .only("id", "version", "kind", "payload", "created_at")
+    )
+    if not revisions:
+        return 0, 0
+
+    # остання версія дня серед старих; нові й найостанніша — завжди лишаються
+    keep = {revisions[-1].id}
+    last_of_day = {}
+    for revision in revisions:
+        if revision.created_at >= older_than:
+            keep.add(revision.id)
+        else:
+            last_of_day[timezone.localdate(revision.created_at)] = revision.id
+    keep.update(last_of_day.values())
+
+    to_delete = []
+    to_snapshot = []
+    shapes = None
+    predecessor_kept = True
+    for revision in revisions:
+        if revision.kind == AnnotationRevision.Kind.SNAPSHOT:
+            shapes = revision.payload
+        else:
+            shapes = replay_ops(shapes, revision.payload)
+        if revision.id not in keep:
+            to_delete.append(revision.id)
+            predecessor_kept = False
+            continue
+        if not predecessor_kept and revision.kind == AnnotationRevision.Kind.DELTA:
+            revision.kind = AnnotationRevision.Kind.SNAPSHOT
+            revision.payload = shapes
+            to_snapshot.append(revision)
+        predecessor_kept = True
+
+    AnnotationRevision.objects.filter(id__in=to_delete).delete()
+    AnnotationRevision.objects.bulk_update(to_snapshot, ["kind", "payload"])
+    return len(to_delete), len(to_snapshot)
+
+
+def create_baseline_snapshots(annotation_model, revision_model) -> int:
+    """Міграція: поточний стан наявних анотацій — перший знімок історії."""
+    revisions = [
+        revision_model(
+            annotation_id=annotation.pk,
+            version=annotation.version,
+            kind="snapshot",
+            payload=_stored_shapes(annotation.data),
+            shapes_count=len(_stored_shapes(annotation.data)),
+            created_by_id=annotation.updated_by_id,
+            created_at=annotation.updated_at,
+        )
+        for annotation in annotation_model.objects.all()
+        if _stored_shapes(annotation.data)
+    ]
+    revision_model.objects.bulk_create(revisions, batch_size=500)
+    return len(revisions)
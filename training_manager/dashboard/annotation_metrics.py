@@ -0,0 +1,122 @@
+# training_manager/dashboard/annotation_metrics.py
+"""
+Біомеханічні метрики з фігур анотацій (AnnotationMetric).
+
+"angle" (точки A, B, C; вершина — B) дає кут у градусах, "line" — довжину
+відрізка. Рахуються векторно (NumPy) одразу для всіх фігур пачки анотацій.
+Точки в даних нормовані окремо по ширині й висоті полотна, тож x домножується
+на пропорції кадру (поле "ar" фігури, інакше ANNOTATION_FRAME_ASPECT):
+кути — такі, як на екрані, довжини — у частках висоти кадру.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+
+from .annotation_shapes import shape_seconds
+from .models import AnnotationMetric, AttemptVideoAnnotation
+from .shape_codec import decode_shape, points_array
+
+DEFAULT_FRAME_ASPECT = 16 / 9
+
+# тип фігури -> (вид метрики, потрібна к-сть точок)
+MEASURED_TYPES = {
+    "angle": (AnnotationMetric.Kind.ANGLE, 3),
+    "line": (AnnotationMetric.Kind.LENGTH, 2),
+}
+
+
+def frame_aspect() -> float:
+    return float(getattr(settings, "ANNOTATION_FRAME_ASPECT", DEFAULT_FRAME_ASPECT))
+
+
+def _aspect(shape: dict, default: float) -> float:
+    ar = shape.get("ar")
+    if isinstance(ar, bool) or not isinstance(ar, (int, float)) or not math.isfinite(ar) or ar <= 0:
+        return default
+    return float(ar)
+
+
+def angle_degrees(points: np.ndarray) -> np.ndarray:
+    """(n, 3, 2) -> кут при вершині points[:, 1] у градусах; вироджені кути -> NaN."""
+    v1 = points[:, 0] - points[:, 1]
+    v2 = points[:, 2] - points[:, 1]
+    norms = np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos = np.einsum("ij,ij->i", v1, v2) / norms
+    return np.where(norms > 0, np.degrees(np.arccos(np.clip(cos, -1.0, 1.0))), np.nan)
+
+
+def segment_lengths(points: np.ndarray) -> np.ndarray:
+    """(n, 2, 2) -> довжини відрізків."""
+    return np.linalg.norm(points[:, 1] - points[:, 0], axis=1)
+
+
+def build_metrics(annotations, metric_model=AnnotationMetric, default_aspect: float | None = None) -> list:
+    """
+    annotations — пари (video_id, data). Повертає незбережені рядки метрик:
+    точки всіх фігур збираються в масиви й рахуються за один виклик на вид.
+    """
+    default_aspect = frame_aspect() if default_aspect is None else default_aspect
+    meta = {kind: [] for kind, _n in MEASURED_TYPES.values()}
+    points = {kind: [] for kind, _n in MEASURED_TYPES.values()}
+
+    for video_id, data in annotations:
+        shapes = data.get("shapes") if isinstance(data, dict) else None
+        for shape in shapes if isinstance(shapes, list) else []:
+            if not isinstance(shape, dict) or shape.get("type") not in MEASURED_TYPES:
+                continue
+            kind, needed = MEASURED_TYPES[shape["type"]]
+            pts = points_array(decode_shape(shape).get("pts") or [])
+            if pts is None or len(pts) < needed:
+                continue
+            meta[kind].append((
+                video_id,
+                str(shape.get("id") or "")[:64],
+                str(shape.get("label") or "").strip()[:64],
+                shape_seconds(shape.get("t_start")),
+            ))
+            points[kind].append(pts[:needed] * (_aspect(shape, default_aspect), 1.0))
+
+    compute = {AnnotationMetric.Kind.ANGLE: angle_degrees, AnnotationMetric.Kind.LENGTH: segment_lengths}
+    rows = []
+    for kind, items in meta.items():
+        if not items:
+            continue
+        values = compute[kind](np.stack(points[kind]))
+        for (video_id, shape_id, label, t), value in zip(items, values.tolist()):
+            if math.isfinite(value):
+                rows.append(metric_model(
+                    video_id=video_id, shape_id=shape_id, kind=kind, label=label, value=value, t=t,
+                ))
+    return rows
+
+
+def sync_annotation(annotation, metric_model=AnnotationMetric) -> None:
+    """Перераховує метрики відео анотації (викликається з post_save)."""
+    metric_model.objects.filter(video_id=annotation.video_id).delete()
+    metric_model.objects.bulk_create(build_metrics([(annotation.video_id, annotation.data)], metric_model))
+
+
+def remove_annotation(annotation, metric_model=AnnotationMetric) -> None:
+    metric_model.objects.filter(video_id=annotation.video_id).delete()
+
+
+def rebuild_all(annotation_model=AttemptVideoAnnotation, metric_model=AnnotationMetric, chunk_size: int = 500) -> int:
+    """Повний перерахунок пачками за id. Моделі — параметрами, щоб викликати з міграції."""
+    metric_model.objects.all().delete()
+    default_aspect = frame_aspect()
+    count = 0
+    last_id = 0
+    while True:
+        batch = list(
+            annotation_model.objects.filter(id__gt=last_id).order_by("id").values_list("id", "video_id", "data")[
+                :chunk_size
+            ]
+        )
+        if not batch:
+            return count
+        last_id = batch[-1][0]
+        rows = build_metrics(((video_id, data) for _id, video_id, data in batch), metric_model, default_aspect)
+        metric_model.objects.bulk_create(rows, batch_size=1000)
+        count += len(rows)
@@ -0,0 +1,115 @@
+# training_manager/dashboard/annotation_ops.py
+"""
+Інкрементальні зміни фігур анотації (PATCH /api/videos/<id>/annotations/).
+
+Операції (ключ — `id` фігури):
+  {"op": "add",    "shape": {...}, "index": 3}   # index необов'язковий (інакше — в кінець)
+  {"op": "update", "id": "id-x", "shape": {...}}  # поля зливаються з наявними
+  {"op": "update", "id": "id-x", "shape": {...}, "replace": true}  # фігура замінюється цілком
+  {"op": "delete", "id": "id-x"}
+Порядок у списку = порядок малювання (z-order).
+"""
+
+MAX_OPS_PER_PATCH = 1000
+
+OP_ADD = "add"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+
+class AnnotationOpError(ValueError):
+    """Невалідна операція — відповідь 400."""
+
+
+def _shape_index(shapes: list) -> dict:
+    return {shape.get("id"): i for i, shape in enumerate(shapes) if isinstance(shape, dict)}
+
+
+def apply_ops(shapes: list, ops: list) -> list:
+    """
+    Застосовує ops до копії shapes і повертає новий список.
+    Будь-яка невалідна операція -> AnnotationOpError, нічого не змінюється.
+    """
+    if not isinstance(ops, list) or not ops:
+        raise AnnotationOpError("`ops` must be a non-empty list")
+    if len(ops) > MAX_OPS_PER_PATCH:
+        raise AnnotationOpError(f"Too many ops (max {MAX_OPS_PER_PATCH})")
+    return replay_ops(shapes, ops)
+
+
+def replay_ops(shapes: list, ops: list) -> list:
+    """
+    Застосовує ops без перевірки розміру патча — для вже збережених даних
+    (історія ревізій, перевірка diff_ops). Невалідна операція -> AnnotationOpError.
+    """
+    result = list(shapes)
+    positions = _shape_index(result)
+
+    for n, op in enumerate(ops):
+        if not isinstance(op, dict):
+            raise AnnotationOpError(f"ops[{n}]: must be an object")
+        kind = op.get("op")
+
+        if kind == OP_ADD:
+            shape = op.get("shape")
+            if not isinstance(shape, dict) or not isinstance(shape.get("id"), str):
+                raise AnnotationOpError(f"ops[{n}]: `shape` with string `id` is required")
+            if shape["id"] in positions:
+                raise AnnotationOpError(f"ops[{n}]: shape {shape['id']!r} already exists")
+            index = op.get("index")
+            if isinstance(index, int) and 0 <= index < len(result):
+                result.insert(index, shape)
+            else:
+                result.append(shape)
+
+        elif kind == OP_UPDATE:
+            shape_id = op.get("id")
+            fields = op.get("shape")
+            if shape_id not in positions:
+                raise AnnotationOpError(f"ops[{n}]: unknown shape {shape_id!r}")
+            if not isinstance(fields, dict):
+                raise AnnotationOpError(f"ops[{n}]: `shape` must be an object")
+            i = positions[shape_id]
+            base = {} if op.get("replace") else result[i]
+            result[i] = {**base, **fields, "id": shape_id}
+            continue  # позиції не змінились
+
+        elif kind == OP_DELETE:
+            shape_id = op.get("id")
+            if shape_id not in positions:
+                raise AnnotationOpError(f"ops[{n}]: unknown shape {shape_id!r}")
+            del result[positions[shape_id]]
+
+        else:
+            raise AnnotationOpError(f"ops[{n}]: unknown op {kind!r}")
+
+        # після вставки/видалення індекси зсуваються
+        positions = _shape_index(result)
+
+    return result
+
+
+def diff_ops(old: list, new: list) -> list | None:
+    """
+    Операції, що перетворюють old на new (update — з повною заміною фігури).
+    None — якщо різницю не виразити через ops (дублікати id, перестановки);
+    тоді треба зберігати повний стан.
+    """
+    old_by_id = {s.get("id"): s for s in old if isinstance(s, dict)}
+    new_ids = [s.get("id") for s in new if isinstance(s, dict)]
+    if len(old_by_id) != len(old) or len(set(new_ids)) != len(new) or None in old_by_id or None in new_ids:
+        return None
+
+    new_id_set = set(new_ids)
+    ops = [{"op": OP_DELETE, "id": shape_id} for shape_id in old_by_id if shape_id not in new_id_set]
+    for index, shape in enumerate(new):
+        before = old_by_id.get(shape["id"])
+        if before is None:
+            ops.append({"op": OP_ADD, "shape": shape, "index": index})
+        elif before != shape:
+            ops.append({"op": OP_UPDATE, "id": shape["id"], "shape": shape, "replace": True})
+
+    # перестановки ops не виражають — перевіряємо, що результат збігається
+    if replay_ops(old, ops) != new:
+        return None
+    return ops
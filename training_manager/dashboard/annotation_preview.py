@@ -0,0 +1,134 @@
+# training_manager/dashboard/annotation_preview.py
+"""
+SVG-мініатюри анотацій для списків (annotations_list, category_detail).
+
+Фігури рендеряться на сервері в невеликий inline-SVG — без редактора й відео.
+Кеш — за (video_id, updated_at): будь-яке збереження анотації змінює updated_at,
+тож старі мініатюри просто перестають читатися. Для сторінки — один
+cache.get_many і один запит за data лише тих анотацій, яких у кеші немає.
+"""
+import math
+import re
+
+import numpy as np
+from django.core.cache import cache
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .annotation_metrics import frame_aspect
+from .models import AttemptVideoAnnotation
+from .shape_codec import decode_shape, points_array, rdp_mask
+
+PREVIEW_WIDTH = 160
+PREVIEW_CACHE_TTL = 60 * 60 * 24 * 7
+PREVIEW_FORMAT = 1  # змінити при зміні рендера — старі записи кешу стануть непотрібні
+EDITOR_WIDTH = 640  # типова ширина полотна редактора: від неї масштабується товщина
+
+DEFAULT_COLOR = "#10b981"
+_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{3,8}$")
+
+
+def _preview_key(video_id: int, updated_at) -> str:
+    return f"annotation_svg__{PREVIEW_FORMAT}__{video_id}__{int(updated_at.timestamp() * 1_000_000)}"
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _points_attr(points) -> str:
+    return " ".join(f"{_fmt(x)},{_fmt(y)}" for x, y in points)
+
+
+def _shape_svg(shape: dict, width: int, height: int) -> str:
+    points = points_array(decode_shape(shape).get("pts") or [])
+    if points is None or len(points) < 2 or not np.isfinite(points).all():
+        return ""
+    points = points * (width, height)
+    kind = shape.get("type")
+    color = shape.get("color")
+    if not isinstance(color, str) or not _COLOR_RE.match(color):
+        color = DEFAULT_COLOR
+    line_width = shape.get("width") if isinstance(shape.get("width"), (int, float)) else 2
+    stroke = max(0.75, min(float(line_width), 12.0) * width / EDITOR_WIDTH)
+    attrs = f'stroke="{escape(color)}" stroke-width="{_fmt(stroke)}"'
+    (x1, y1), (x2, y2) = points[0], points[1]
+
+    if kind == "line":
+        return f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}" {attrs}/>'
+    if kind == "arrow":
+        # вістря — як у редакторі: два відрізки під кутом π/7
+        angle = math.atan2(y2 - y1, x2 - x1)
+        head = max(3.0, stroke * 4)
+        barbs = [
+            (x2 - head * math.cos(angle + side * math.pi / 7), y2 - head * math.sin(angle + side * math.pi / 7))
+            for side in (-1, 1)
+        ]
+        return (
+            f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}" {attrs}/>'
+            f'<polyline points="{_points_attr([barbs[0], (x2, y2), barbs[1]])}" {attrs}/>'
+        )
+    if kind == "rect":
+        return (
+            f'<rect x="{_fmt(min(x1, x2))}" y="{_fmt(min(y1, y2))}" '
+            f'width="{_fmt(abs(x2 - x1))}" height="{_fmt(abs(y2 - y1))}" {attrs}/>'
+        )
+    if kind == "circle":
+        return f'<circle cx="{_fmt(x1)}" cy="{_fmt(y1)}" r="{_fmt(math.hypot(x2 - x1, y2 - y1))}" {attrs}/>'
+    if kind == "angle":
+        return f'<polyline points="{_points_attr(points[:3])}" {attrs}/>'
+    if kind == "freehand":
+        # на мініатюрі вистачає точності пів пікселя
+        return f'<polyline points="{_points_attr(points[rdp_mask(points, 0.5)])}" {attrs}/>'
+    return ""
+
+
+def render_svg(shapes: list) -> str:
+    """Список фігур (компактних або ні) -> SVG-рядок; без фігур — ""."""
+    width = PREVIEW_WIDTH
+    height = round(width / frame_aspect())
+    body = "".join(_shape_svg(shape, width, height) for shape in shapes if isinstance(shape, dict))
+    if not body:
+        return ""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" fill="none" stroke-linecap="round" stroke-linejoin="round">'
+        f"{body}</svg>"
+    )
+
+
+def preview_svgs(pairs) -> dict:
+    """
+    pairs — (video_id, annotation_updated_at). Повертає {video_id: SVG}
+    (без ключа — анотація порожня). Рендер і запит до БД — лише для промахів кешу.
+    """
+    keys = {_preview_key(video_id, updated_at): video_id for video_id, updated_at in pairs if updated_at}
+    if not keys:
+        return {}
+    found = cache.get_many(list(keys))
+    result = {keys[key]: svg for key, svg in found.items()}
+
+    missing = [video_id for key, video_id in keys.items() if key not in found]
+    if missing:
+        fresh = {}
+        rows = AttemptVideoAnnotation.objects.filter(video_id__in=missing).values_list("video_id", "updated_at", "data")
+        for video_id, updated_at, data in rows:
+            shapes = data.get("shapes") if isinstance(data, dict) else None
+            svg = render_svg(shapes if isinstance(shapes, list) else [])
+            fresh[_preview_key(video_id, updated_at)] = svg  # порожній рядок теж кешуємо
+            result[video_id] = svg
+        cache.set_many(fresh, PREVIEW_CACHE_TTL)
+
+    return {video_id: mark_safe(svg) for video_id, svg in result.items() if svg}
+
+
+def attach_previews(videos) -> list:
+    """
+    Ставить video.annotation_preview (SVG або None); у videos має бути
+    анотоване поле annotation_updated_at. Повертає список відео.
+    """
+    videos = list(videos)
+    svgs = preview_svgs((video.id, video.annotation_updated_at) for video in videos)
+    for video in videos:
+        video.annotation_preview = svgs.get(video.id)
+    return videos
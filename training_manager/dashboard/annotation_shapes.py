@@ -0,0 +1,75 @@
+# training_manager/dashboard/annotation_shapes.py
+"""
+Індекс фігур анотацій за часом відео (AnnotationShape).
+
+Кожна фігура може мати необов'язкові "t_start"/"t_end" (секунди відео).
+Після збереження анотації рядки її фігур перебудовуються (signals.py);
+вибірка за вікном часу — один індексований запит по (annotation, t_start, t_end).
+"""
+import math
+
+from django.db.models import Q
+
+from .models import AnnotationShape, AttemptVideoAnnotation
+from .shape_codec import decode_shape
+
+
+def shape_seconds(value) -> float | None:
+    """t_start/t_end фігури -> секунди відео; не число, NaN чи від'ємне -> None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if math.isfinite(value) and value >= 0 else None
+
+
+def _shape_rows(annotation, shape_model) -> list:
+    shapes = annotation.data.get("shapes", []) if isinstance(annotation.data, dict) else []
+    rows = []
+    for position, shape in enumerate(shapes if isinstance(shapes, list) else []):
+        if not isinstance(shape, dict):
+            continue
+        rows.append(shape_model(
+            annotation_id=annotation.pk,
+            shape_id=str(shape.get("id") or "")[:64],
+            position=position,
+            shape_type=str(shape.get("type") or "")[:16],
+            t_start=shape_seconds(shape.get("t_start")),
+            t_end=shape_seconds(shape.get("t_end")),
+            data=shape,
+        ))
+    return rows
+
+
+def sync_annotation(annotation, shape_model=AnnotationShape) -> None:
+    """Перебудовує рядки однієї анотації (викликається з post_save)."""
+    shape_model.objects.filter(annotation_id=annotation.pk).delete()
+    shape_model.objects.bulk_create(_shape_rows(annotation, shape_model))
+
+
+def rebuild_all(annotation_model=AttemptVideoAnnotation, shape_model=AnnotationShape, chunk_size: int = 500) -> int:
+    """Повна перебудова пачками за id. Моделі — параметрами, щоб викликати з міграції."""
+    shape_model.objects.all().delete()
+    count = 0
+    last_id = 0
+    while True:
+        batch = list(annotation_model.objects.filter(id__gt=last_id).order_by("id").only("id", "data")[:chunk_size])
+        if not batch:
+            return count
+        last_id = batch[-1].id
+        rows = [row for annotation in batch for row in _shape_rows(annotation, shape_model)]
+        shape_model.objects.bulk_create(rows, batch_size=1000)
+        count += len(rows)
+
+
+def shapes_in_window(annotation_id: int, t_from: float, t_to: float) -> list:
+    """
+    Фігури, видимі хоча б частину вікна [t_from, t_to], у порядку малювання.
+    Фігури без часу видимі завжди.
+    """
+    rows = (
+        AnnotationShape.objects.filter(annotation_id=annotation_id)
+        .filter(Q(t_start__isnull=True) | Q(t_start__lte=t_to))
+        .filter(Q(t_end__isnull=True) | Q(t_end__gte=t_from))
+        .order_by("position")
+        .values_list("data", flat=True)
+    )
+    return [decode_shape(shape) for shape in rows]
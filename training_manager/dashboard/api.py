@@ -0,0 +1,133 @@
+# training_manager/dashboard/api.py
+"""
+REST API v1 (лише читання): категорії, відео, анотації.
+
+  • cursor-пагінація (стабільна при вставках, без OFFSET/COUNT)
+  • ?fields=a,b,c — sparse fieldsets
+  • слабкий ETag з поколінь кешу (cache_versions): If-None-Match перевіряється
+    ДО запиту в БД, тож повторна валідація коштує лише читання лічильників
+  • автентифікація: сесія або JWT (authentication.py)
+"""
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import routers, status, viewsets
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from .cache_versions import generation_token
+from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+from .serializers import (
+    AnnotationSerializer,
+    CategorySerializer,
+    VideoSerializer,
+    requested_fields,
+)
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+
+class ApiCursorPagination(CursorPagination):
+    page_size = API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = API_MAX_PAGE_SIZE
+    ordering = ("-id",)
+
+
+class CategoryCursorPagination(ApiCursorPagination):
+    # індекс на date (+ rowid) читається задом наперед
+    ordering = ("-date", "-id")
+
+
+class GenerationETagMixin:
+    """
+    Слабкий ETag = хеш(шлях із query + формат + покоління etag_models).
+    Дані API не залежать від користувача, тож ключ спільний для всіх.
+    """
+    etag_models = ()
+
+    def _etag(self, request) -> str:
+        raw = "|".join((
+            request.version or "",
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            generation_token(*self.etag_models),
+        ))
+        return f'W/"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def _conditional(self, request, build_response):
+        etag = self._etag(request)
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        # слабке порівняння: W/ префікс ігнорується
+        if "*" in client_etags or etag.removeprefix("W/") in {e.removeprefix("W/") for e in client_etags}:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = build_response()
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, lambda: super(GenerationETagMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, lambda: super(GenerationETagMixin, self).retrieve(request, *args, **kwargs))
+
+
+class ApiRootView(GenerationETagMixin, routers.APIRootView):
+    """Корінь /api/v1/ — список ресурсів; ETag лише від шляху й формату."""
+
+    def get(self, request, *args, **kwargs):
+        return self._conditional(request, lambda: super(ApiRootView, self).get(request, *args, **kwargs))
+
+
+class CategoryViewSet(GenerationETagMixin, viewsets.ReadOnlyModelViewSet):
+    """?attempt_type=training|competition"""
+    serializer_class = CategorySerializer
+    pagination_class = CategoryCursorPagination
+    # лічильники/кращий результат оновлюються разом із відео
+    etag_models = (AttemptCategory, AttemptVideo)
+
+    def get_queryset(self):
+        qs = AttemptCategory.objects.all()
+        attempt_type = self.request.query_params.get("attempt_type")
+        if attempt_type in AttemptCategory.AttemptType.values:
+            qs = qs.filter(attempt_type=attempt_type)
+        return qs
+
+
+class VideoViewSet(GenerationETagMixin, viewsets.ReadOnlyModelViewSet):
+    """?category=<id>, ?event=run|jump|throw"""
+    serializer_class = VideoSerializer
+    pagination_class = ApiCursorPagination
+    etag_models = (AttemptVideo, AttemptCategory)
+
+    def get_queryset(self):
+        qs = AttemptVideo.objects.select_related("category")
+        params = self.request.query_params
+        if params.get("category", "").isdigit():
+            qs = qs.filter(category_id=int(params["category"]))
+        if params.get("event") in AttemptVideo.EventType.values:
+            qs = qs.filter(event_type=params["event"])
+        return qs
+
+
+class AnnotationViewSet(GenerationETagMixin, viewsets.ReadOnlyModelViewSet):
+    """?video=<id>, ?category=<id>"""
+    serializer_class = AnnotationSerializer
+    pagination_class = ApiCursorPagination
+    etag_models = (AttemptVideoAnnotation, AttemptVideo)
+
+    def get_queryset(self):
+        qs = AttemptVideoAnnotation.objects.select_related("video", "updated_by")
+        params = self.request.query_params
+        if params.get("video", "").isdigit():
+            qs = qs.filter(video_id=int(params["video"]))
+        if params.get("category", "").isdigit():
+            qs = qs.filter(video__category_id=int(params["category"]))
+        wanted = requested_fields(self.request)
+        if wanted is not None and "shapes" not in wanted:
+            # JSON з фігурами — найважча колонка; не читаємо, якщо не просили
+            qs = qs.defer("data")
+        return qs
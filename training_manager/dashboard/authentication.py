@@ -0,0 +1,21 @@
+# training_manager/dashboard/authentication.py
+"""
+Автентифікація REST API (settings.REST_FRAMEWORK).
+
+Окремий модуль, бо DRF імпортує DEFAULT_AUTHENTICATION_CLASSES під час
+ініціалізації rest_framework.views — тут не можна імпортувати viewset-и.
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class CookieJWTAuthentication(JWTAuthentication):
+    """JWT із заголовка Authorization, а якщо його немає — з HttpOnly-куки access_token."""
+
+    def authenticate(self, request):
+        if self.get_header(request) is not None:
+            return super().authenticate(request)
+        raw_token = request.COOKIES.get("access_token")
+        if not raw_token:
+            return None
+        validated = self.get_validated_token(raw_token)
+        return self.get_user(validated), validated
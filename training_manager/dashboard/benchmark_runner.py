@@ -0,0 +1,234 @@
+# training_manager/dashboard/benchmark_runner.py
+"""
+Навантажувальний прогін основних сторінок (`manage.py run_benchmark`).
+
+Сценарій — функція rng -> URL: адреси генеруються наперед з фіксованим seed,
+тож кожен прогін ходить тими самими сторінками в тому самому порядку. Запити
+шле пул потоків через один із транспортів:
+  • client — django.test.Client у процесі (без мережі й сервера);
+  • http   — справжній HTTP: вбудований ThreadedWSGIServer з runserver або
+             зовнішній сервер за --base-url (тоді та сама БД — для сесії).
+Результат — dict для JSON: p50/p95/p99, середнє, пропускна здатність, статуси.
+"""
+import platform
+import socket
+import subprocess
+import threading
+import time
+from collections import Counter
+
+import django
+import requests
+from django.conf import settings
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .benchmark_seed import BENCHMARK_PLACE_PREFIX, PLACES
+from .metrics import latency_summary
+from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+
+LIBRARY_SORTS = ["date_desc", "date_asc", "place_asc", "type_desc", "videos_desc"]
+BATCH_IDS = 50
+
+
+def _request_host() -> str:
+    """Host, який пропустить ALLOWED_HOSTS (test Client за замовчуванням шле "testserver")."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def build_scenarios() -> dict:
+    """Назва -> функція rng -> URL. Id беруться з БД один раз (перевага — дані бенчмарку)."""
+    categories = list(
+        AttemptCategory.objects.filter(place__startswith=BENCHMARK_PLACE_PREFIX).values_list("id", flat=True)
+    ) or list(AttemptCategory.objects.values_list("id", flat=True)[:1000])
+    videos = list(AttemptVideo.objects.filter(category_id__in=categories).values_list("id", flat=True)[:5000])
+    annotated = list(
+        AttemptVideoAnnotation.objects.filter(video_id__in=videos).values_list("video_id", flat=True)[:5000]
+    )
+    pages = max(1, len(categories) // 12)
+
+    scenarios = {
+        "index": lambda rng: reverse("index"),
+        "library": lambda rng: f"{reverse('library')}?sort={rng.choice(LIBRARY_SORTS)}&page={rng.randint(1, pages)}",
+        "leaderboard": lambda rng: reverse("leaderboard"),
+        "search": lambda rng: f"{reverse('search')}?q={rng.choice(PLACES)}",
+        "annotations_list": lambda rng: f"{reverse('annotations_list')}?page={rng.randint(1, 5)}",
+        "export_ndjson": lambda rng: f"{reverse('export_attempts', args=['ndjson'])}?season={rng.choice([2023, 2024, 2025])}",
+    }
+    if categories:
+        scenarios["category_detail"] = lambda rng: reverse("category_detail", args=[rng.choice(categories)])
+    if annotated:
+        scenarios["annotations_api"] = lambda rng: reverse("annotations_api", args=[rng.choice(annotated)])
+    if videos:
+        scenarios["annotations_batch"] = lambda rng: (
+            f"{reverse('annotations_batch')}?ids={','.join(map(str, rng.sample(videos, min(BATCH_IDS, len(videos)))))}"
+        )
+    return scenarios
+
+
+# -------------------------
+# Транспорти: один екземпляр на потік
+# -------------------------
+class ClientTransport:
+    def __init__(self, user):
+        self.client = Client(HTTP_HOST=_request_host())
+        self.client.force_login(user)
+
+    def get(self, url: str) -> int:
+        response = self.client.get(url)
+        if response.streaming:
+            for _chunk in response.streaming_content:
+                pass
+        return response.status_code
+
+    def close(self) -> None:
+        connections.close_all()
+
+
+class HttpTransport:
+    def __init__(self, base_url: str, session_cookie: str):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers["Cookie"] = f"{settings.SESSION_COOKIE_NAME}={session_cookie}"
+        if "://127.0.0.1" in self.base_url or "://localhost" in self.base_url:
+            self.session.headers["Host"] = _request_host()
+
+    def get(self, url: str) -> int:
+        response = self.session.get(self.base_url + url, allow_redirects=False, timeout=60)
+        response.content  # тіло теж входить у час
+        return response.status_code
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def setup(self):
+        super().setup()
+        # без TCP_NODELAY дрібні записи відповіді впираються в delayed ACK (~40 мс на запит)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EmbeddedServer:
+    """ThreadedWSGIServer із runserver на випадковому порту, у фоновому потоці."""
+
+    def __init__(self):
+        self.httpd = ThreadedWSGIServer(("127.0.0.1", 0), _QuietHandler, allow_reuse_address=False)
+        self.httpd.set_app(get_internal_wsgi_application())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def session_cookie(user) -> str:
+    """Сесія для HTTP-транспорту — через force_login, як у тестах (OTP-вхід тут ні до чого)."""
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+# -------------------------
+# Прогін
+# -------------------------
+def run_scenario(make_transport, urls: list, concurrency: int, warmup: int) -> dict:
+    """
+    urls — уже згенеровані адреси; перші `warmup` виконуються послідовно й не
+    рахуються (прогрів кешу, з'єднань, шаблонів). Решта — `concurrency` потоками.
+    """
+    warmup_urls, timed_urls = urls[:warmup], urls[warmup:]
+    transport = make_transport()
+    try:
+        for url in warmup_urls:
+            transport.get(url)
+    finally:
+        transport.close()
+
+    latencies = []
+    statuses = Counter()
+    errors = []
+    lock = threading.Lock()
+    next_index = iter(range(len(timed_urls)))
+
+    def worker(transport):
+        local_latencies, local_statuses = [], Counter()
+        try:
+            while True:
+                with lock:
+                    index = next(next_index, None)
+                if index is None:
+                    break
+                started = time.perf_counter()
+                try:
+                    local_statuses[transport.get(timed_urls[index])] += 1
+                except Exception as exc:
+                    local_statuses["exception"] += 1
+                    with lock:
+                        if len(errors) < 5:
+                            errors.append(f"{timed_urls[index]}: {exc!r}")
+                local_latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            transport.close()
+            with lock:
+                latencies.extend(local_latencies)
+                statuses.update(local_statuses)
+
+    # транспорти (логін тощо) — до старту відліку
+    threads = [threading.Thread(target=worker, args=(make_transport(),)) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    failed = sum(count for status, count in statuses.items() if status == "exception" or status >= 400)
+    return {
+        "requests": len(timed_urls),
+        "errors": failed,
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(timed_urls) / wall, 2) if wall else None,
+        "latency_ms": latency_summary(latencies),
+        **({"error_samples": errors} if errors else {}),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, cwd=settings.BASE_DIR,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "started_at": timezone.now().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": settings.DATABASES["default"]["ENGINE"],
+        "debug": settings.DEBUG,
+        "dataset": {
+            "categories": AttemptCategory.objects.count(),
+            "videos": AttemptVideo.objects.count(),
+            "annotations": AttemptVideoAnnotation.objects.count(),
+        },
+    }
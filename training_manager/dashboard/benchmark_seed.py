@@ -0,0 +1,198 @@
+# training_manager/dashboard/benchmark_seed.py
+"""
+Синтетичні дані для навантажувальних замірів (`manage.py seed_benchmark`).
+
+Категорії, відео й анотації створюються bulk_create-ом пачками; генератор
+random.Random(seed) — той самий seed дає ті самі дані, тож прогони
+run_benchmark порівнянні між собою. Файли відео — крихітні заглушки в
+MEDIA_ROOT/attempt_videos/benchmark/ (view читають лише шлях).
+
+bulk_create не викликає save() і сигнали, тому тут же рахуються result_value/
+points, перший знімок історії, а похідні таблиці (підсумки категорій, BestResult,
+пошук, фігури, метрики) перебудовуються тими самими функціями, що й у міграціях.
+"""
+import math
+import os
+import random
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import annotation_metrics, annotation_shapes, best_results, category_stats, search
+from .cache_versions import bump_generation
+from .models import AnnotationRevision, AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+from .results import parse_result
+from .scoring import points_for
+from .shape_codec import data_from_shapes
+
+BENCHMARK_PLACE_PREFIX = "Benchmark "
+BENCHMARK_VIDEO_DIR = "attempt_videos/benchmark"
+BENCHMARK_USERNAME = "benchmark"
+# мінімальний заголовок MP4 (ftyp) — досить, щоб файл не був порожнім
+PLACEHOLDER_BYTES = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+PLACES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро", "Ужгород", "Луцьк", "Berlin", "Warszawa", "Praha"]
+SHAPE_TYPES = ["line", "angle", "arrow", "rect", "circle", "freehand"]
+MEASURED_TYPES = ["angle", "line"]
+COLORS = ["#ef4444", "#10b981", "#3b82f6", "#f59e0b", "#a855f7"]
+LABELS = ["knee", "hip", "elbow", "trunk", ""]
+# дати відраховуються від фіксованого дня, а не від сьогодні — інакше дані плавали б між днями
+END_DATE = date(2025, 6, 30)
+
+
+def _result(rng: random.Random, event_type: str) -> str:
+    if event_type == AttemptVideo.EventType.RUN:
+        return f"{rng.uniform(10.4, 13.5):.2f}"
+    if event_type == AttemptVideo.EventType.JUMP:
+        return f"{rng.uniform(5.2, 7.8):.2f}"
+    return f"{rng.uniform(9.0, 19.0):.2f}"
+
+
+def _shape(rng: random.Random, index: int, duration: float, kind: str | None = None) -> dict:
+    """Фігура у форматі редактора (annotate_video.html): точки — {"x", "y"} у частках кадру."""
+    kind = kind or rng.choice(SHAPE_TYPES)
+    if kind == "freehand":
+        # плавна крива з шумом — як рука на планшеті
+        x, y = rng.uniform(0.1, 0.6), rng.uniform(0.1, 0.9)
+        heading = rng.uniform(0, 2 * math.pi)
+        pts = []
+        for _ in range(rng.randint(20, 80)):
+            heading += rng.uniform(-0.3, 0.3)
+            x = min(max(x + 0.01 * math.cos(heading), 0.0), 1.0)
+            y = min(max(y + 0.01 * math.sin(heading), 0.0), 1.0)
+            pts.append({"x": round(x, 4), "y": round(y, 4)})
+    else:
+        pts = [{"x": round(rng.random(), 4), "y": round(rng.random(), 4)} for _ in range(3 if kind == "angle" else 2)]
+    t_start = round(rng.uniform(0, duration), 2)
+    return {
+        "id": f"b{index}",
+        "type": kind,
+        "pts": pts,
+        "color": rng.choice(COLORS),
+        "width": rng.choice([2, 3, 4]),
+        "t_start": t_start,
+        "t_end": round(t_start + rng.uniform(0.5, 3.0), 2),
+        "label": rng.choice(LABELS) if kind in ("angle", "line") else "",
+    }
+
+
+def _shapes(rng: random.Random, max_shapes: int) -> list:
+    # перша фігура — кут чи відрізок, як у справжніх розборах: у кожної анотації є метрики
+    count = rng.randint(1, max_shapes)
+    return [_shape(rng, i, 10.0, kind=rng.choice(MEASURED_TYPES) if i == 0 else None) for i in range(count)]
+
+
+def _write_placeholders(names) -> None:
+    directory = os.path.join(settings.MEDIA_ROOT, BENCHMARK_VIDEO_DIR)
+    os.makedirs(directory, exist_ok=True)
+    for name in names:
+        with open(os.path.join(settings.MEDIA_ROOT, name), "wb") as fh:
+            fh.write(PLACEHOLDER_BYTES)
+
+
+def benchmark_user() -> User:
+    """Користувач для даних і прогонів бенчмарку (без пароля — лише force_login)."""
+    user, created = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    return user
+
+
+def clear() -> int:
+    """Видаляє раніше згенеровані категорії (з відео й анотаціями каскадом)."""
+    deleted, _by_model = AttemptCategory.objects.filter(place__startswith=BENCHMARK_PLACE_PREFIX).delete()
+    return deleted
+
+
+def seed(
+    categories: int,
+    videos_per_category: int,
+    annotated: float = 0.6,
+    max_shapes: int = 12,
+    seasons: int = 3,
+    random_seed: int = 42,
+    batch_size: int = 1000,
+    files: bool = True,
+) -> dict:
+    """Створює дані; повертає к-сть створених рядків за типами (metrics — усі рядки AnnotationMetric)."""
+    rng = random.Random(random_seed)
+    user = benchmark_user()
+    first_day = END_DATE - timedelta(days=365 * seasons)
+
+    with transaction.atomic():
+        new_categories = AttemptCategory.objects.bulk_create(
+            [
+                AttemptCategory(
+                    attempt_type=rng.choice(AttemptCategory.AttemptType.values),
+                    place=f"{BENCHMARK_PLACE_PREFIX}{rng.choice(PLACES)} #{n}",
+                    date=first_day + timedelta(days=rng.randrange((END_DATE - first_day).days + 1)),
+                    rank=rng.randint(1, 5) if rng.random() < 0.5 else None,
+                )
+                for n in range(categories)
+            ],
+            batch_size=batch_size,
+        )
+
+        videos = []
+        for category in new_categories:
+            for n in range(videos_per_category):
+                event_type = rng.choice(AttemptVideo.EventType.values)
+                result = _result(rng, event_type)
+                value = parse_result(result)
+                videos.append(AttemptVideo(
+                    category=category,
+                    video=f"{BENCHMARK_VIDEO_DIR}/c{category.pk}_{n + 1}.mp4",
+                    event_type=event_type,
+                    result=result,
+                    result_value=value,
+                    points=points_for(event_type, value),
+                    attempt_number=n + 1,
+                    place_in_protocol=rng.randint(1, 12) if category.attempt_type == "competition" else None,
+                ))
+        videos = AttemptVideo.objects.bulk_create(videos, batch_size=batch_size)
+
+        annotations = [
+            AttemptVideoAnnotation(
+                video=video,
+                data=data_from_shapes(_shapes(rng, max_shapes)),
+                updated_by=user,
+                version=1,
+            )
+            for video in videos
+            if rng.random() < annotated
+        ]
+        annotations = AttemptVideoAnnotation.objects.bulk_create(annotations, batch_size=batch_size)
+        AnnotationRevision.objects.bulk_create(
+            [
+                AnnotationRevision(
+                    annotation_id=annotation.pk,
+                    version=annotation.version,
+                    kind=AnnotationRevision.Kind.SNAPSHOT,
+                    payload=annotation.data["shapes"],
+                    shapes_count=len(annotation.data["shapes"]),
+                    created_by=user,
+                )
+                for annotation in annotations
+            ],
+            batch_size=batch_size,
+        )
+
+        category_stats.reconcile()
+        best_results.rebuild_all()
+        search.rebuild_index()
+        annotation_shapes.rebuild_all()
+        metrics = annotation_metrics.rebuild_all()
+        for model in (AttemptCategory, AttemptVideo, AttemptVideoAnnotation):
+            bump_generation(model)
+
+    if files:
+        _write_placeholders(video.video.name for video in videos)
+    return {
+        "categories": len(new_categories),
+        "videos": len(videos),
+        "annotations": len(annotations),
+        "metrics": metrics,
+    }
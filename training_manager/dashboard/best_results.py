@@ -0,0 +1,138 @@
+# training_manager/dashboard/best_results.py
+"""
+Підтримка таблиці BestResult (PB / найкращий результат сезону).
+
+Кошик = (event_type, attempt_type, season). Сигнали викликають on_* нижче;
+кожен виклик торкається лише свого кошика, тож вартість не залежить від
+розміру бібліотеки.
+"""
+from django.db import transaction
+
+from .models import AttemptCategory, AttemptVideo, BestResult
+from .results import is_better, lower_is_better
+
+
+def bucket_key(event_type: str, attempt_type: str, date) -> tuple:
+    return event_type, attempt_type, date.year
+
+
+def _bucket_filter(key: tuple) -> dict:
+    event_type, attempt_type, season = key
+    return {"event_type": event_type, "attempt_type": attempt_type, "season": season}
+
+
+def recompute_bucket(key: tuple) -> None:
+    """Перераховує один кошик запитом до AttemptVideo (ORDER BY result_value LIMIT 1)."""
+    event_type, attempt_type, season = key
+    order = "result_value" if lower_is_better(event_type) else "-result_value"
+    best = (
+        AttemptVideo.objects.filter(
+            event_type=event_type,
+            category__attempt_type=attempt_type,
+            category__date__year=season,
+            result_value__isnull=False,
+        )
+        .order_by(order, "id")
+        .values_list("id", "result_value")
+        .first()
+    )
+    if best is None:
+        BestResult.objects.filter(**_bucket_filter(key)).delete()
+        return
+    video_id, value = best
+    BestResult.objects.update_or_create(
+        **_bucket_filter(key),
+        defaults={"video_id": video_id, "result_value": value},
+    )
+
+
+def on_video_saved(video: AttemptVideo, previous: dict | None) -> None:
+    category = video.category
+    key = bucket_key(video.event_type, category.attempt_type, category.date)
+
+    # відео переїхало в інший кошик (інша дисципліна/категорія) і було там рекордом
+    if previous:
+        old_key = bucket_key(
+            previous["event_type"],
+            previous["category__attempt_type"],
+            previous["category__date"],
+        )
+        if old_key != key and BestResult.objects.filter(
+            **_bucket_filter(old_key), video_id=video.pk
+        ).exists():
+            recompute_bucket(old_key)
+
+    current = BestResult.objects.filter(**_bucket_filter(key)).first()
+    value = video.result_value
+
+    if current is not None and current.video_id == video.pk:
+        if value is not None and not is_better(video.event_type, current.result_value, value):
+            # рекордсмен не погіршився — лише оновлюємо значення
+            if value != current.result_value:
+                current.result_value = value
+                current.save(update_fields=["result_value", "updated_at"])
+        else:
+            recompute_bucket(key)
+        return
+
+    if value is not None and (
+        current is None or is_better(video.event_type, value, current.result_value)
+    ):
+        BestResult.objects.update_or_create(
+            **_bucket_filter(key),
+            defaults={"video_id": video.pk, "result_value": value},
+        )
+
+
+def on_video_deleted(video: AttemptVideo) -> None:
+    category = video.category
+    key = bucket_key(video.event_type, category.attempt_type, category.date)
+    # рядок кошика або вказує на інше відео (нічого не змінилось),
+    # або вже видалений каскадом / вказує на це відео — перераховуємо
+    if not BestResult.objects.filter(**_bucket_filter(key)).exclude(video_id=video.pk).exists():
+        recompute_bucket(key)
+
+
+def on_category_saved(category: AttemptCategory, previous: dict | None) -> None:
+    if not previous:
+        return  # нова категорія ще не має відео
+    old = (previous["attempt_type"], previous["date"].year)
+    new = (category.attempt_type, category.date.year)
+    if old == new:
+        return
+    for event_type, _label in AttemptVideo.EventType.choices:
+        recompute_bucket((event_type, *old))
+        recompute_bucket((event_type, *new))
+
+
+def on_category_deleted(category: AttemptCategory) -> None:
+    for event_type, _label in AttemptVideo.EventType.choices:
+        key = bucket_key(event_type, category.attempt_type, category.date)
+        if not BestResult.objects.filter(**_bucket_filter(key)).exists():
+            recompute_bucket(key)
+
+
+def rebuild_all(video_model=AttemptVideo, best_model=BestResult) -> int:
+    """
+    Повний перерахунок за один прохід по відео.
+    Моделі передаються параметрами, щоб функцію можна було викликати з міграції.
+    """
+    best = {}
+    rows = (
+        video_model.objects.filter(result_value__isnull=False)
+        .order_by("id")
+        .values_list("id", "event_type", "category__attempt_type", "category__date", "result_value")
+    )
+    for video_id, event_type, attempt_type, date, value in rows.iterator(chunk_size=2000):
+        key = bucket_key(event_type, attempt_type, date)
+        current = best.get(key)
+        if current is None or is_better(event_type, value, current[1]):
+            best[key] = (video_id, value)
+
+    with transaction.atomic():
+        best_model.objects.all().delete()
+        best_model.objects.bulk_create(
+            best_model(**_bucket_filter(key), video_id=video_id, result_value=value)
+            for key, (video_id, value) in best.items()
+        )
+    return len(best)
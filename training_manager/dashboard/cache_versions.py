@@ -0,0 +1,62 @@
+# training_manager/dashboard/cache_versions.py
+"""
+Версіонування кешу «поколіннями».
+
+Для кожної моделі в кеші лежить лічильник; сигнали post_save/post_delete
+збільшують його після коміту транзакції. Ключі закешованих queryset-ів і
+фрагментів шаблонів містять поточні покоління, тож після зміни даних старі
+записи просто перестають читатися і доживають свій TTL.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .db_router import cache_token
+from .utils import _cache_get_or_set
+
+LIST_CACHE_TTL = 60 * 10
+
+
+def _generation_key(model) -> str:
+    return f"cache_gen__{model._meta.label_lower}"
+
+
+def _fresh_generation() -> int:
+    # стартуємо з мітки часу, а не з 1: якщо лічильник витіснили з кешу,
+    # нове значення не збіжеться зі старими ключами
+    return int(time.time() * 1000)
+
+
+def get_generation(model) -> int:
+    key = _generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _fresh_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(model) -> None:
+    key = _generation_key(model)
+
+    def _bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_generation(), timeout=None)
+
+    transaction.on_commit(_bump)
+
+
+def generation_token(*models) -> str:
+    """
+    Рядок на кшталт "1718000000000.1718000000042" — для ключів і {% cache %}.
+    Під час читання з репліки до нього додається її мітка (db_router.cache_token).
+    """
+    return ".".join(str(get_generation(m)) for m in models) + cache_token()
+
+
+def cached_for(models, key: str, fetch_fn, ttl_seconds: int = LIST_CACHE_TTL):
+    """Кешує результат fetch_fn, доки не зміниться покоління будь-якої з моделей."""
+    return _cache_get_or_set(f"{key}__{generation_token(*models)}", fetch_fn, ttl_seconds)
@@ -0,0 +1,93 @@
+# training_manager/dashboard/category_stats.py
+"""
+Денормалізовані підсумки AttemptCategory: videos_count, best_result_value, last_video_at.
+
+videos_count змінюється атомарно через F(); best/last перераховуються одним
+агрегатним запитом по індексу category. Розбіжності (bulk-операції в обхід
+сигналів) виправляє `manage.py reconcile_category_stats`.
+"""
+from django.db.models import Count, F, Max, Min
+
+from .models import AttemptCategory, AttemptVideo
+from .results import lower_is_better
+
+
+def _best_value(event_count: int, event_type: str | None, lo: float | None, hi: float | None):
+    # у різних дисциплін різні одиниці — «кращий» має сенс лише для однієї
+    if event_count != 1 or event_type is None:
+        return None
+    return lo if lower_is_better(event_type) else hi
+
+
+def _summary_aggregates():
+    return {
+        "n": Count("id"),
+        "last": Max("created_at"),
+        "events": Count("event_type", distinct=True),
+        "event": Max("event_type"),
+        "lo": Min("result_value"),
+        "hi": Max("result_value"),
+    }
+
+
+def refresh_summary(category_id: int, count_delta: int = 0) -> None:
+    """Один агрегат + один UPDATE: лічильник через F(), решта — зі свіжого агрегату."""
+    agg = AttemptVideo.objects.filter(category_id=category_id).aggregate(**_summary_aggregates())
+    fields = {
+        "best_result_value": _best_value(agg["events"], agg["event"], agg["lo"], agg["hi"]),
+        "last_video_at": agg["last"],
+    }
+    if count_delta:
+        fields["videos_count"] = F("videos_count") + count_delta
+    AttemptCategory.objects.filter(pk=category_id).update(**fields)
+
+
+def on_video_saved(video: AttemptVideo, created: bool, previous: dict | None) -> None:
+    if created:
+        refresh_summary(video.category_id, count_delta=1)
+        return
+    if previous and previous["category_id"] != video.category_id:
+        refresh_summary(previous["category_id"], count_delta=-1)
+        refresh_summary(video.category_id, count_delta=1)
+        return
+    if previous and (
+        previous["event_type"] != video.event_type
+        or previous["result_value"] != video.result_value
+    ):
+        refresh_summary(video.category_id)
+
+
+def on_video_deleted(video: AttemptVideo) -> None:
+    refresh_summary(video.category_id, count_delta=-1)
+
+
+def reconcile(category_model=AttemptCategory, video_model=AttemptVideo) -> int:
+    """
+    Звіряє підсумки з фактичними даними (один GROUP BY) і виправляє розбіжності.
+    Повертає к-сть виправлених категорій.
+    """
+    actual = {
+        row["category_id"]: row
+        for row in video_model.objects.order_by()
+        .values("category_id")
+        .annotate(**_summary_aggregates())
+    }
+
+    changed = []
+    for category in category_model.objects.only(
+        "id", "videos_count", "best_result_value", "last_video_at"
+    ).iterator(chunk_size=2000):
+        row = actual.get(category.id)
+        expected = (
+            (row["n"], _best_value(row["events"], row["event"], row["lo"], row["hi"]), row["last"])
+            if row
+            else (0, None, None)
+        )
+        if (category.videos_count, category.best_result_value, category.last_video_at) != expected:
+            category.videos_count, category.best_result_value, category.last_video_at = expected
+            changed.append(category)
+
+    category_model.objects.bulk_update(
+        changed, ["videos_count", "best_result_value", "last_video_at"], batch_size=1000
+    )
+    return len(changed)
@@ -0,0 +1,14 @@
+# training_manager/dashboard/db_functions.py
+from django.db.models import Func, IntegerField, Value
+
+
+class JSONArrayLength(Func):
+    """
+    Довжина JSON-масиву за шляхом (SQLite `json_array_length`).
+    NULL, якщо документа немає (напр. LEFT JOIN без анотації).
+    """
+    function = "json_array_length"
+    output_field = IntegerField()
+
+    def __init__(self, expression, path="$", **extra):
+        super().__init__(expression, Value(path), **extra)
@@ -0,0 +1,130 @@
+# training_manager/dashboard/db_router.py
+"""
+Читання важких сторінок із репліки (аліас "replica" у DATABASES).
+
+Репліка вмикається лише в тих view, що позначені @read_from_replica (каталог,
+категорія, список анотацій, експорт): декоратор ставить contextvar, і
+ReplicaRouter.db_for_read віддає репліку всім запитам усередині view. Решта
+коду (збереження, OTP, сесії, API) працює з default як і раніше; запис — завжди
+в default.
+
+Read-your-writes: ReplicaStickinessMiddleware після кожного успішного POST/PUT/
+PATCH/DELETE запам'ятовує в сесії час запису. Поки репліка не наздогнала цей
+момент, сесія читає з default. «Наздогнала» — якщо є мітка синхронізації
+(<NAME>.synced, її ставить `manage.py snapshot_replica`) не старша за запис,
+інакше — коли минуло REPLICA_STICKY_SECONDS (для справжньої реплікації з
+невідомим відставанням).
+"""
+import os
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = "replica"
+LAST_WRITE_SESSION_KEY = "_db_last_write"
+DEFAULT_STICKY_SECONDS = 30
+
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_marker_path(alias: str = REPLICA_ALIAS) -> str:
+    return f"{settings.DATABASES[alias]['NAME']}.synced"
+
+
+def replica_synced_at(alias: str = REPLICA_ALIAS) -> float | None:
+    """Момент, станом на який зроблено останній знімок репліки (None — мітки немає)."""
+    try:
+        return os.stat(replica_marker_path(alias)).st_mtime
+    except OSError:
+        return None
+
+
+def mark_replica_synced(started_at: float, alias: str = REPLICA_ALIAS) -> None:
+    """Мітка синхронізації: mtime файла = початок знімка (усе, що закомічено до нього, — в репліці)."""
+    path = replica_marker_path(alias)
+    with open(path, "a"):
+        pass
+    os.utime(path, (started_at, started_at))
+
+
+def _caught_up(last_write: float) -> bool:
+    synced_at = replica_synced_at()
+    if synced_at is not None:
+        return synced_at >= last_write
+    sticky = getattr(settings, "REPLICA_STICKY_SECONDS", DEFAULT_STICKY_SECONDS)
+    return time.time() - last_write >= sticky
+
+
+def read_alias_for(request) -> str:
+    """Аліас для читань цього запиту: репліка, якщо вона є і сесія не «прилипла» до default."""
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS
+    session = getattr(request, "session", None)
+    last_write = session.get(LAST_WRITE_SESSION_KEY) if session is not None else None
+    if last_write is not None and not _caught_up(last_write):
+        return DEFAULT_DB_ALIAS
+    return REPLICA_ALIAS
+
+
+def remember_write(request) -> None:
+    session = getattr(request, "session", None)
+    if replica_configured() and session is not None and session.session_key is not None:
+        session[LAST_WRITE_SESSION_KEY] = time.time()
+
+
+def read_from_replica(view):
+    """
+    Декоратор view: читання всередині йдуть на репліку (див. read_alias_for).
+    Аліас також лежить у request.read_db — для querysets, що виконуються вже
+    після повернення з view (StreamingHttpResponse), їм потрібен явний .using().
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        alias = read_alias_for(request)
+        request.read_db = alias
+        token = _read_alias.set(alias if alias != DEFAULT_DB_ALIAS else None)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    return wrapped
+
+
+def cache_token() -> str:
+    """
+    Суфікс для ключів кешу поколінь: дані, прочитані з репліки, кешуються окремо
+    і прив'язані до її знімка — відстала репліка не «отруїть» кеш для default.
+    """
+    alias = _read_alias.get()
+    if alias is None:
+        return ""
+    synced_at = replica_synced_at(alias)
+    return f"@{alias}" if synced_at is None else f"@{alias}{int(synced_at * 1000)}"
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # схема репліки приходить разом зі знімком / реплікацією
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,99 @@
+# training_manager/dashboard/export.py
+"""
+Потоковий експорт спроб (відео + категорія + анотація) у CSV / NDJSON.
+
+Один запит з LEFT JOIN на анотацію, рядки читаються values_list(...).iterator()
+пачками — пам'ять стала на будь-якому обсязі. Порядок — за id відео
+(скан по rowid, без сортування). Використовується і view (StreamingHttpResponse),
+і `manage.py export_attempts`.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import AttemptCategory, AttemptVideo
+from .shape_codec import shapes_from_data
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+# (назва колонки, поле для values_list)
+EXPORT_COLUMNS = (
+    ("video_id", "id"),
+    ("category_id", "category_id"),
+    ("attempt_type", "category__attempt_type"),
+    ("place", "category__place"),
+    ("date", "category__date"),
+    ("rank", "category__rank"),
+    ("event_type", "event_type"),
+    ("discipline", "discipline"),
+    ("attempt_number", "attempt_number"),
+    ("result", "result"),
+    ("result_value", "result_value"),
+    ("points", "points"),
+    ("place_in_protocol", "place_in_protocol"),
+    ("time", "time"),
+    ("video", "video"),
+    ("created_at", "created_at"),
+    ("annotation_updated_at", "annotation__updated_at"),
+    ("shapes", "annotation__data"),
+)
+EXPORT_HEADER = [name for name, _field in EXPORT_COLUMNS]
+
+
+def export_queryset(date_from=None, date_to=None, season=None, event_type="", attempt_type=""):
+    """Відфільтровані рядки експорту (ще не виконаний queryset)."""
+    qs = AttemptVideo.objects.all()
+    if date_from:
+        qs = qs.filter(category__date__gte=date_from)
+    if date_to:
+        qs = qs.filter(category__date__lte=date_to)
+    if season:
+        qs = qs.filter(category__date__year=season)
+    if event_type in AttemptVideo.EventType.values:
+        qs = qs.filter(event_type=event_type)
+    if attempt_type in AttemptCategory.AttemptType.values:
+        qs = qs.filter(category__attempt_type=attempt_type)
+    return qs.order_by("id").values_list(*(field for _name, field in EXPORT_COLUMNS))
+
+
+def iter_records(qs, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Рядки queryset-у -> dict-и; шлях відео -> URL, анотація -> список фігур."""
+    for row in qs.iterator(chunk_size=chunk_size):
+        record = dict(zip(EXPORT_HEADER, row))
+        if record["video"]:
+            record["video"] = f"{settings.MEDIA_URL}{record['video']}"
+        record["shapes"] = shapes_from_data(record["shapes"])
+        yield record
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: write() повертає рядок замість запису."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for record in records:
+        record["shapes"] = json.dumps(record["shapes"], separators=(",", ":")) if record["shapes"] else ""
+        yield writer.writerow(["" if record[name] is None else record[name] for name in EXPORT_HEADER])
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def stream_export(fmt: str, qs, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Генератор рядків потрібного формату (fmt — ключ EXPORT_FORMATS)."""
+    records = iter_records(qs, chunk_size)
+    return iter_csv(records) if fmt == "csv" else iter_ndjson(records)
@@ -3,6 +3,7 @@ from django import forms
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 from .models import AttemptCategory, AttemptVideo
+from .scoring import discipline_event_type
 
 
 # ---- Категорія ----
@@ -42,11 +43,24 @@ class AttemptCategoryForm(forms.ModelForm):
 
 
 # ---- Відео ----
+class DisciplineSelect(forms.Select):
+    """Select конкретної дисципліни: data-event на кожному пункті — шаблон ховає чужі run/jump/throw."""
+
+    def create_option(self, name, value, *args, **kwargs):
+        option = super().create_option(name, value, *args, **kwargs)
+        if value:
+            option["attrs"]["data-event"] = discipline_event_type(str(value))
+        return option
+
+
 class AttemptVideoForm(forms.ModelForm):
     class Meta:
         model = AttemptVideo
-        fields = ["category", "video", "event_type", "result", "attempt_number", "place_in_protocol", "time"]
+        fields = [
+            "category", "video", "event_type", "discipline", "result", "attempt_number", "place_in_protocol", "time",
+        ]
         widgets = {
+            "discipline": DisciplineSelect,
             "attempt_number": forms.NumberInput(attrs={"min": 1}),
             "place_in_protocol": forms.NumberInput(attrs={"min": 1}),
             "time": forms.TimeInput(attrs={"type": "time", "placeholder": _("hh:mm")}),
@@ -55,6 +69,7 @@ class AttemptVideoForm(forms.ModelForm):
             "category":       _("Category"),
             "video":          _("Video"),
             "event_type":     _("Discipline"),
+            "discipline":     _("Event"),
             "result":         _("Result"),
             "attempt_number": _("Attempt number"),
             "place_in_protocol": _("Place in protocol"),
@@ -62,6 +77,7 @@ class AttemptVideoForm(forms.ModelForm):
         }
         help_texts = {
             "result": _("For runs — seconds (s); for jumps/throws — meters (m)."),
+            "discipline": _("Used for points; leave empty to guess from the result."),
         }
 
     def __init__(self, *args, **kwargs):
@@ -76,6 +92,11 @@ class AttemptVideoForm(forms.ModelForm):
         data = super().clean()
         category = data.get("category")
         place_in_protocol = data.get("place_in_protocol")
+        discipline = data.get("discipline")
+
+        # конкретна дисципліна має належати до вибраної групи (біг/стрибки/метання)
+        if discipline and data.get("event_type") and discipline_event_type(discipline) != data["event_type"]:
+            self.add_error("discipline", _("This event does not belong to the selected discipline."))
 
         if category and category.attempt_type == AttemptCategory.AttemptType.COMPETITION and not place_in_protocol:
             self.add_error("place_in_protocol", _("Required for competition categories."))
@@ -11,6 +11,8 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google.auth.exceptions import RefreshError
 
+from .metrics import track_outbound
+
 SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 
 # Файли лежать поруч із manage.py
@@ -56,4 +58,5 @@ def send_gmail(to_email: str, subject: str, body: str):
     msg["to"] = to_email
     msg["subject"] = subject
     raw = base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
-    return service.users().messages().send(userId="me", body={"raw": raw}).execute()
+    with track_outbound("gmail"):
+        return service.users().messages().send(userId="me", body={"raw": raw}).execute()
@@ -0,0 +1,387 @@
+# training_manager/dashboard/live.py
+"""
+Живе спільне редагування анотацій: WebSocket /ws/videos/<id>/annotations/.
+
+Чистий ASGI (asgi.py віддає сюди scope типу "websocket"), без Channels.
+Протокол (JSON-повідомлення):
+  клієнт -> сервер  {"type": "ops", "ops": [...]}        # ops як у PATCH (annotation_ops.py)
+  сервер -> клієнт  {"type": "hello", "client", "version"[, "shapes"]}
+                    {"type": "ops", "ops", "client"}       # чужі зміни
+                    {"type": "ack"}                        # свої ops прийняті
+                    {"type": "saved", "version"}           # зміни записано в БД
+                    {"type": "reset", "version", "shapes"} # стан змінено повз кімнату
+                    {"type": "error", "error"}
+Кожне відео — «кімната» в процесі: поточні фігури для перевірки ops і буфер
+ще не записаних ops. Буфер пишеться однією транзакцією через
+LIVE_FLUSH_SECONDS після першої зміни, при LIVE_FLUSH_MAX_OPS ops і коли
+кімнату залишає останній клієнт — а не на кожен штрих.
+Розсилка — через pubsub.get_pubsub(), тож бекенд можна замінити.
+"""
+import asyncio
+import json
+import logging
+import re
+import uuid
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.http.cookie import parse_cookie
+from django.http.request import split_domain_port, validate_host
+
+from .annotation_ops import AnnotationOpError, apply_ops
+from .models import AttemptVideo, AttemptVideoAnnotation
+from .pubsub import get_pubsub
+
+logger = logging.getLogger(__name__)
+
+PATH_RE = re.compile(r"^/ws/videos/(?P<video_id>\d+)/annotations/$")
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+# коди закриття до accept (4xxx — прикладні)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_TOO_BIG = 1009
+
+PROCESS_ID = uuid.uuid4().hex  # позначка записів цього процесу (див. annotation_saved)
+
+
+def channel_name(video_id: int) -> str:
+    return f"annotations.{video_id}"
+
+
+def flush_delay() -> float:
+    return float(getattr(settings, "LIVE_FLUSH_SECONDS", 1.0))
+
+
+def flush_max_ops() -> int:
+    return int(getattr(settings, "LIVE_FLUSH_MAX_OPS", 200))
+
+
+def _db(fn):
+    """sync_to_async для ORM поза циклом запиту: закриваємо протерміновані з'єднання."""
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(wrapper)
+
+
+# -------------------------
+# БД (синхронно, у потоці sync_to_async)
+# -------------------------
+def _load_state(video_id: int):
+    """(версія, фігури) або None, якщо відео немає."""
+    if not AttemptVideo.objects.filter(pk=video_id).exists():
+        return None
+    ann = AttemptVideoAnnotation.objects.filter(video_id=video_id).only("data", "version").first()
+    return (ann.version, ann.get_shapes()) if ann else (0, [])
+
+
+def _persist_ops(video_id: int, ops: list, user_id) -> int:
+    """
+    Застосовує накопичені ops до стану в БД однією транзакцією.
+    Версію не звіряємо: ops адресують фігури за id і зливаються з чужими записами;
+    неможливі ops (фігуру видалили повз кімнату) -> AnnotationOpError.
+    """
+    with transaction.atomic():
+        # умовний UPDATE без змін — write-lock до читання (як у views._write_annotation)
+        AttemptVideoAnnotation.objects.filter(video_id=video_id).update(version=F("version"))
+        ann = AttemptVideoAnnotation.objects.select_for_update().filter(video_id=video_id).first()
+        if ann is None:
+            ann = AttemptVideoAnnotation(video_id=video_id)
+        ann.set_shapes(apply_ops(ann.get_shapes(), ops))
+        ann.version += 1
+        ann.updated_by_id = user_id
+        ann._live_origin = PROCESS_ID
+        ann.save()
+    return ann.version
+
+
+def _scope_user(scope):
+    """Користувач за сесійною кукою handshake-запиту (як SessionMiddleware + AuthenticationMiddleware)."""
+    headers = dict(scope.get("headers") or [])
+    cookies = parse_cookie(headers.get(b"cookie", b"").decode("latin-1"))
+    session_key = cookies.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None
+    store = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    user = get_user(SimpleNamespace(session=store))
+    return user if user.is_authenticated else None
+
+
+def origin_allowed(scope) -> bool:
+    """
+    Захист від cross-site WebSocket hijacking (як перевірка Origin у CsrfViewMiddleware):
+    Host — з ALLOWED_HOSTS, Origin — той самий хост або з CSRF_TRUSTED_ORIGINS.
+    """
+    headers = dict(scope.get("headers") or [])
+    host = headers.get(b"host", b"").decode("latin-1")
+    domain, _port = split_domain_port(host)
+    allowed = settings.ALLOWED_HOSTS or ([".localhost", "127.0.0.1", "[::1]"] if settings.DEBUG else [])
+    if not domain or not validate_host(domain, allowed):
+        return False
+    origin = headers.get(b"origin", b"").decode("latin-1")
+    if not origin:
+        return True  # не браузер
+    return urlsplit(origin).netloc == host or origin in settings.CSRF_TRUSTED_ORIGINS
+
+
+# -------------------------
+# Кімнати
+# -------------------------
+class Room:
+    def __init__(self, video_id: int, version: int, shapes: list):
+        self.video_id = video_id
+        self.channel = channel_name(video_id)
+        self.version = version
+        self.shapes = shapes
+        self.pending: list = []
+        self.pending_user_id = None
+        self.clients = 0
+        self.lock = asyncio.Lock()      # shapes / pending / version
+        self.flushing = asyncio.Lock()  # один запис у БД за раз
+        self.flush_task = None          # відкладений флаш (поки чекає)
+        self.listener = None
+
+    async def apply(self, ops, user_id) -> None:
+        """Перевіряє й застосовує ops клієнта; AnnotationOpError — ops відхилено."""
+        async with self.lock:
+            self.shapes = apply_ops(self.shapes, ops)
+            self.pending.extend(ops)
+            self.pending_user_id = user_id
+            if len(self.pending) >= flush_max_ops():
+                self._schedule_flush(0)
+            elif self.flush_task is None:
+                self._schedule_flush(flush_delay())
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self.flush_task is not None and not self.flush_task.done():
+            self.flush_task.cancel()
+        self.flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        # запис у БД — поза self.lock: нові ops клієнтів тим часом приймаються
+        async with self.flushing:
+            async with self.lock:
+                ops, self.pending = self.pending, []
+                user_id = self.pending_user_id
+            if not ops:
+                return
+            try:
+                version = await _db(_persist_ops)(self.video_id, ops, user_id)
+            except AnnotationOpError as exc:
+                # стан у БД розійшовся з кімнатою — беремо його й повідомляємо клієнтів
+                logger.warning("live annotation %s: dropped %d ops: %s", self.video_id, len(ops), exc)
+                async with self.lock:
+                    await self._reload()
+                return
+            except Exception:
+                logger.exception("live annotation %s: flush failed, retrying", self.video_id)
+                async with self.lock:
+                    self.pending[:0] = ops
+                    if self.clients > 0 and self.flush_task is None:
+                        self._schedule_flush(flush_delay())
+                return
+            async with self.lock:
+                self.version = max(self.version, version)
+
+    async def _reload(self) -> None:
+        """Стан з БД + ще не записані ops (під self.lock)."""
+        state = await _db(_load_state)(self.video_id)
+        if state is None:
+            return
+        self.version, shapes = state
+        try:
+            self.shapes = apply_ops(shapes, self.pending) if self.pending else shapes
+        except AnnotationOpError:
+            self.pending = []
+            self.shapes = shapes
+        await get_pubsub().publish(self.channel, {
+            "type": "reset", "version": self.version, "shapes": self.shapes,
+        })
+
+    async def listen(self, subscription) -> None:
+        """Чужі записи (HTTP, інші процеси) -> оновити стан кімнати."""
+        while True:
+            message = await subscription.get()
+            if message.get("origin") == PROCESS_ID:
+                continue
+            kind = message.get("type")
+            if kind == "ops":
+                async with self.lock:
+                    try:
+                        self.shapes = apply_ops(self.shapes, message.get("ops") or [])
+                    except AnnotationOpError:
+                        await self._reload()
+            elif kind == "saved":
+                # запис повз кімнату (HTTP) — перечитати; флаш іншого процесу — його ops уже тут
+                async with self.lock:
+                    if not message.get("live") and message.get("version", 0) > self.version:
+                        await self._reload()
+                    else:
+                        self.version = max(self.version, message.get("version", 0))
+
+
+_rooms: dict[int, Room] = {}
+_rooms_lock = None
+
+
+def _lock() -> asyncio.Lock:
+    global _rooms_lock
+    if _rooms_lock is None:
+        _rooms_lock = asyncio.Lock()
+    return _rooms_lock
+
+
+async def join(video_id: int) -> Room | None:
+    async with _lock():
+        room = _rooms.get(video_id)
+        if room is None:
+            state = await _db(_load_state)(video_id)
+            if state is None:
+                return None
+            room = Room(video_id, *state)
+            subscription = await get_pubsub().subscribe(room.channel)
+            room.listener = (subscription, asyncio.create_task(room.listen(subscription)))
+            _rooms[video_id] = room
+        room.clients += 1
+        return room
+
+
+async def leave(room: Room) -> None:
+    async with _lock():
+        room.clients -= 1
+        if room.clients > 0:
+            return
+        _rooms.pop(room.video_id, None)
+    if room.flush_task is not None:  # ще чекає — пишемо одразу
+        room.flush_task.cancel()
+        room.flush_task = None
+    try:
+        await room.flush()
+    finally:
+        subscription, task = room.listener
+        task.cancel()
+        await subscription.close()
+
+
+def publish_saved(video_id: int, version: int, origin=None) -> None:
+    """Після коміту запису анотації: нова версія — всім підключеним клієнтам відео."""
+    get_pubsub().publish_sync(channel_name(video_id), {
+        "type": "saved",
+        "version": version,
+        "origin": origin,
+        "live": origin is not None,
+    })
+
+
+# -------------------------
+# ASGI
+# -------------------------
+async def _send_json(send, message: dict) -> None:
+    await send({"type": "websocket.send", "text": json.dumps(message, separators=(",", ":"))})
+
+
+async def _pump(subscription, send, client_id: str) -> None:
+    """Повідомлення каналу -> клієнту (власні ops — лише підтвердження)."""
+    while True:
+        message = await subscription.get()
+        if message.get("type") == "ops" and message.get("client") == client_id:
+            await _send_json(send, {"type": "ack"})
+            continue
+        await _send_json(send, {k: v for k, v in message.items() if k not in ("origin", "live")})
+
+
+async def _read(receive, send, room: Room, client_id: str, user_id) -> None:
+    pubsub = get_pubsub()
+    while True:
+        event = await receive()
+        if event["type"] == "websocket.disconnect":
+            return
+        if event["type"] != "websocket.receive":
+            continue
+        text = event.get("text")
+        if text is None and event.get("bytes") is not None:
+            text = event["bytes"].decode("utf-8", "replace")
+        if text is None:
+            continue
+        if len(text) > MAX_MESSAGE_BYTES:
+            await send({"type": "websocket.close", "code": CLOSE_TOO_BIG})
+            return
+        try:
+            message = json.loads(text)
+        except ValueError:
+            await _send_json(send, {"type": "error", "error": "invalid JSON"})
+            continue
+        if not isinstance(message, dict) or message.get("type") != "ops":
+            await _send_json(send, {"type": "error", "error": "unknown message type"})
+            continue
+        ops = message.get("ops")
+        try:
+            await room.apply(ops, user_id)
+        except AnnotationOpError as exc:
+            await _send_json(send, {"type": "error", "error": str(exc)})
+            continue
+        await pubsub.publish(room.channel, {"type": "ops", "ops": ops, "client": client_id, "origin": PROCESS_ID})
+
+
+async def websocket_application(scope, receive, send) -> None:
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+
+    match = PATH_RE.match(scope.get("path", ""))
+    if not match:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+    if not origin_allowed(scope):
+        await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+        return
+    user = await _db(_scope_user)(scope)
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    room = await join(int(match["video_id"]))
+    if room is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+
+    client_id = uuid.uuid4().hex[:12]
+    subscription = await get_pubsub().subscribe(room.channel)
+    tasks = []
+    try:
+        await send({"type": "websocket.accept"})
+        # клієнт шле ?version= свого стану — фігури надсилаємо, лише якщо він відстав
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        known = query.get("version", [""])[0]
+        async with room.lock:
+            hello = {"type": "hello", "client": client_id, "version": room.version}
+            if known != str(room.version) or room.pending:
+                hello["shapes"] = room.shapes
+        await _send_json(send, hello)
+
+        tasks = [
+            asyncio.create_task(_read(receive, send, room, client_id, user.pk)),
+            asyncio.create_task(_pump(subscription, send, client_id)),
+        ]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await subscription.close()
+        await leave(room)
@@ -0,0 +1,97 @@
+# training_manager/dashboard/management/commands/annotation_size_benchmark.py
+import gzip
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from dashboard.shape_codec import data_from_shapes, rdp_tolerance, shapes_from_data
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+CANVAS_W, CANVAS_H = 1280, 720
+
+
+def _synthetic_shapes(rng, strokes: int, points: int) -> list:
+    """
+    Лінії олівця як із браузера: кожна подія миші — ціла CSS-координата
+    (крок 1–3 px, плавний поворот), нормована на розмір полотна.
+    """
+    shapes = []
+    for n in range(strokes):
+        heading = np.cumsum(rng.normal(0.0, 0.08, points)) + rng.uniform(0, 2 * np.pi)
+        step = rng.uniform(1.0, 3.0, points)
+        xy = np.cumsum(np.column_stack((np.cos(heading), np.sin(heading))) * step[:, None], axis=0)
+        xy += rng.uniform((100, 100), (CANVAS_W - 100, CANVAS_H - 100))
+        px = np.clip(np.rint(xy), 0, (CANVAS_W, CANVAS_H)) / (CANVAS_W, CANVAS_H)
+        shapes.append({
+            "id": f"id-{n:08d}",
+            "type": "freehand",
+            "pts": [{"x": x, "y": y} for x, y in px.tolist()],
+            "color": "#10b981",
+            "width": 2,
+        })
+        if n % 5 == 0:
+            a, b, c = rng.uniform(0, 1, (3, 2)).tolist()
+            shapes.append({
+                "id": f"id-a{n:07d}",
+                "type": "angle",
+                "pts": [dict(zip("xy", a)), dict(zip("xy", b)), dict(zip("xy", c))],
+                "color": "#ef4444",
+                "width": 2,
+            })
+    return shapes
+
+
+def _sizes(payload: bytes) -> tuple[int, int, int | None]:
+    br = len(brotli.compress(payload, quality=5)) if brotli else None
+    return len(payload), len(gzip.compress(payload, compresslevel=6)), br
+
+
+class Command(BaseCommand):
+    help = "Порівнює розмір анотацій до/після компактного формату (RDP + квантовані дельти)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strokes", type=int, default=50)
+        parser.add_argument("--points", type=int, default=400, help="Точок на лінію олівця")
+        parser.add_argument("--tolerance", type=float, default=None, help="Допуск RDP (частка кадру)")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        tolerance = rdp_tolerance() if options["tolerance"] is None else options["tolerance"]
+        shapes = _synthetic_shapes(rng, options["strokes"], options["points"])
+
+        started = time.perf_counter()
+        stored = data_from_shapes(shapes, tolerance)
+        encode_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        decoded = shapes_from_data(stored)
+        decode_ms = (time.perf_counter() - started) * 1000
+
+        raw_points = sum(len(s["pts"]) for s in shapes)
+        kept_points = sum(len(s["pts"]) for s in decoded)
+
+        # JSONField і JsonResponse серіалізують однаково (json.dumps за замовчуванням)
+        rows = [
+            ("stored: raw", json.dumps({"shapes": shapes}).encode()),
+            ("stored: compact", json.dumps(stored).encode()),
+            ("GET: raw", json.dumps({"shapes": shapes, "version": 1}).encode()),
+            ("GET: compact (decoded)", json.dumps({"shapes": decoded, "version": 1}).encode()),
+        ]
+
+        self.stdout.write(
+            f"{len(shapes)} shapes, {raw_points} points -> {kept_points} kept "
+            f"({kept_points / raw_points:.1%}), tolerance {tolerance} "
+            f"(~{tolerance * CANVAS_W:.2f} px @ {CANVAS_W}px)"
+        )
+        self.stdout.write(f"encode {encode_ms:.1f} ms, decode {decode_ms:.1f} ms")
+        self.stdout.write(f"{'payload':<26}{'bytes':>12}{'gzip':>12}{'brotli':>12}")
+        for label, payload in rows:
+            size, gz, br = _sizes(payload)
+            self.stdout.write(f"{label:<26}{size:>12,}{gz:>12,}{br if br is None else f'{br:,}':>12}")
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,31 @@
+# training_manager/dashboard/management/commands/compact_annotation_revisions.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.annotation_history import compact_revisions
+from dashboard.models import AnnotationRevision
+
+
+class Command(BaseCommand):
+    help = "Проріджує історію анотацій: версії, старші за N днів, — по одній на день."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=30)
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(days=options["older_than_days"])
+        annotation_ids = (
+            AnnotationRevision.objects.filter(created_at__lt=older_than)
+            .values_list("annotation_id", flat=True)
+            .distinct()
+        )
+        deleted = converted = 0
+        for annotation_id in list(annotation_ids):
+            with transaction.atomic():
+                d, c = compact_revisions(annotation_id, older_than)
+            deleted += d
+            converted += c
+        self.stdout.write(self.style.SUCCESS(f"Revisions deleted: {deleted}, converted to snapshots: {converted}"))
@@ -0,0 +1,53 @@
+# training_manager/dashboard/management/commands/export_attempts.py
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_queryset, stream_export
+
+
+def _iso_date(raw):
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        raise CommandError(f"Invalid date: {raw!r} (expected YYYY-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = "Потоковий експорт усіх спроб (з категорією та анотацією) у CSV або NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--output", "-o", help="Файл; без нього — stdout")
+        parser.add_argument("--date-from", type=_iso_date)
+        parser.add_argument("--date-to", type=_iso_date)
+        parser.add_argument("--season", type=int)
+        parser.add_argument("--event", default="", help="run | jump | throw")
+        parser.add_argument("--attempt-type", default="", help="training | competition")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        qs = export_queryset(
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            season=options["season"],
+            event_type=options["event"],
+            attempt_type=options["attempt_type"],
+        )
+        lines = stream_export(options["format"], qs, chunk_size=options["chunk_size"])
+
+        count = 0
+        out = open(options["output"], "w", encoding="utf-8", newline="") if options["output"] else sys.stdout
+        try:
+            for line in lines:
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        if options["format"] == "csv":
+            count -= 1  # заголовок
+        # stdout може бути самим експортом — підсумок у stderr
+        self.stderr.write(self.style.SUCCESS(f"Exported {count} attempts"))
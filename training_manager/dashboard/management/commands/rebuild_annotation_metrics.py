@@ -0,0 +1,15 @@
+# training_manager/dashboard/management/commands/rebuild_annotation_metrics.py
+from django.core.management.base import BaseCommand
+
+from dashboard.annotation_metrics import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Перераховує метрики (кути, довжини відрізків) з фігур усіх анотацій через NumPy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_all(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Annotation metrics rebuilt: {count} rows"))
@@ -0,0 +1,12 @@
+# training_manager/dashboard/management/commands/rebuild_best_results.py
+from django.core.management.base import BaseCommand
+
+from dashboard.best_results import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Повністю перераховує таблицю BestResult (PB / найкращі результати сезону)."
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"BestResult rebuilt: {count} buckets"))
@@ -0,0 +1,12 @@
+# training_manager/dashboard/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from dashboard.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Перебудовує повнотекстовий індекс (FTS5) категорій і відео."
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt: {count} documents"))
@@ -0,0 +1,16 @@
+# training_manager/dashboard/management/commands/recompute_points.py
+from django.core.management.base import BaseCommand
+
+from dashboard.models import AttemptVideo
+from dashboard.scoring import recompute_library_points
+
+
+class Command(BaseCommand):
+    help = "Перераховує очки (таблиці World Athletics) для всіх відео пачками через NumPy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        changed = recompute_library_points(AttemptVideo, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Points updated: {changed} videos"))
@@ -0,0 +1,12 @@
+# training_manager/dashboard/management/commands/reconcile_category_stats.py
+from django.core.management.base import BaseCommand
+
+from dashboard.category_stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Звіряє денормалізовані підсумки категорій (к-сть відео, кращий результат, останнє відео)."
+
+    def handle(self, *args, **options):
+        fixed = reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Categories fixed: {fixed}"))
@@ -0,0 +1,121 @@
+# training_manager/dashboard/management/commands/run_benchmark.py
+import json
+import random
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.benchmark_runner import (
+    ClientTransport,
+    EmbeddedServer,
+    HttpTransport,
+    build_scenarios,
+    environment,
+    run_scenario,
+    session_cookie,
+)
+from dashboard.benchmark_seed import benchmark_user
+
+# index за замовчуванням не ганяємо: його час — це час RSS-фідів, а не застосунку
+DEFAULT_SCENARIOS = (
+    "library", "category_detail", "annotations_list", "annotations_api", "annotations_batch",
+    "leaderboard", "search", "export_ndjson",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний прогін основних сторінок: p50/p95/p99 і пропускна здатність у JSON. "
+        "Дані — `manage.py seed_benchmark`; адреси генеруються з фіксованим seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", help=f"Можна кілька; за замовчуванням: {', '.join(DEFAULT_SCENARIOS)}")
+        parser.add_argument("--requests", type=int, default=200, help="Запитів на сценарій (без прогріву)")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--transport", choices=("client", "http"), default="client",
+            help="client — django.test.Client у процесі; http — вбудований WSGI-сервер або --base-url",
+        )
+        parser.add_argument("--base-url", help="Зовнішній сервер (http), напр. http://127.0.0.1:8000")
+        parser.add_argument("--output", "-o", help="Файл для JSON; без нього — stdout")
+        parser.add_argument("--compare", help="JSON попереднього прогону: вивести зміну p50/p95/rps")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1 or options["warmup"] < 0:
+            raise CommandError("--requests and --concurrency must be >= 1, --warmup >= 0")
+        if options["base_url"]:
+            options["transport"] = "http"
+
+        scenarios = build_scenarios()
+        names = options["scenario"] or [name for name in DEFAULT_SCENARIOS if name in scenarios]
+        unknown = [name for name in names if name not in scenarios]
+        if unknown:
+            raise CommandError(f"Unknown or empty scenario(s): {', '.join(unknown)}; available: {', '.join(scenarios)}")
+
+        user = benchmark_user()
+        report = {
+            **environment(),
+            "transport": options["transport"],
+            "base_url": options["base_url"],
+            "concurrency": options["concurrency"],
+            "requests_per_scenario": options["requests"],
+            "warmup": options["warmup"],
+            "seed": options["seed"],
+            "scenarios": {},
+        }
+
+        server = EmbeddedServer() if options["transport"] == "http" and not options["base_url"] else nullcontext()
+        with server:
+            if options["transport"] == "http":
+                base_url = options["base_url"] or server.base_url
+                cookie = session_cookie(user)
+                make_transport = lambda: HttpTransport(base_url, cookie)  # noqa: E731
+            else:
+                make_transport = lambda: ClientTransport(user)  # noqa: E731
+
+            for name in names:
+                # свій генератор на сценарій: склад одного не залежить від переліку інших
+                rng = random.Random(f"{options['seed']}:{name}")
+                urls = [scenarios[name](rng) for _ in range(options["warmup"] + options["requests"])]
+                result = run_scenario(make_transport, urls, options["concurrency"], options["warmup"])
+                report["scenarios"][name] = result
+                latency = result["latency_ms"]
+                self.stderr.write(
+                    f"{name:<20} {result['throughput_rps']:>8} rps  p50 {latency['p50']:>8} ms  "
+                    f"p95 {latency['p95']:>8} ms  p99 {latency['p99']:>8} ms  errors {result['errors']}"
+                )
+
+        if options["compare"]:
+            self._compare(report, options["compare"])
+
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Saved to {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    def _compare(self, report: dict, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                baseline = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {path}: {exc}")
+
+        def change(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+        self.stderr.write(f"vs {path} ({baseline.get('git_commit') or '?'}, {baseline.get('started_at', '?')}):")
+        for name, result in report["scenarios"].items():
+            old = baseline.get("scenarios", {}).get(name)
+            if not old:
+                continue
+            self.stderr.write(
+                f"{name:<20} rps {change(result['throughput_rps'], old['throughput_rps']):>8}  "
+                f"p50 {change(result['latency_ms']['p50'], old['latency_ms']['p50']):>8}  "
+                f"p95 {change(result['latency_ms']['p95'], old['latency_ms']['p95']):>8}"
+            )
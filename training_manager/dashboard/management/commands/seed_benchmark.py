@@ -0,0 +1,53 @@
+# training_manager/dashboard/management/commands/seed_benchmark.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.benchmark_seed import BENCHMARK_PLACE_PREFIX, clear, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Синтетичні категорії/відео/анотації для навантажувальних замірів (bulk_create, фіксований seed). "
+        f"Категорії мають префікс місця {BENCHMARK_PLACE_PREFIX!r}; --clear прибирає попередні."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=200)
+        parser.add_argument("--videos-per-category", type=int, default=10)
+        parser.add_argument("--annotated", type=float, default=0.6, help="Частка відео з анотацією (0..1)")
+        parser.add_argument("--max-shapes", type=int, default=12, help="Максимум фігур в анотації")
+        parser.add_argument("--seasons", type=int, default=3, help="На скільки років назад розкидати дати")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--no-files", action="store_true", help="Не створювати файли-заглушки відео")
+        parser.add_argument("--clear", action="store_true", help="Спершу видалити попередні дані бенчмарку")
+
+    def handle(self, *args, **options):
+        if options["categories"] < 1 or options["videos_per_category"] < 0 or options["max_shapes"] < 1:
+            raise CommandError("--categories and --max-shapes must be >= 1, --videos-per-category >= 0")
+        if not 0 <= options["annotated"] <= 1:
+            raise CommandError("--annotated must be between 0 and 1")
+
+        if options["clear"]:
+            self.stdout.write(f"Removed rows: {clear()}")
+
+        started = time.perf_counter()
+        created = seed(
+            categories=options["categories"],
+            videos_per_category=options["videos_per_category"],
+            annotated=options["annotated"],
+            max_shapes=options["max_shapes"],
+            seasons=options["seasons"],
+            random_seed=options["seed"],
+            batch_size=options["batch_size"],
+            files=not options["no_files"],
+        )
+        elapsed = time.perf_counter() - started
+        # без метрик бенчмарк не міряв би роботу над фігурами (стиснення, метрики, прев'ю)
+        if created["annotations"] and not created["metrics"]:
+            raise CommandError("Seeded annotations produced no AnnotationMetric rows: check the shape format")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['categories']} categories, {created['videos']} videos, "
+            f"{created['annotations']} annotations ({created['metrics']} metrics) in {elapsed:.1f}s"
+        ))
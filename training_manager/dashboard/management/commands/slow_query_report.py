@@ -0,0 +1,104 @@
+# training_manager/dashboard/management/commands/slow_query_report.py
+import json
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from dashboard.metrics import percentile
+
+
+def _log_files(path: Path) -> list:
+    """Поточний файл і ротовані копії (slow_queries.log.1, .2, ...)."""
+    rotated = [p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()]
+    return sorted(rotated, key=lambda p: -int(p.suffix[1:])) + ([path] if path.exists() else [])
+
+
+def _entries(files, since):
+    for path in files:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since is not None and datetime.fromisoformat(entry["ts"]) < since:
+                    continue
+                yield entry
+
+
+class Command(BaseCommand):
+    help = "Звіт за журналом повільних запитів: найдорожчі fingerprint-и, повні скани і TEMP B-TREE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", default=None, help="Файл журналу; за замовчуванням SLOW_QUERY_LOG")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--since-hours", type=float, help="Лише записи за останні N годин")
+        parser.add_argument("--sort", choices=("total", "count", "max"), default="total")
+        parser.add_argument("--json", action="store_true", help="Вивести звіт як JSON")
+
+    def handle(self, *args, **options):
+        path = Path(options["log"] or settings.SLOW_QUERY_LOG)
+        files = _log_files(path)
+        if not files:
+            raise CommandError(f"No slow query log at {path}")
+        since = None
+        if options["since_hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["since_hours"])
+
+        groups = {}
+        total = 0
+        for entry in _entries(files, since):
+            total += 1
+            group = groups.setdefault(entry["fingerprint"], {
+                "fingerprint": entry["fingerprint"],
+                "sql": entry["sql"],
+                "timings": [],
+                "views": Counter(),
+                "plan": None,
+                "full_scan": False,
+                "temp_btree": False,
+                "last_seen": entry["ts"],
+            })
+            group["timings"].append(entry["ms"])
+            group["views"][entry.get("view") or "-"] += 1
+            group["plan"] = entry.get("plan") or group["plan"]
+            group["full_scan"] |= bool(entry.get("full_scan"))
+            group["temp_btree"] |= bool(entry.get("temp_btree"))
+            group["last_seen"] = max(group["last_seen"], entry["ts"])
+
+        report = []
+        for group in groups.values():
+            timings = group.pop("timings")
+            report.append({
+                **group,
+                "count": len(timings),
+                "total_ms": round(sum(timings), 2),
+                "avg_ms": round(sum(timings) / len(timings), 2),
+                "p95_ms": round(percentile(timings, 95), 2),
+                "max_ms": max(timings),
+                "views": dict(group["views"].most_common()),
+            })
+        sort_key = {"total": "total_ms", "count": "count", "max": "max_ms"}[options["sort"]]
+        report.sort(key=lambda item: item[sort_key], reverse=True)
+        report = report[: options["top"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"Slow queries: {total}, fingerprints: {len(groups)}, files: {', '.join(p.name for p in files)}")
+        for rank, item in enumerate(report, 1):
+            flags = [name for name, on in (("FULL SCAN", item["full_scan"]), ("TEMP B-TREE", item["temp_btree"])) if on]
+            header = (
+                f"#{rank} {item['fingerprint']}  count={item['count']} total={item['total_ms']:.0f}ms "
+                f"avg={item['avg_ms']:.0f}ms p95={item['p95_ms']:.0f}ms max={item['max_ms']:.0f}ms"
+            )
+            self.stdout.write(self.style.WARNING(header + (f"  [{', '.join(flags)}]" if flags else "")))
+            self.stdout.write("   views: " + ", ".join(f"{view} ({n})" for view, n in item["views"].items()))
+            self.stdout.write(f"   {item['sql'][:300]}")
+            for line in item["plan"] or ["(no plan)"]:
+                self.stdout.write(f"     {line}")
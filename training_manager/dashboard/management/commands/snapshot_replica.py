@@ -0,0 +1,43 @@
+# training_manager/dashboard/management/commands/snapshot_replica.py
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from dashboard.db_router import REPLICA_ALIAS, mark_replica_synced
+
+
+class Command(BaseCommand):
+    help = (
+        "Знімок default -> replica для локальної репліки на SQLite (online backup API). "
+        "Копіюється в наявний файл через SQLite, тож відкриті з'єднання репліки не ламаються."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages", type=int, default=-1,
+            help="Сторінок за крок backup (-1 — усе за один крок; кроки перезапускаються, якщо default змінився)",
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError("Replica is not configured (set DB_REPLICA_NAME).")
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != "sqlite" or connections[REPLICA_ALIAS].vendor != "sqlite":
+            raise CommandError("snapshot_replica works only with SQLite databases.")
+
+        target_path = str(settings.DATABASES[REPLICA_ALIAS]["NAME"])
+        source.ensure_connection()
+        # усе, що закомічено до цього моменту, потрапить у знімок
+        started_at = time.time()
+        target = sqlite3.connect(target_path)
+        try:
+            source.connection.backup(target, pages=options["pages"])
+        finally:
+            target.close()
+        mark_replica_synced(started_at)
+
+        elapsed = time.time() - started_at
+        self.stdout.write(self.style.SUCCESS(f"Replica {target_path} synced in {elapsed:.2f}s"))
@@ -0,0 +1,127 @@
+# training_manager/dashboard/management/commands/sqlite_concurrency_benchmark.py
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.utils import OperationalError
+
+from dashboard.metrics import percentile
+
+# однакове навантаження на стандартний і налаштований бекенд (тимчасовий файл БД)
+PROFILES = {
+    "stock": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {}},
+    "tuned": {"ENGINE": "dashboard.sqlite_backend", "OPTIONS": {}},
+}
+
+SCHEMA = (
+    "CREATE TABLE bench_doc (id INTEGER PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL)",
+    "CREATE TABLE bench_log (id INTEGER PRIMARY KEY AUTOINCREMENT, doc_id INTEGER, created REAL)",
+)
+DOCS = 200
+PAYLOAD = "x" * 2000  # ~розмір компактної анотації
+
+
+def _db_settings(profile: str, path: str) -> dict:
+    return {
+        **PROFILES[profile],
+        "NAME": path,
+        "ATOMIC_REQUESTS": False,
+        "AUTOCOMMIT": True,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": False,
+        "TIME_ZONE": None,
+        "USER": "", "PASSWORD": "", "HOST": "", "PORT": "",
+        "TEST": {},
+    }
+
+
+class Command(BaseCommand):
+    help = "Паралельні читання/записи SQLite: стандартний бекенд проти dashboard.sqlite_backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--profile", choices=sorted(PROFILES), action="append")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['writers']} writers, {options['readers']} readers, {options['seconds']}s per profile"
+        )
+        self.stdout.write(
+            f"{'profile':<8}{'kind':<8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'locked':>9}"
+        )
+        for profile in options["profile"] or sorted(PROFILES):
+            with tempfile.TemporaryDirectory() as tmp:
+                self._run(profile, os.path.join(tmp, "bench.sqlite3"), options)
+        self.stdout.write(self.style.SUCCESS("Done"))
+
+    def _run(self, profile: str, path: str, options):
+        alias = f"bench_{profile}"
+        connections.settings[alias] = _db_settings(profile, path)
+        try:
+            with connections[alias].cursor() as cursor:
+                for statement in SCHEMA:
+                    cursor.execute(statement)
+                cursor.executemany(
+                    "INSERT INTO bench_doc (id, version, data) VALUES (%s, 0, %s)",
+                    [(i, PAYLOAD) for i in range(DOCS)],
+                )
+            connections[alias].close()
+
+            stats = {"write": ([], [0]), "read": ([], [0])}
+            stop = time.perf_counter() + options["seconds"]
+            threads = [
+                threading.Thread(target=self._worker, args=(alias, kind, n, stop, stats[kind]))
+                for kind, count in (("write", options["writers"]), ("read", options["readers"]))
+                for n in range(count)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            connections.settings.pop(alias, None)
+
+        for kind, (latencies, locked) in stats.items():
+            self.stdout.write(
+                f"{profile:<8}{kind:<8}{len(latencies) / options['seconds']:>10.0f}"
+                f"{percentile(latencies, 50):>10.2f}{percentile(latencies, 95):>10.2f}"
+                f"{percentile(latencies, 99):>10.2f}{locked[0]:>9}"
+            )
+
+    @staticmethod
+    def _worker(alias, kind, n, stop, stats):
+        latencies, locked = stats
+        connection = connections[alias]  # своє з'єднання в кожному потоці
+        doc = n
+        try:
+            while time.perf_counter() < stop:
+                doc = (doc * 7 + 13) % DOCS
+                started = time.perf_counter()
+                try:
+                    if kind == "write":
+                        # як збереження анотації: прочитати версію, записати дані + журнал
+                        with transaction.atomic(using=alias), connection.cursor() as cursor:
+                            cursor.execute("SELECT version FROM bench_doc WHERE id = %s", [doc])
+                            version = cursor.fetchone()[0]
+                            cursor.execute(
+                                "UPDATE bench_doc SET version = %s, data = %s WHERE id = %s",
+                                [version + 1, PAYLOAD, doc],
+                            )
+                            cursor.execute("INSERT INTO bench_log (doc_id, created) VALUES (%s, %s)", [doc, started])
+                    else:
+                        with connection.cursor() as cursor:
+                            cursor.execute("SELECT id, version, length(data) FROM bench_doc WHERE id >= %s LIMIT 20", [doc])
+                            cursor.fetchall()
+                            cursor.execute("SELECT COUNT(*) FROM bench_log WHERE doc_id = %s", [doc])
+                            cursor.fetchone()
+                except OperationalError:
+                    locked[0] += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
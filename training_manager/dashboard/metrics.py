@@ -0,0 +1,263 @@
+# training_manager/dashboard/metrics.py
+"""
+Метрики продуктивності в пам'яті процесу + текстовий формат Prometheus (/metrics).
+
+  • MetricsMiddleware — латентність кожного view (гістограма за view/method/status),
+    к-сть і час SQL-запитів за запит;
+  • SQL рахує обгортка connection.execute_wrappers (ставиться на кожне з'єднання
+    сигналом connection_created) у RequestStats поточного запиту — через contextvar,
+    тож запити з sync_to_async-потоків async-view теж потрапляють у свій запит;
+  • кеш _cache_get_or_set — hit/miss за префіксом ключа;
+  • зовнішній HTTP (RSS, Gmail) — track_outbound().
+
+Агрегація — лічильники під одним lock-ом на метрику, без залежностей. Значення
+свої в кожного процесу-воркера: Prometheus збирає їх з кожного окремо.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels_text(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_labels_text(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # ключ міток -> [лічильники кошиків (+Inf останній), сума]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels_text(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels_text(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels_text(self.labelnames, key)} {cumulative}"
+
+
+REQUEST_LATENCY = Histogram(
+    "django_request_duration_seconds", "View latency, seconds.", ("view", "method", "status"),
+)
+REQUEST_QUERIES = Histogram(
+    "django_request_db_queries", "SQL queries per request.", ("view",), QUERY_COUNT_BUCKETS,
+)
+DB_QUERIES = Counter("django_db_queries_total", "SQL queries executed.", ("view", "alias"))
+DB_QUERY_SECONDS = Counter("django_db_query_seconds_total", "Time spent in SQL, seconds.", ("view", "alias"))
+CACHE_REQUESTS = Counter("app_cache_requests_total", "Cache lookups by key prefix.", ("prefix", "result"))
+OUTBOUND_LATENCY = Histogram(
+    "app_outbound_http_duration_seconds", "Outbound HTTP calls, seconds.", ("service", "outcome"),
+)
+
+REGISTRY = (REQUEST_LATENCY, REQUEST_QUERIES, DB_QUERIES, DB_QUERY_SECONDS, CACHE_REQUESTS, OUTBOUND_LATENCY)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# Перцентилі для офлайн-звітів
+# -------------------------
+def percentile(values, q: float) -> float:
+    """
+    q-й перцентиль (0..100) з лінійною інтерполяцією між сусідніми рангами —
+    як np.percentile за замовчуванням. Спільний для sqlite_concurrency_benchmark,
+    slow_query_report і run_benchmark, щоб їхні p95/p99 були порівнянні.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_summary(latencies_ms) -> dict:
+    """p50/p95/p99, середнє, мін/макс у мс (округлено до 0.01); {} для порожнього."""
+    if not latencies_ms:
+        return {}
+    summary = {f"p{q}": percentile(latencies_ms, q) for q in (50, 95, 99)}
+    summary.update(
+        mean=sum(latencies_ms) / len(latencies_ms), min=min(latencies_ms), max=max(latencies_ms),
+    )
+    return {key: round(float(value), 2) for key, value in summary.items()}
+
+
+# -------------------------
+# SQL у межах запиту
+# -------------------------
+class RequestStats:
+    __slots__ = ("request", "queries", "seconds")
+
+    def __init__(self, request):
+        self.request = request
+        self.queries: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def sql_timer(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    alias = context["connection"].alias
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries[alias] = stats.queries.get(alias, 0) + 1
+        stats.seconds[alias] = stats.seconds.get(alias, 0.0) + time.perf_counter() - started
+
+
+def install_sql_timer(connection) -> None:
+    """connection_created: та сама черга обгорток, що й у connection.execute_wrapper()."""
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_timer)
+
+
+def current_view() -> str | None:
+    """View поточного запиту (None — поза запитом: команди, фонові задачі)."""
+    stats = _request_stats.get()
+    return None if stats is None else _view_name(stats.request)
+
+
+def cache_lookup(key: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(prefix=key.split("__", 1)[0], result="hit" if hit else "miss")
+
+
+@contextmanager
+def track_outbound(service: str):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        OUTBOUND_LATENCY.observe(time.perf_counter() - started, service=service, outcome=outcome)
+
+
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    """
+    Першим у MIDDLEWARE: час — увесь ланцюжок middleware + view. Для
+    StreamingHttpResponse (експорт) — до повернення відповіді, без самого стріму.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, request):
+        stats = RequestStats(request)
+        return stats, _request_stats.set(stats), time.perf_counter()
+
+    def _finish(self, request, response, stats, token, started) -> None:
+        elapsed = time.perf_counter() - started
+        _request_stats.reset(token)
+        view = _view_name(request)
+        status = response.status_code if response is not None else 500
+        REQUEST_LATENCY.observe(elapsed, view=view, method=request.method, status=status)
+        REQUEST_QUERIES.observe(sum(stats.queries.values()), view=view)
+        for alias, count in stats.queries.items():
+            DB_QUERIES.inc(count, view=view, alias=alias)
+            DB_QUERY_SECONDS.inc(stats.seconds[alias], view=view, alias=alias)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self._start(request)
+        response = None
+        try:
+            response = self.get_response(request)
+            return response
+        finally:
+            self._finish(request, response, stats, token, started)
+
+    async def __acall__(self, request):
+        stats, token, started = self._start(request)
+        response = None
+        try:
+            response = await self.get_response(request)
+            return response
+        finally:
+            self._finish(request, response, stats, token, started)
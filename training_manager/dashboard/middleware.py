@@ -0,0 +1,66 @@
+# training_manager/dashboard/middleware.py
+import re
+
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .db_router import remember_write
+
+try:
+    import brotli  # ставиться разом із whitenoise[brotli]
+except ImportError:  # pragma: no cover
+    brotli = None
+
+_ACCEPTS_BR_RE = re.compile(r"\bbr\b")
+
+BROTLI_QUALITY = 5  # динамічне стиснення: швидко, але щільніше за gzip
+MIN_COMPRESS_SIZE = 200
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Стиснення відповідей.
+      • JSON (анотації, API) -> brotli, якщо клієнт приймає br: у JSON немає
+        CSRF-токенів, тож BREACH тут не актуальний;
+      • усе інше (і стріми експорту) -> gzip штатним GZipMiddleware
+        (у Django він уже має захист від BREACH).
+    """
+
+    def process_response(self, request, response):
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith("application/json")
+            or len(response.content) < MIN_COMPRESS_SIZE
+            or not _ACCEPTS_BR_RE.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = "br"
+        # як і в GZipMiddleware: стиснене тіло — вже не побайтово те саме
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """
+    Read-your-writes для репліки: після успішного запиту, що змінює дані,
+    сесія читає з default, доки репліка не наздожене (див. db_router).
+    Стоїть після SessionMiddleware, щоб сесія зберіглася вже з міткою.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and response.status_code < 400:
+            remember_write(request)
+        return response
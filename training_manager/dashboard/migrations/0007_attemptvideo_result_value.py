@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:25
+
+from django.db import migrations, models
+
+from dashboard.results import parse_result
+
+
+def backfill_result_value(apps, schema_editor):
+    AttemptVideo = apps.get_model('dashboard', 'AttemptVideo')
+    batch = []
+    for video in AttemptVideo.objects.only('id', 'result').iterator(chunk_size=1000):
+        video.result_value = parse_result(video.result)
+        batch.append(video)
+        if len(batch) >= 1000:
+            AttemptVideo.objects.bulk_update(batch, ['result_value'])
+            batch = []
+    if batch:
+        AttemptVideo.objects.bulk_update(batch, ['result_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_alter_attemptcategory_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptvideo',
+            name='result_value',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Result (numeric)'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptvideo',
+            index=models.Index(fields=['category', 'event_type', 'result_value'], name='dashboard_a_categor_047493_idx'),
+        ),
+        migrations.RunPython(backfill_result_value, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_best_results(apps, schema_editor):
+    from dashboard.best_results import rebuild_all
+
+    rebuild_all(
+        video_model=apps.get_model('dashboard', 'AttemptVideo'),
+        best_model=apps.get_model('dashboard', 'BestResult'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_attemptvideo_result_value'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('jump', 'Jumps'), ('throw', 'Throw/Shot put'), ('run', 'Run')], max_length=20, verbose_name='Discipline')),
+                ('attempt_type', models.CharField(choices=[('training', 'Training'), ('competition', 'Competition')], max_length=20, verbose_name='Attempt type')),
+                ('season', models.PositiveSmallIntegerField(verbose_name='Season')),
+                ('result_value', models.FloatField(verbose_name='Result (numeric)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dashboard.attemptvideo', verbose_name='Video')),
+            ],
+            options={
+                'verbose_name': 'Best result',
+                'verbose_name_plural': 'Best results',
+                'ordering': ['-season', 'event_type', 'attempt_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bestresult',
+            constraint=models.UniqueConstraint(fields=('event_type', 'attempt_type', 'season'), name='unique_best_result_bucket'),
+        ),
+        migrations.RunPython(build_best_results, migrations.RunPython.noop),
+    ]
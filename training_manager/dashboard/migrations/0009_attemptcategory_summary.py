@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:28
+
+from django.db import migrations, models
+
+
+def fill_category_summary(apps, schema_editor):
+    from dashboard.category_stats import reconcile
+
+    reconcile(
+        category_model=apps.get_model('dashboard', 'AttemptCategory'),
+        video_model=apps.get_model('dashboard', 'AttemptVideo'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_bestresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptcategory',
+            name='best_result_value',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Best result (numeric)'),
+        ),
+        migrations.AddField(
+            model_name='attemptcategory',
+            name='last_video_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last video added'),
+        ),
+        migrations.AddField(
+            model_name='attemptcategory',
+            name='videos_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Videos count'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['videos_count', 'date'], name='dashboard_a_videos__9d5b62_idx'),
+        ),
+        migrations.RunPython(fill_category_summary, migrations.RunPython.noop),
+    ]
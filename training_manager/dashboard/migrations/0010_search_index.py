@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:00
+
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS dashboard_search USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, category_id UNINDEXED, "
+        "place, attempt_type, date, event, result, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+    from dashboard.search import rebuild_index
+
+    rebuild_index(
+        category_model=apps.get_model('dashboard', 'AttemptCategory'),
+        video_model=apps.get_model('dashboard', 'AttemptVideo'),
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS dashboard_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_attemptcategory_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
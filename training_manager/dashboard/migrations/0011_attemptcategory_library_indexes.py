@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attemptcategory',
+            name='dashboard_a_videos__9d5b62_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['attempt_type', 'date', 'id'], name='dashboard_a_attempt_209e43_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['place', 'date', 'id'], name='dashboard_a_place_4b9f86_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['attempt_type', 'place', 'date', 'id'], name='dashboard_a_attempt_d199d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['videos_count', 'date', 'id'], name='dashboard_a_videos__1e6d4f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptcategory',
+            index=models.Index(fields=['attempt_type', 'videos_count', 'date', 'id'], name='dashboard_a_attempt_732fd4_idx'),
+        ),
+    ]
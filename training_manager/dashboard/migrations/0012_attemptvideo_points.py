@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:34
+
+from django.db import migrations, models
+
+
+def backfill_points(apps, schema_editor):
+    from dashboard.scoring import recompute_library_points
+
+    recompute_library_points(apps.get_model('dashboard', 'AttemptVideo'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_attemptcategory_library_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptvideo',
+            name='points',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True, verbose_name='Points'),
+        ),
+        migrations.AddIndex(
+            model_name='attemptvideo',
+            index=models.Index(fields=['category', 'points'], name='dashboard_a_categor_320483_idx'),
+        ),
+        migrations.RunPython(backfill_points, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_attemptvideo_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptvideoannotation',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+    ]
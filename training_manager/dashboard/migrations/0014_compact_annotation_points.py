@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:41
+
+from django.db import migrations
+
+
+def compact_points(apps, schema_editor):
+    from dashboard.shape_codec import compact_annotations
+
+    compact_annotations(apps.get_model('dashboard', 'AttemptVideoAnnotation'))
+
+
+def expand_points(apps, schema_editor):
+    from dashboard.shape_codec import shapes_from_data
+
+    annotation_model = apps.get_model('dashboard', 'AttemptVideoAnnotation')
+    for ann in list(annotation_model.objects.only('id', 'data')):
+        ann.data = {'shapes': shapes_from_data(ann.data)}
+        ann.save(update_fields=['data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0013_attemptvideoannotation_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_points, expand_points),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_shape_index(apps, schema_editor):
+    from dashboard.annotation_shapes import rebuild_all
+
+    rebuild_all(
+        apps.get_model('dashboard', 'AttemptVideoAnnotation'),
+        apps.get_model('dashboard', 'AnnotationShape'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_compact_annotation_points'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnotationShape',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shape_id', models.CharField(max_length=64, verbose_name='Shape ID')),
+                ('position', models.PositiveIntegerField(verbose_name='Position')),
+                ('shape_type', models.CharField(blank=True, max_length=16, verbose_name='Shape type')),
+                ('t_start', models.FloatField(blank=True, null=True, verbose_name='Start (s)')),
+                ('t_end', models.FloatField(blank=True, null=True, verbose_name='End (s)')),
+                ('data', models.JSONField(verbose_name='Shape data')),
+                ('annotation', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='shape_rows', to='dashboard.attemptvideoannotation', verbose_name='Video annotations')),
+            ],
+            options={
+                'verbose_name': 'Annotation shape',
+                'verbose_name_plural': 'Annotation shapes',
+                'ordering': ['annotation', 'position'],
+                'indexes': [models.Index(fields=['annotation', 't_start', 't_end'], name='dashboard_a_annotat_1637be_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='annotationshape',
+            constraint=models.UniqueConstraint(fields=('annotation', 'position'), name='unique_annotation_shape_position'),
+        ),
+        migrations.RunPython(build_shape_index, migrations.RunPython.noop),
+    ]
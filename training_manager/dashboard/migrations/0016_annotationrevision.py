@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_baseline_snapshots(apps, schema_editor):
+    from dashboard.annotation_history import create_baseline_snapshots as create
+
+    create(
+        apps.get_model('dashboard', 'AttemptVideoAnnotation'),
+        apps.get_model('dashboard', 'AnnotationRevision'),
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0015_annotationshape'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnotationRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(verbose_name='Version')),
+                ('kind', models.CharField(choices=[('snapshot', 'Snapshot'), ('delta', 'Delta')], max_length=8, verbose_name='Kind')),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('shapes_count', models.PositiveIntegerField(default=0, verbose_name='Shapes')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('annotation', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='dashboard.attemptvideoannotation', verbose_name='Video annotations')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Created by')),
+            ],
+            options={
+                'verbose_name': 'Annotation revision',
+                'verbose_name_plural': 'Annotation revisions',
+                'ordering': ['annotation', '-version'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='annotationrevision',
+            constraint=models.UniqueConstraint(fields=('annotation', 'version'), name='unique_annotation_revision_version'),
+        ),
+        migrations.RunPython(create_baseline_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_metrics(apps, schema_editor):
+    from dashboard.annotation_metrics import rebuild_all
+
+    rebuild_all(
+        apps.get_model('dashboard', 'AttemptVideoAnnotation'),
+        apps.get_model('dashboard', 'AnnotationMetric'),
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0016_annotationrevision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnotationMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shape_id', models.CharField(max_length=64, verbose_name='Shape ID')),
+                ('kind', models.CharField(choices=[('angle', 'Angle'), ('length', 'Length')], max_length=8, verbose_name='Kind')),
+                ('label', models.CharField(blank=True, max_length=64, verbose_name='Label')),
+                ('value', models.FloatField(verbose_name='Value')),
+                ('t', models.FloatField(blank=True, null=True, verbose_name='Time (s)')),
+                ('video', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='dashboard.attemptvideo', verbose_name='Video')),
+            ],
+            options={
+                'verbose_name': 'Annotation metric',
+                'verbose_name_plural': 'Annotation metrics',
+                'ordering': ['video_id', 'kind', 't'],
+                'indexes': [models.Index(fields=['video', 'kind'], name='dashboard_a_video_i_c82fa7_idx'), models.Index(fields=['kind', 'label', 'value'], name='dashboard_a_kind_c2fe44_idx')],
+            },
+        ),
+        migrations.RunPython(build_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:27
+
+from django.db import migrations, models
+
+
+def recompute_points(apps, schema_editor):
+    # нові таблиці (200/800 м, жердина, потрійний, спис) і NULL поза діапазоном — перерахунок усіх очок
+    from dashboard.scoring import recompute_library_points
+
+    recompute_library_points(apps.get_model('dashboard', 'AttemptVideo'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0017_annotationmetric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptvideo',
+            name='discipline',
+            field=models.CharField(blank=True, choices=[('100m', '100 m'), ('200m', '200 m'), ('400m', '400 m'), ('800m', '800 m'), ('1500m', '1500 m'), ('hj', 'High jump'), ('pv', 'Pole vault'), ('lj', 'Long jump'), ('tj', 'Triple jump'), ('sp', 'Shot put'), ('dt', 'Discus throw'), ('jt', 'Javelin throw')], default='', help_text='Specific event for points; empty — guessed from the result', max_length=10, verbose_name='Event'),
+        ),
+        migrations.RunPython(recompute_points, migrations.RunPython.noop),
+    ]
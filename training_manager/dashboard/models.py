@@ -7,6 +7,10 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 import datetime
 
+from .results import parse_result
+from .scoring import points_for
+from .shape_codec import data_from_shapes, shapes_from_data
+
 
 class AttemptCategory(models.Model):
     class AttemptType(models.TextChoices):
@@ -36,10 +40,38 @@ class AttemptCategory(models.Model):
         verbose_name=_('Rank in protocol'),
     )
 
+    # Денормалізовані підсумки по відео (оновлюються сигналами, див. category_stats.py)
+    videos_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Videos count'),
+    )
+    # Кращий результат, якщо всі відео категорії однієї дисципліни (інакше NULL)
+    best_result_value = models.FloatField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_('Best result (numeric)'),
+    )
+    last_video_at = models.DateTimeField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_('Last video added'),
+    )
+
     class Meta:
         verbose_name = _('Attempt category')
         verbose_name_plural = _('Attempt categories')
         ordering = ['-date', 'place']
+        # Під кожне сортування library_view (з фільтром за типом і без):
+        # порядок читається з індексу прямо/задом наперед, без temp B-tree.
+        # ('-date', '-id') без фільтра покриває db_index на date (SQLite додає rowid).
+        indexes = [
+            models.Index(fields=['attempt_type', 'date', 'id']),
+            models.Index(fields=['place', 'date', 'id']),
+            models.Index(fields=['attempt_type', 'place', 'date', 'id']),
+            models.Index(fields=['videos_count', 'date', 'id']),
+            models.Index(fields=['attempt_type', 'videos_count', 'date', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.get_attempt_type_display()} ({self.place}, {self.date:%Y-%m-%d})"
@@ -51,6 +83,21 @@ class AttemptVideo(models.Model):
         THROW = 'throw', _('Throw/Shot put')
         RUN = 'run', _('Run')
 
+    # конкретна дисципліна для таблиці очок (scoring.SCORING_TABLES); порожня — за величиною результату
+    class Discipline(models.TextChoices):
+        RUN_100 = '100m', _('100 m')
+        RUN_200 = '200m', _('200 m')
+        RUN_400 = '400m', _('400 m')
+        RUN_800 = '800m', _('800 m')
+        RUN_1500 = '1500m', _('1500 m')
+        HIGH_JUMP = 'hj', _('High jump')
+        POLE_VAULT = 'pv', _('Pole vault')
+        LONG_JUMP = 'lj', _('Long jump')
+        TRIPLE_JUMP = 'tj', _('Triple jump')
+        SHOT_PUT = 'sp', _('Shot put')
+        DISCUS = 'dt', _('Discus throw')
+        JAVELIN = 'jt', _('Javelin throw')
+
     category = models.ForeignKey(
         AttemptCategory,
         on_delete=models.CASCADE,
@@ -70,12 +117,34 @@ class AttemptVideo(models.Model):
         db_index=True,
     )
 
+    discipline = models.CharField(
+        max_length=10,
+        choices=Discipline.choices,
+        blank=True,
+        default='',
+        help_text=_('Specific event for points; empty — guessed from the result'),
+        verbose_name=_('Event'),
+    )
+
     # Результат як рядок; одиниці показуємо в UI
     result = models.CharField(
         max_length=20,
         help_text=_('Result (m or s)'),
         verbose_name=_('Result'),
     )
+    # Нормалізований результат (секунди або метри) — для коректного сортування за індексом
+    result_value = models.FloatField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_('Result (numeric)'),
+    )
+    # Очки за таблицями World Athletics (scoring.py) — єдина шкала для всіх дисциплін
+    points = models.PositiveIntegerField(
+        null=True, blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name=_('Points'),
+    )
 
     attempt_number = models.PositiveIntegerField(
         validators=[MinValueValidator(1)],
@@ -107,11 +176,21 @@ class AttemptVideo(models.Model):
         indexes = [
             models.Index(fields=['event_type']),
             models.Index(fields=['category', 'attempt_number']),
+            models.Index(fields=['category', 'event_type', 'result_value']),
+            models.Index(fields=['category', 'points']),
         ]
 
     def __str__(self):
         return f"{self.get_event_type_display()} — #{self.attempt_number} ({self.category})"
 
+    def save(self, *args, **kwargs):
+        self.result_value = parse_result(self.result)
+        self.points = points_for(self.event_type, self.result_value, self.discipline)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'result', 'event_type', 'discipline'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'result_value', 'points'}
+        super().save(*args, **kwargs)
+
 
 class AttemptVideoAnnotation(models.Model):
     video = models.OneToOneField(
@@ -120,7 +199,7 @@ class AttemptVideoAnnotation(models.Model):
         related_name='annotation',
         verbose_name=_('Video'),
     )
-    data = models.JSONField(default=dict, verbose_name=_('Annotation data'))  # {"shapes": [...]}
+    data = models.JSONField(default=dict, verbose_name=_('Annotation data'))  # {"shapes": [...]}, точки — shape_codec
     updated_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True, blank=True,
@@ -128,6 +207,8 @@ class AttemptVideoAnnotation(models.Model):
         verbose_name=_('Updated by'),
     )
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
+    # оптимістична конкурентність: +1 на кожен запис, клієнт шле If-Match
+    version = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Version'))
 
     class Meta:
         verbose_name = _('Video annotations')
@@ -136,6 +217,176 @@ class AttemptVideoAnnotation(models.Model):
     def __str__(self):
         return f"Annotations for AttemptVideo {self.video_id}"
 
+    def get_shapes(self) -> list:
+        """Фігури у клієнтському форматі (компактні точки розкодовуються)."""
+        return shapes_from_data(self.data)
+
+    def set_shapes(self, shapes: list) -> None:
+        """Зберігає фігури компактно: спрощення freehand + квантовані дельти (shape_codec)."""
+        self.data = data_from_shapes(shapes, previous=self.data)
+
+
+class AnnotationShape(models.Model):
+    """
+    Фігура анотації з часом показу на відео (t_start/t_end, секунди).
+    Похідна таблиця: джерело істини — AttemptVideoAnnotation.data, рядки
+    перебудовуються сигналом при кожному збереженні (annotation_shapes.py).
+    Порожній t_start — з початку відео, порожній t_end — до кінця.
+    """
+    annotation = models.ForeignKey(
+        AttemptVideoAnnotation,
+        on_delete=models.CASCADE,
+        related_name='shape_rows',
+        db_index=False,  # префікс складеного індексу нижче
+        verbose_name=_('Video annotations'),
+    )
+    shape_id = models.CharField(max_length=64, verbose_name=_('Shape ID'))
+    position = models.PositiveIntegerField(verbose_name=_('Position'))  # порядок малювання
+    shape_type = models.CharField(max_length=16, blank=True, verbose_name=_('Shape type'))
+    t_start = models.FloatField(null=True, blank=True, verbose_name=_('Start (s)'))
+    t_end = models.FloatField(null=True, blank=True, verbose_name=_('End (s)'))
+    data = models.JSONField(verbose_name=_('Shape data'))  # як у AttemptVideoAnnotation.data (компактно)
+
+    class Meta:
+        verbose_name = _('Annotation shape')
+        verbose_name_plural = _('Annotation shapes')
+        ordering = ['annotation', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['annotation', 'position'], name='unique_annotation_shape_position'),
+        ]
+        indexes = [
+            models.Index(fields=['annotation', 't_start', 't_end']),
+        ]
+
+    def __str__(self):
+        return f"{self.shape_type or 'shape'} {self.shape_id} ({self.t_start}–{self.t_end})"
+
+
+class AnnotationRevision(models.Model):
+    """
+    Версія анотації: або повний знімок фігур, або дельта (ops з annotation_ops)
+    від попередньої збереженої версії. Кожні SNAPSHOT_EVERY версій — знімок,
+    тож будь-яка версія відновлюється за обмежену к-сть кроків
+    (annotation_history.py). Старі версії проріджує
+    `manage.py compact_annotation_revisions`.
+    """
+    class Kind(models.TextChoices):
+        SNAPSHOT = 'snapshot', _('Snapshot')
+        DELTA = 'delta', _('Delta')
+
+    annotation = models.ForeignKey(
+        AttemptVideoAnnotation,
+        on_delete=models.CASCADE,
+        related_name='revisions',
+        db_index=False,  # префікс унікального (annotation, version)
+        verbose_name=_('Video annotations'),
+    )
+    version = models.PositiveIntegerField(verbose_name=_('Version'))
+    kind = models.CharField(max_length=8, choices=Kind.choices, verbose_name=_('Kind'))
+    # знімок: список фігур (компактно, як у data["shapes"]); дельта: список ops
+    payload = models.JSONField(verbose_name=_('Payload'))
+    shapes_count = models.PositiveIntegerField(default=0, verbose_name=_('Shapes'))
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name=_('Created by'),
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name=_('Created'))
+
+    class Meta:
+        verbose_name = _('Annotation revision')
+        verbose_name_plural = _('Annotation revisions')
+        ordering = ['annotation', '-version']
+        constraints = [
+            models.UniqueConstraint(fields=['annotation', 'version'], name='unique_annotation_revision_version'),
+        ]
+
+    def __str__(self):
+        return f"Annotation {self.annotation_id} v{self.version} ({self.kind})"
+
+
+class AnnotationMetric(models.Model):
+    """
+    Біомеханічна метрика з фігури анотації: кут (фігура "angle", градуси)
+    або довжина відрізка (фігура "line", частки висоти кадру).
+    Похідна таблиця — перераховується сигналом при збереженні анотації
+    та `manage.py rebuild_annotation_metrics` (annotation_metrics.py).
+    Приклад: кут коліна проти результату —
+    AnnotationMetric.objects.filter(kind='angle', label='коліно').values('value', 'video__result_value').
+    """
+    class Kind(models.TextChoices):
+        ANGLE = 'angle', _('Angle')
+        LENGTH = 'length', _('Length')
+
+    video = models.ForeignKey(
+        AttemptVideo,
+        on_delete=models.CASCADE,
+        related_name='metrics',
+        db_index=False,  # префікс індексу (video, kind)
+        verbose_name=_('Video'),
+    )
+    shape_id = models.CharField(max_length=64, verbose_name=_('Shape ID'))
+    kind = models.CharField(max_length=8, choices=Kind.choices, verbose_name=_('Kind'))
+    label = models.CharField(max_length=64, blank=True, verbose_name=_('Label'))  # підпис фігури
+    value = models.FloatField(verbose_name=_('Value'))
+    t = models.FloatField(null=True, blank=True, verbose_name=_('Time (s)'))  # t_start фігури
+
+    class Meta:
+        verbose_name = _('Annotation metric')
+        verbose_name_plural = _('Annotation metrics')
+        ordering = ['video_id', 'kind', 't']
+        indexes = [
+            models.Index(fields=['video', 'kind']),
+            models.Index(fields=['kind', 'label', 'value']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.label or self.shape_id} = {self.value:.2f}"
+
+
+class BestResult(models.Model):
+    """
+    Матеріалізований найкращий результат для дисципліна × тип спроби × сезон.
+    Оновлюється інкрементально сигналами (dashboard/signals.py);
+    повний перерахунок — `manage.py rebuild_best_results`.
+    """
+    event_type = models.CharField(
+        max_length=20,
+        choices=AttemptVideo.EventType.choices,
+        verbose_name=_('Discipline'),
+    )
+    attempt_type = models.CharField(
+        max_length=20,
+        choices=AttemptCategory.AttemptType.choices,
+        verbose_name=_('Attempt type'),
+    )
+    # Сезон = календарний рік дати категорії
+    season = models.PositiveSmallIntegerField(verbose_name=_('Season'))
+    video = models.ForeignKey(
+        AttemptVideo,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Video'),
+    )
+    result_value = models.FloatField(verbose_name=_('Result (numeric)'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
+
+    class Meta:
+        verbose_name = _('Best result')
+        verbose_name_plural = _('Best results')
+        ordering = ['-season', 'event_type', 'attempt_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event_type', 'attempt_type', 'season'],
+                name='unique_best_result_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} / {self.get_attempt_type_display()} {self.season}: {self.result_value}"
+
 
 class OTPCode(models.Model):
     user = models.ForeignKey(
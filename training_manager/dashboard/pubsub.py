@@ -0,0 +1,102 @@
+# training_manager/dashboard/pubsub.py
+"""
+Pub/sub для живого редагування анотацій (live.py).
+
+Бекенд обирається налаштуванням ANNOTATION_PUBSUB_BACKEND (dotted path).
+За замовчуванням — InMemoryPubSub: черги в межах одного процесу, чого досить
+для локального запуску й одного ASGI-воркера. Для кількох процесів потрібен
+зовнішній бекенд (Redis тощо) з тим самим інтерфейсом PubSubBackend.
+"""
+import asyncio
+import threading
+from functools import lru_cache
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = "dashboard.pubsub.InMemoryPubSub"
+
+
+class Subscription:
+    """Підписка на канал: await get() -> наступне повідомлення."""
+
+    def __init__(self, backend, channel: str):
+        self.backend = backend
+        self.channel = channel
+        self.queue = asyncio.Queue()
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    async def close(self) -> None:
+        await self.backend.unsubscribe(self)
+
+
+class PubSubBackend:
+    async def publish(self, channel: str, message: dict) -> None:
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str) -> Subscription:
+        raise NotImplementedError
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+    def publish_sync(self, channel: str, message: dict) -> None:
+        """Публікація з синхронного коду (сигнали, sync-view)."""
+        async_to_sync(self.publish)(channel, message)
+
+
+class InMemoryPubSub(PubSubBackend):
+    """
+    Канали в пам'яті процесу. Повідомлення доставляються в event loop
+    підписників, тож publish_sync безпечний з будь-якого потоку; без
+    підписників він нічого не робить (жодного event loop-у на запис у WSGI).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: dict[str, set[Subscription]] = {}
+        self._loop = None
+
+    def _deliver(self, channel: str, message: dict) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            subscription.queue.put_nowait(message)
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self._deliver(channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def publish_sync(self, channel: str, message: dict) -> None:
+        with self._lock:
+            if channel not in self._channels or self._loop is None:
+                return
+            loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(channel, message)
+        else:
+            loop.call_soon_threadsafe(self._deliver, channel, message)
+
+
+@lru_cache(maxsize=None)
+def get_pubsub() -> PubSubBackend:
+    return import_string(getattr(settings, "ANNOTATION_PUBSUB_BACKEND", DEFAULT_BACKEND))()
@@ -0,0 +1,47 @@
+# training_manager/dashboard/results.py
+import re
+
+# Одиниці, які користувачі дописують до результату: "7.45 m", "10,12с" тощо
+_UNIT_SUFFIX_RE = re.compile(r"\s*(m|s|sec|м|с|сек)\.?$", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"^\d+(\.\d*)?$")
+
+
+def parse_result(raw) -> float | None:
+    """
+    Рядок результату -> число (секунди для бігу, метри для стрибків/метань).
+
+      "9.87" / "9,87" / "9.87 s"  -> 9.87
+      "1:02.35"                   -> 62.35   (m:ss.xx)
+      "2:01:15.3"                 -> 7275.3  (h:mm:ss.x)
+
+    Нерозпізнаний формат -> None.
+    """
+    if raw is None:
+        return None
+    text = _UNIT_SUFFIX_RE.sub("", str(raw).strip()).replace(",", ".")
+    if not text:
+        return None
+
+    parts = text.split(":")
+    if len(parts) > 3 or not all(_NUMBER_RE.match(p) for p in parts):
+        return None
+
+    # хвилини/секунди після першої частини не можуть бути >= 60
+    if any(float(p) >= 60 for p in parts[1:]):
+        return None
+
+    value = 0.0
+    for part in parts:
+        value = value * 60 + float(part)
+    return round(value, 3)
+
+
+def lower_is_better(event_type: str) -> bool:
+    """Для бігу менше — краще; для стрибків/метань — більше."""
+    return event_type == "run"
+
+
+def is_better(event_type: str, value: float, than: float | None) -> bool:
+    if than is None:
+        return True
+    return value < than if lower_is_better(event_type) else value > than
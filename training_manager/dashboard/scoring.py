@@ -0,0 +1,137 @@
+# training_manager/dashboard/scoring.py
+"""
+Очки за таблицями World Athletics (IAAF) для багатоборства.
+
+  біг:        P = A * (B - T) ^ C,  T — секунди
+  стрибки:    P = A * (M - B) ^ C,  M — сантиметри
+  метання:    P = A * (M - B) ^ C,  M — метри
+
+Коефіцієнти — опубліковані таблиці багатоборства (чоловіки). Винятки: 800 м —
+таблиця жіночого семиборства (чоловічої немає); потрійний стрибок у таблицях
+багатоборства відсутній, тож він перераховується в еквівалент стрибка в довжину
+(відношення світових рекордів 8.95 / 18.29) і оцінюється таблицею довжини.
+
+Конкретну дисципліну (AttemptVideo.discipline) вибирає користувач. Якщо її немає,
+таблиця вгадується за величиною результату в межах узагальненого event_type —
+лише там, де діапазони не перетинаються (INFERRED). Жердину від довжини і диск
+від списа за числом не відрізнити: жердина — тільки явно, 23.5–75 м — диск.
+Результат поза правдоподібним діапазоном таблиці -> NULL, а не 0 очок.
+
+Усе рахується векторно (NumPy) — і для одного відео в save(), і для всієї
+бібліотеки в `manage.py recompute_points`.
+"""
+import numpy as np
+
+TRIPLE_TO_LONG = 8.95 / 18.29
+
+# дисципліна -> (event_type, A, B, C, множник одиниць, трек?, правдоподібний діапазон).
+# Діапазон: від нуля очок (B) до трохи кращого за світовий рекорд, у секундах/метрах
+SCORING_TABLES = {
+    "100m": ("run", 25.4347, 18.0, 1.81, 1.0, True, (9.5, 18.0)),
+    "200m": ("run", 5.8425, 38.0, 1.81, 1.0, True, (19.0, 38.0)),
+    "400m": ("run", 1.53775, 82.0, 1.81, 1.0, True, (43.0, 82.0)),
+    "800m": ("run", 0.11193, 254.0, 1.88, 1.0, True, (100.0, 254.0)),
+    "1500m": ("run", 0.03768, 480.0, 1.85, 1.0, True, (205.0, 480.0)),
+    "hj": ("jump", 0.8465, 75.0, 1.42, 100.0, False, (0.75, 2.5)),
+    "pv": ("jump", 0.2797, 100.0, 1.35, 100.0, False, (1.0, 6.3)),
+    "lj": ("jump", 0.14354, 220.0, 1.40, 100.0, False, (2.2, 9.0)),
+    "tj": ("jump", 0.14354, 220.0, 1.40, 100.0 * TRIPLE_TO_LONG, False, (4.5, 18.3)),
+    "sp": ("throw", 51.39, 1.5, 1.05, 1.0, False, (1.5, 23.6)),
+    "dt": ("throw", 12.91, 4.0, 1.10, 1.0, False, (4.0, 75.0)),
+    "jt": ("throw", 10.14, 7.0, 1.08, 1.0, False, (7.0, 99.0)),
+}
+
+# без явної дисципліни: [нижня, верхня) межа результату -> таблиця; діапазони не перетинаються
+INFERRED = {
+    "100m": (9.5, 18.0),
+    "200m": (19.0, 38.0),
+    "400m": (43.0, 82.0),
+    "800m": (100.0, 205.0),
+    "1500m": (205.0, 480.0),
+    "hj": (0.75, 2.5),
+    "lj": (2.5, 9.0),
+    "tj": (9.0, 18.3),
+    "sp": (1.5, 23.5),
+    "dt": (23.5, 75.0),
+    "jt": (75.0, 99.0),
+}
+
+
+def discipline_event_type(discipline: str) -> str | None:
+    """Конкретна дисципліна -> узагальнений event_type (run/jump/throw)."""
+    table = SCORING_TABLES.get(discipline)
+    return table[0] if table else None
+
+
+def compute_points(event_types, values, disciplines=None) -> np.ndarray:
+    """
+    Масиви дисциплін, числових результатів і (необов'язково) конкретних дисциплін -> очки (int64).
+    Нерозпізнаний результат (NaN/None) або результат поза діапазоном таблиці -> -1.
+    Конкретна дисципліна не з того event_type ігнорується (таблиця вгадується).
+    """
+    event_types = np.asarray(event_types)
+    values = np.asarray(values, dtype=np.float64)
+    disciplines = np.asarray([""] * len(values) if disciplines is None else disciplines)
+    points = np.full(values.shape, -1, dtype=np.int64)
+    valid = ~np.isnan(values)
+
+    explicit = np.zeros(values.shape, dtype=bool)
+    for code, (event_type, *_rest) in SCORING_TABLES.items():
+        explicit |= (event_types == event_type) & (disciplines == code)
+
+    for code, (event_type, a, b, c, unit, is_track, (low, high)) in SCORING_TABLES.items():
+        in_event = valid & (event_types == event_type)
+        mask = in_event & (disciplines == code) & (values >= low) & (values <= high)
+        if code in INFERRED:
+            inferred_low, inferred_high = INFERRED[code]
+            mask |= in_event & ~explicit & (values >= inferred_low) & (values < inferred_high)
+        if not mask.any():
+            continue
+        measured = values[mask] * unit
+        diff = (b - measured) if is_track else (measured - b)
+        points[mask] = np.floor(a * np.power(np.clip(diff, 0.0, None), c)).astype(np.int64)
+
+    return points
+
+
+def points_for(event_type: str, value: float | None, discipline: str = "") -> int | None:
+    """Очки для одного результату (None, якщо результат не розпізнано або він поза таблицями)."""
+    result = compute_points([event_type], [np.nan if value is None else value], [discipline or ""])[0]
+    return None if result < 0 else int(result)
+
+
+def recompute_library_points(video_model, chunk_size: int = 5000) -> int:
+    """
+    Перераховує points для всієї бібліотеки: пачками values_list -> NumPy -> bulk_update.
+    Модель передається параметром (викликається і з міграції, і з команди).
+    Повертає к-сть змінених рядків.
+    """
+    # міграція 0012 бачить модель ще без поля discipline (воно з 0018)
+    discipline_field = ["discipline"] if any(f.name == "discipline" for f in video_model._meta.get_fields()) else []
+    changed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            video_model.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "event_type", "result_value", "points", *discipline_field)[:chunk_size]
+        )
+        if not rows:
+            return changed
+        last_id = rows[-1][0]
+
+        ids, event_types, values, stored, *disciplines = zip(*rows)
+        values = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        stored = np.array([-1 if p is None else p for p in stored], dtype=np.int64)
+        points = compute_points(event_types, values, disciplines[0] if disciplines else None)
+
+        diff = np.flatnonzero(points != stored)
+        if diff.size:
+            video_model.objects.bulk_update(
+                [
+                    video_model(id=ids[i], points=None if points[i] < 0 else int(points[i]))
+                    for i in diff
+                ],
+                ["points"],
+            )
+            changed += int(diff.size)
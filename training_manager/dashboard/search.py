@@ -0,0 +1,162 @@
+# training_manager/dashboard/search.py
+"""
+Повнотекстовий пошук по категоріях і відео (SQLite FTS5).
+
+Віртуальна таблиця `dashboard_search` створюється міграцією 0010.
+rowid документа детермінований (категорія: 2*id, відео: 2*id+1), тож
+оновлення/видалення — пошук за первинним ключем, а не скан.
+Синхронізація — сигналами (signals.py), повна перебудова —
+`manage.py rebuild_search_index`.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils import translation
+
+from .models import AttemptCategory, AttemptVideo
+
+SEARCH_TABLE = "dashboard_search"
+
+# kind, object_id, category_id — службові (UNINDEXED); решта — текстові колонки
+SEARCH_COLUMNS = ("kind", "object_id", "category_id", "place", "attempt_type", "date", "event", "result")
+# bm25: вага кожної колонки в порядку SEARCH_COLUMNS (місце важить найбільше)
+_BM25_WEIGHTS = "0.0, 0.0, 0.0, 10.0, 2.0, 2.0, 4.0, 1.0"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+KIND_CATEGORY = "category"
+KIND_VIDEO = "video"
+
+
+def is_available() -> bool:
+    return connection.vendor == "sqlite"
+
+
+def _rowid(kind: str, pk: int) -> int:
+    return pk * 2 + (1 if kind == KIND_VIDEO else 0)
+
+
+def _labels(choices_cls, value: str) -> str:
+    """Код + підписи всіма мовами інтерфейсу: шукається і "competition", і "Змагання"."""
+    label = dict(choices_cls.choices).get(value)
+    words = {value}
+    if label is not None:
+        for code, _name in settings.LANGUAGES:
+            with translation.override(code):
+                words.add(str(label))
+    return " ".join(sorted(words))
+
+
+def _date_text(date) -> str:
+    return f"{date:%Y-%m-%d} {date:%d.%m.%Y}"
+
+
+def _category_columns(category) -> dict:
+    return {
+        "place": category.place,
+        "attempt_type": _labels(AttemptCategory.AttemptType, category.attempt_type),
+        "date": _date_text(category.date),
+    }
+
+
+def _upsert(cursor, kind: str, pk: int, category_id: int, columns: dict) -> None:
+    rowid = _rowid(kind, pk)
+    cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [rowid])
+    cursor.execute(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+        f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_COLUMNS))})",
+        [
+            rowid, kind, pk, category_id,
+            columns.get("place", ""),
+            columns.get("attempt_type", ""),
+            columns.get("date", ""),
+            columns.get("event", ""),
+            columns.get("result", ""),
+        ],
+    )
+
+
+def _video_columns(video, category_columns: dict) -> dict:
+    return {
+        **category_columns,
+        "event": _labels(AttemptVideo.EventType, video.event_type),
+        "result": video.result,
+    }
+
+
+def index_category(category, with_videos: bool = True) -> None:
+    if not is_available():
+        return
+    columns = _category_columns(category)
+    with connection.cursor() as cursor:
+        _upsert(cursor, KIND_CATEGORY, category.pk, category.pk, columns)
+        if with_videos:
+            # місце/дата/тип категорії входять і в документи її відео
+            for video in AttemptVideo.objects.filter(category=category).only("id", "event_type", "result"):
+                _upsert(cursor, KIND_VIDEO, video.pk, category.pk, _video_columns(video, columns))
+
+
+def index_video(video) -> None:
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        _upsert(
+            cursor, KIND_VIDEO, video.pk, video.category_id,
+            _video_columns(video, _category_columns(video.category)),
+        )
+
+
+def remove(kind: str, pk: int) -> None:
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [_rowid(kind, pk)])
+
+
+def rebuild_index(category_model=AttemptCategory, video_model=AttemptVideo) -> int:
+    """Повна перебудова. Моделі — параметрами, щоб викликати з міграції."""
+    if not is_available():
+        return 0
+    category_columns = {}
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        for category in category_model.objects.only("id", "place", "attempt_type", "date").iterator(chunk_size=2000):
+            category_columns[category.pk] = _category_columns(category)
+            _upsert(cursor, KIND_CATEGORY, category.pk, category.pk, category_columns[category.pk])
+            count += 1
+        for video in video_model.objects.only("id", "category_id", "event_type", "result").iterator(chunk_size=2000):
+            columns = category_columns.get(video.category_id, {})
+            _upsert(cursor, KIND_VIDEO, video.pk, video.category_id, _video_columns(video, columns))
+            count += 1
+    return count
+
+
+def build_match_query(text: str) -> str:
+    """
+    Рядок користувача -> запит FTS5: кожне слово як префікс, усі слова обов'язкові.
+    "київ 202" -> '"київ"* "202"*'
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    return " ".join(f'"{token}"*' for token in tokens[:8])
+
+
+def search(text: str, limit: int = 20) -> list[dict]:
+    """
+    Ранжований пошук (bm25, менше — краще).
+    Повертає [{kind, id, category_id, rank}], найрелевантніші першими.
+    """
+    match = build_match_query(text)
+    if not match or not is_available():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT kind, object_id, category_id, bm25({SEARCH_TABLE}, {_BM25_WEIGHTS}) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+            [match, limit],
+        )
+        return [
+            {"kind": kind, "id": object_id, "category_id": category_id, "rank": rank}
+            for kind, object_id, category_id, rank in cursor.fetchall()
+        ]
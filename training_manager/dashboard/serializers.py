@@ -0,0 +1,80 @@
+# training_manager/dashboard/serializers.py
+"""
+Серіалізатори REST API (api/v1, лише читання).
+
+Вкладені об'єкти (категорія відео, відео анотації) читаються з
+select_related у viewset-ах (api.py) — без додаткових запитів на рядок.
+"""
+from rest_framework import serializers
+
+from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+
+
+def requested_fields(request) -> set[str] | None:
+    """?fields=id,place,date -> {"id", "place", "date"}; без параметра — None (усі поля)."""
+    raw = request.query_params.get("fields") if request is not None else None
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Sparse fieldsets: лишає тільки поля з ?fields= (невідомі імена ігноруються)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # лише для верхнього рівня — вкладені серіалізатори віддають усе
+        if self.parent is not None:
+            return
+        wanted = requested_fields(self.context.get("request"))
+        if wanted is None:
+            return
+        for name in set(self.fields) - wanted:
+            self.fields.pop(name)
+
+
+class CategorySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AttemptCategory
+        fields = ["id", "attempt_type", "place", "date"]
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = AttemptCategory
+        fields = [
+            "id", "attempt_type", "place", "date", "rank",
+            "videos_count", "best_result_value", "last_video_at",
+        ]
+
+
+class VideoSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AttemptVideo
+        fields = ["id", "category_id", "event_type", "attempt_number"]
+
+
+class VideoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    category = CategorySummarySerializer(read_only=True)
+    video_url = serializers.FileField(source="video", read_only=True)
+
+    class Meta:
+        model = AttemptVideo
+        fields = [
+            "id", "category", "event_type", "discipline", "result", "result_value", "points",
+            "attempt_number", "place_in_protocol", "time", "video_url",
+            "created_at", "updated_at",
+        ]
+
+
+class AnnotationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    video = VideoSummarySerializer(read_only=True)
+    updated_by = serializers.CharField(source="updated_by.username", default=None, read_only=True)
+    shapes = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AttemptVideoAnnotation
+        fields = ["id", "video", "shapes", "version", "updated_by", "updated_at"]
+
+    def get_shapes(self, obj):
+        return obj.get_shapes()
@@ -0,0 +1,149 @@
+# training_manager/dashboard/shape_codec.py
+"""
+Компактне зберігання фігур анотацій.
+
+Олівець (freehand) пише кожну точку миші, тож сирі фігури важать багато.
+При записі:
+  1. freehand спрощується алгоритмом Рамера–Дугласа–Пекера (допуск
+     ANNOTATION_RDP_TOLERANCE у нормованих координатах кадру 0..1);
+  2. точки всіх фігур квантуються (POINT_SCALE поділок на кадр) і
+     дельта-кодуються: "pts": [{"x":..,"y":..}, ...] -> "qpts": [x0, y0, dx1, dy1, ...].
+При читанні (get_shapes / shapes_from_data) "qpts" прозоро стає "pts" —
+клієнти формату не бачать.
+"""
+import numpy as np
+from django.conf import settings
+
+POINT_SCALE = 10000  # 1/10000 кадру: < 0.4 px навіть для 4K
+DEFAULT_RDP_TOLERANCE = 0.0008  # ~1.5 px на 1920
+
+SIMPLIFIED_TYPES = {"freehand"}
+
+
+def rdp_tolerance() -> float:
+    return float(getattr(settings, "ANNOTATION_RDP_TOLERANCE", DEFAULT_RDP_TOLERANCE))
+
+
+def rdp_mask(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Рамер–Дуглас–Пекер без рекурсії (стек відрізків), відстані — векторно.
+    points: (n, 2). Повертає bool-маску точок, що лишаються.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        seg = b - a
+        inner = points[start + 1:end]
+        seg_len = np.hypot(*seg)
+        if seg_len == 0.0:
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            # |векторний добуток| / довжина відрізка = відстань до прямої
+            dist = np.abs(seg[0] * (inner[:, 1] - a[1]) - seg[1] * (inner[:, 0] - a[0])) / seg_len
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def points_array(pts) -> np.ndarray | None:
+    """[{"x":..,"y":..}, ...] -> (n, 2); невалідні точки -> None (фігуру не чіпаємо)."""
+    try:
+        return np.array([(float(p["x"]), float(p["y"])) for p in pts], dtype=np.float64).reshape(-1, 2)
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def encode_shape(shape: dict, tolerance: float) -> dict:
+    pts = shape.get("pts")
+    if not isinstance(pts, list) or not pts:
+        return shape
+    points = points_array(pts)
+    if points is None or not np.isfinite(points).all():
+        return shape
+    if shape.get("type") in SIMPLIFIED_TYPES and tolerance > 0:
+        points = points[rdp_mask(points, tolerance)]
+
+    quantised = np.rint(points * POINT_SCALE).astype(np.int64)
+    deltas = np.diff(quantised, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    encoded = {key: value for key, value in shape.items() if key != "pts"}
+    encoded["qpts"] = deltas.ravel().tolist()
+    return encoded
+
+
+def decode_shape(shape: dict) -> dict:
+    qpts = shape.get("qpts")
+    if not isinstance(qpts, list):
+        return shape
+    points = np.cumsum(np.asarray(qpts, dtype=np.int64).reshape(-1, 2), axis=0) / POINT_SCALE
+    decoded = {key: value for key, value in shape.items() if key != "qpts"}
+    decoded["pts"] = [{"x": x, "y": y} for x, y in points.tolist()]
+    return decoded
+
+
+def decode_shapes(shapes: list) -> list:
+    return [decode_shape(s) if isinstance(s, dict) else s for s in shapes]
+
+
+def shapes_from_data(data) -> list:
+    """Вміст AttemptVideoAnnotation.data -> список фігур у клієнтському форматі."""
+    shapes = data.get("shapes", []) if isinstance(data, dict) else []
+    return decode_shapes(shapes) if isinstance(shapes, list) else []
+
+
+def data_from_shapes(shapes: list, tolerance: float | None = None, previous=None) -> dict:
+    """
+    Список фігур від клієнта -> компактний вміст для AttemptVideoAnnotation.data.
+    previous — попередній data: незмінені фігури беруться звідти як є, тож
+    уже спрощені лінії не спрощуються (і не зсуваються) повторно.
+    """
+    stored = previous.get("shapes", []) if isinstance(previous, dict) else []
+    reuse = {}
+    for shape in stored if isinstance(stored, list) else []:
+        if isinstance(shape, dict) and "id" in shape:
+            reuse[shape["id"]] = (decode_shape(shape), shape)
+
+    tolerance = rdp_tolerance() if tolerance is None else tolerance
+    result = []
+    for shape in shapes:
+        if not isinstance(shape, dict):
+            result.append(shape)
+            continue
+        decoded, encoded = reuse.get(shape.get("id"), (None, None))
+        result.append(encoded if decoded == shape else encode_shape(shape, tolerance))
+    return {"shapes": result}
+
+
+def compact_annotations(annotation_model, tolerance: float | None = None, chunk_size: int = 500) -> int:
+    """
+    Перекодовує всі анотації в компактний формат (міграція/повторне стиснення).
+    Модель передається параметром. Пачки за id (keyset) — без запису в БД
+    посеред відкритого курсора. Повертає к-сть змінених записів.
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        batch = list(annotation_model.objects.filter(id__gt=last_id).order_by("id").only("id", "data")[:chunk_size])
+        if not batch:
+            return changed
+        last_id = batch[-1].id
+        dirty = []
+        for ann in batch:
+            compact = data_from_shapes(shapes_from_data(ann.data), tolerance)
+            if compact != ann.data:
+                ann.data = compact
+                dirty.append(ann)
+        if dirty:
+            annotation_model.objects.bulk_update(dirty, ["data"])
+            changed += len(dirty)
@@ -0,0 +1,131 @@
+# training_manager/dashboard/signals.py
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import annotation_history, annotation_metrics, annotation_shapes, best_results, category_stats, live, metrics, search, slow_queries
+from .cache_versions import bump_generation
+from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+
+
+# -------------------------
+# Стан до збереження (щоб знати, з якого «кошика» пішов запис)
+# -------------------------
+@receiver(pre_save, sender=AttemptVideo)
+def remember_video_state(sender, instance, raw=False, **kwargs):
+    instance._pre_save_state = None
+    if raw or instance.pk is None:
+        return
+    instance._pre_save_state = (
+        AttemptVideo.objects.filter(pk=instance.pk)
+        .values("category_id", "event_type", "result_value", "category__attempt_type", "category__date")
+        .first()
+    )
+
+
+@receiver(pre_save, sender=AttemptCategory)
+def remember_category_state(sender, instance, raw=False, **kwargs):
+    instance._pre_save_state = None
+    if raw or instance.pk is None:
+        return
+    instance._pre_save_state = (
+        AttemptCategory.objects.filter(pk=instance.pk).values("attempt_type", "date", "place").first()
+    )
+
+
+@receiver(pre_save, sender=AttemptVideoAnnotation)
+def remember_annotation_state(sender, instance, raw=False, **kwargs):
+    instance._pre_save_state = None
+    if raw or instance.pk is None:
+        return
+    instance._pre_save_state = (
+        AttemptVideoAnnotation.objects.filter(pk=instance.pk).values("data", "version").first()
+    )
+
+
+# -------------------------
+# AttemptVideo
+# -------------------------
+@receiver(post_save, sender=AttemptVideo)
+def video_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_pre_save_state", None)
+    best_results.on_video_saved(instance, previous)
+    category_stats.on_video_saved(instance, created, previous)
+    search.index_video(instance)
+
+
+@receiver(post_delete, sender=AttemptVideo)
+def video_deleted(sender, instance, **kwargs):
+    best_results.on_video_deleted(instance)
+    category_stats.on_video_deleted(instance)
+    search.remove(search.KIND_VIDEO, instance.pk)
+
+
+# -------------------------
+# AttemptCategory
+# -------------------------
+@receiver(post_save, sender=AttemptCategory)
+def category_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_pre_save_state", None)
+    best_results.on_category_saved(instance, previous)
+    # документи відео містять місце/дату/тип категорії — переіндексуємо їх лише при зміні
+    search.index_category(
+        instance,
+        with_videos=bool(previous) and previous != {
+            "attempt_type": instance.attempt_type, "date": instance.date, "place": instance.place,
+        },
+    )
+
+
+@receiver(post_delete, sender=AttemptCategory)
+def category_deleted(sender, instance, **kwargs):
+    best_results.on_category_deleted(instance)
+    search.remove(search.KIND_CATEGORY, instance.pk)
+
+
+# -------------------------
+# AttemptVideoAnnotation
+# -------------------------
+@receiver(post_save, sender=AttemptVideoAnnotation)
+def annotation_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    annotation_shapes.sync_annotation(instance)
+    annotation_metrics.sync_annotation(instance)
+    annotation_history.record_revision(instance, getattr(instance, "_pre_save_state", None))
+    # підключені до відео клієнти (live.py) дізнаються про нову версію
+    video_id, version, origin = instance.video_id, instance.version, getattr(instance, "_live_origin", None)
+    transaction.on_commit(lambda: live.publish_saved(video_id, version, origin))
+
+
+@receiver(post_delete, sender=AttemptVideoAnnotation)
+def annotation_deleted(sender, instance, **kwargs):
+    # фігури й версії видаляються каскадом, метрики прив'язані до відео
+    annotation_metrics.remove_annotation(instance)
+
+
+# -------------------------
+# Покоління кешу (cache_versions.py)
+# -------------------------
+@receiver(post_save, sender=AttemptCategory)
+@receiver(post_delete, sender=AttemptCategory)
+@receiver(post_save, sender=AttemptVideo)
+@receiver(post_delete, sender=AttemptVideo)
+@receiver(post_save, sender=AttemptVideoAnnotation)
+@receiver(post_delete, sender=AttemptVideoAnnotation)
+def bump_cache_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+# -------------------------
+# Метрики SQL (metrics.MetricsMiddleware) і журнал повільних запитів
+# -------------------------
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    metrics.install_sql_timer(connection)
+    slow_queries.install_slow_query_logger(connection)
@@ -0,0 +1,126 @@
+# training_manager/dashboard/slow_queries.py
+"""
+Журнал повільних SQL-запитів.
+
+Обгортка execute_wrappers (ставиться на кожне з'єднання сигналом
+connection_created, як і metrics.sql_timer) міряє кожен запит; довший за
+SLOW_QUERY_MS пишеться JSON-рядком у логер "dashboard.slow_queries"
+(RotatingFileHandler, див. LOGGING): нормалізований SQL і його fingerprint,
+час, аліас БД, view запиту і план SQLite EXPLAIN QUERY PLAN. Параметри запиту
+в журнал не потрапляють (там бувають OTP-коди й пошта).
+
+План знімається окремим курсором бекенду (без обгорток Django) і кешується за
+fingerprint-ом, тож серія однакових повільних запитів не множить EXPLAIN-и.
+Звіт — `manage.py slow_query_report`.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .metrics import current_view
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200
+MAX_SQL_LENGTH = 4000
+PLAN_CACHE_SIZE = 512
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%s|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+_plans: dict[str, list | None] = {}
+
+
+def normalize_sql(sql: str) -> str:
+    """Літерали й параметри -> "?", списки IN (?, ?, ...) -> (...), пробіли згорнуті."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.md5(normalized.encode()).hexdigest()[:16]
+
+
+def explain_query_plan(connection, sql: str, params) -> list | None:
+    """Рядки EXPLAIN QUERY PLAN з відступом за вкладеністю (None — не SQLite або не вдалося)."""
+    if connection.vendor != "sqlite" or not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        rows = cursor.fetchall()
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _notused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def plan_flags(plan) -> dict:
+    """SCAN — повний прохід таблиці чи індексу (на відміну від SEARCH); TEMP B-TREE — сортування/групування в пам'яті."""
+    details = [line.strip() for line in plan or ()]
+    return {
+        "full_scan": any(d.startswith("SCAN ") and d != "SCAN CONSTANT ROW" for d in details),
+        "temp_btree": any("USE TEMP B-TREE" in d for d in details),
+    }
+
+
+def _plan_for(key: str, connection, sql: str, params) -> list | None:
+    if key not in _plans:
+        if len(_plans) >= PLAN_CACHE_SIZE:
+            _plans.clear()
+        _plans[key] = explain_query_plan(connection, sql, params)
+    return _plans[key]
+
+
+def record_slow_query(connection, sql: str, params, many: bool, elapsed_ms: float) -> dict:
+    normalized = normalize_sql(sql)
+    key = fingerprint(normalized)
+    plan = None if many else _plan_for(key, connection, sql, params)
+    entry = {
+        "ts": timezone.now().isoformat(),
+        "fingerprint": key,
+        "ms": round(elapsed_ms, 2),
+        "alias": connection.alias,
+        "view": current_view(),
+        "many": many,
+        "sql": normalized[:MAX_SQL_LENGTH],
+        "plan": plan,
+        **plan_flags(plan),
+    }
+    logger.info(json.dumps(entry, ensure_ascii=False))
+    return entry
+
+
+def slow_query_logger(execute, sql, params, many, context):
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms >= getattr(settings, "SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS):
+        record_slow_query(context["connection"], sql, params, many, elapsed_ms)
+    return result
+
+
+def install_slow_query_logger(connection) -> None:
+    """connection_created; при SLOW_QUERY_MS = 0 журнал вимкнено і обгортка не ставиться."""
+    if getattr(settings, "SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS) <= 0:
+        return
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
@@ -0,0 +1,91 @@
+# training_manager/dashboard/sqlite_backend/base.py
+"""
+SQLite для продакшену: ENGINE = "dashboard.sqlite_backend".
+
+Стандартний бекенд Django 5.0 відкриває файл із налаштуваннями SQLite за
+замовчуванням (rollback journal, DEFERRED-транзакції), тож паралельні записи
+(збереження анотацій, OTP, сесії) ловлять "database is locked". Тут:
+  • PRAGMA при кожному підключенні (OPTIONS["pragmas"], поверх DEFAULT_PRAGMAS):
+    WAL — читачі не блокують запис; synchronous=NORMAL — без fsync на кожен коміт
+    (у WAL безпечно для цілісності); busy_timeout — чекати на lock, а не падати;
+    mmap/cache/temp_store — менше системних викликів на читанні;
+  • транзакції atomic() — BEGIN IMMEDIATE (OPTIONS["transaction_mode"]): write-lock
+    береться на старті й чекає busy_timeout. При DEFERRED читання, що переходить
+    у запис, падає одразу (SQLITE_BUSY без очікування — інакше взаємне блокування);
+  • оператори поза транзакцією (autocommit) при "database is locked" повторюються
+    з експоненційною паузою (OPTIONS["lock_retries"]).
+У Django 5.1+ частину цього дають OPTIONS init_command / transaction_mode.
+"""
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,        # мс
+    "mmap_size": 268435456,      # 256 MiB
+    "cache_size": -20000,        # від'ємне — у KiB (≈20 MiB)
+    "temp_store": "MEMORY",
+}
+DEFAULT_TRANSACTION_MODE = "IMMEDIATE"
+DEFAULT_LOCK_RETRIES = 3
+LOCK_RETRY_PAUSE = 0.05  # с, подвоюється з кожною спробою
+
+
+def _is_locked(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return "database is locked" in message or "database table is locked" in message
+
+
+class RetryingCursorWrapper(base.SQLiteCursorWrapper):
+    """Повторює оператор при lock — лише поза транзакцією, де це безпечно."""
+
+    lock_retries = DEFAULT_LOCK_RETRIES
+
+    def _retry(self, method, *args):
+        pause = LOCK_RETRY_PAUSE
+        for attempt in range(self.lock_retries + 1):
+            try:
+                return method(*args)
+            except base.Database.OperationalError as exc:
+                # усередині транзакції повтор одного оператора зламав би атомарність
+                if attempt == self.lock_retries or self.connection.in_transaction or not _is_locked(exc):
+                    raise
+                time.sleep(pause)
+                pause *= 2
+
+    def execute(self, query, params=None):
+        return self._retry(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        return self._retry(super().executemany, query, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        options = self.settings_dict["OPTIONS"]
+        self.pragmas = {**DEFAULT_PRAGMAS, **options.get("pragmas", {})}
+        self.transaction_mode = options.get("transaction_mode", DEFAULT_TRANSACTION_MODE)
+        self.lock_retries = int(options.get("lock_retries", DEFAULT_LOCK_RETRIES))
+        if self.transaction_mode not in ("DEFERRED", "IMMEDIATE", "EXCLUSIVE"):
+            raise ImproperlyConfigured(f"Unsupported SQLite transaction_mode: {self.transaction_mode!r}")
+        params = super().get_connection_params()
+        for key in ("pragmas", "transaction_mode", "lock_retries"):
+            params.pop(key, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=RetryingCursorWrapper)
+        cursor.lock_retries = self.lock_retries
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
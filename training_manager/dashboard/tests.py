@@ -1,3 +1,432 @@
-from django.test import TestCase
+"""
+Бюджети запитів до БД для сторінок і API dashboard.
 
-# Create your tests here.
+Кожен URL проганяється двічі: на невеликому наборі даних і після того, як
+даних стало в рази більше. К-сть SQL-запитів не має зрости (інакше десь N+1 —
+напр., video.annotation чи video.category у циклі шаблону) і не має перевищувати
+бюджет з QUERY_BUDGETS. Кеш чиститься перед кожним запитом — міряємо холодний
+шлях. Для сторінок за логіном бюджет включає 2 запити middleware (сесія і користувач).
+
+SeasonFilterTests — некоректний ?season= ігнорується (бібліотека й експорт), а не дає 500.
+
+VideoResultTests — нерозпізнаний результат (X, NM, "10.8w") зберігається без result_value/points.
+
+ScoringTests — очки за таблицями World Athletics: кожна таблиця, вгадування за результатом, NULL поза діапазоном.
+
+NewsInflightTests — дедуплікація паралельних збирань новин (utils.afetch_sport_news)
+не має ділити asyncio.Task між event loop-ами різних потоків.
+"""
+import asyncio
+import itertools
+import threading
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+
+from . import annotation_metrics, annotation_shapes, best_results, category_stats, search, utils
+from .forms import AttemptVideoForm
+from .db_router import REPLICA_ALIAS, replica_configured
+from .models import AnnotationMetric, AnnotationShape, AttemptCategory, AttemptVideo, AttemptVideoAnnotation
+from .results import parse_result
+from .scoring import SCORING_TABLES, points_for
+from .shape_codec import data_from_shapes
+from .urls import urlpatterns
+
+# назва маршруту -> максимум SQL-запитів на один GET
+QUERY_BUDGETS = {
+    "index": 2,
+    "upload": 6,
+    "library": 6,
+    "leaderboard": 4,
+    "search": 5,
+    "progress": 2,
+    "progress_api": 3,
+    "export_attempts": 3,
+    "edit_category": 3,
+    "category_detail": 5,
+    "edit_video": 5,
+    "annotations_list": 4,
+    "annotate_video": 4,
+    "annotations_api": 4,
+    "annotations_batch": 3,
+    "annotation_revisions": 4,
+    "annotation_revision": 7,
+    "api-category-list": 3,
+    "api-category-detail": 3,
+    "api-video-list": 3,
+    "api-video-detail": 3,
+    "api-annotation-list": 3,
+    "api-annotation-detail": 3,
+    "debug_news": 0,
+}
+
+# маршрути без бюджету: лише POST, без звернень до даних dashboard
+# або home (шаблону dashboard/home.html у проєкті немає)
+NOT_BUDGETED = {
+    "login", "verify_code", "logout", "set_language", "set_theme", "jsi18n", "metrics", "api-root",
+    "delete_category", "delete_video", "annotation_revision_restore", "home",
+}
+
+EVENTS = [AttemptVideo.EventType.RUN, AttemptVideo.EventType.JUMP, AttemptVideo.EventType.THROW]
+RESULTS = {
+    AttemptVideo.EventType.RUN: "12.{:02d}",
+    AttemptVideo.EventType.JUMP: "6.{:02d}",
+    AttemptVideo.EventType.THROW: "14.{:02d}",
+}
+
+
+def _shapes(count: int, offset: int = 0) -> list:
+    kinds = itertools.cycle(["line", "angle", "arrow", "rect", "circle", "freehand"])
+    shapes = []
+    for i, kind in zip(range(count), kinds):
+        n = {"angle": 3, "freehand": 12}.get(kind, 2)
+        # формат редактора (annotate_video.html): точки — {"x", "y"} у частках кадру
+        pts = [{"x": round(0.1 + 0.05 * ((i + j) % 15), 3), "y": round(0.2 + 0.04 * j, 3)} for j in range(n)]
+        shapes.append({
+            "id": f"s{offset + i}", "type": kind, "pts": pts, "color": "#ef4444", "width": 3,
+            "t_start": float(i % 10), "t_end": float(i % 10) + 2, "label": "knee" if kind == "angle" else "",
+        })
+    return shapes
+
+
+def _route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+def _replica_reads_default(test: TestCase) -> None:
+    """
+    З DB_REPLICA_NAME важкі сторінки читають з "replica" (у тестах — дзеркало default):
+    окреме з'єднання не бачило б даних незакоміченої транзакції TestCase.
+    """
+    if replica_configured():
+        replica = connections[REPLICA_ALIAS]
+        connections[REPLICA_ALIAS] = connections[DEFAULT_DB_ALIAS]
+        test.addCleanup(connections.__setitem__, REPLICA_ALIAS, replica)
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("coach", "coach@example.com", "pass")
+        cls.category = AttemptCategory.objects.create(
+            attempt_type=AttemptCategory.AttemptType.COMPETITION, place="Київ", date=date(2024, 6, 1), rank=1,
+        )
+        cls.video = AttemptVideo.objects.create(
+            category=cls.category, video="attempt_videos/q.mp4", event_type=AttemptVideo.EventType.JUMP,
+            result="6.50", attempt_number=1,
+        )
+        # через save(): сигнали пишуть історію версій, фігури й метрики
+        cls.annotation = AttemptVideoAnnotation(video=cls.video, updated_by=cls.user, version=1)
+        cls.annotation.set_shapes(_shapes(3))
+        cls.annotation.save()
+        cls._seed(categories=3, videos_per_category=4)
+
+    @classmethod
+    def _seed(cls, categories: int, videos_per_category: int) -> None:
+        """Масові дані bulk_create-ом + перерахунок денормалізованих таблиць, як після міграцій."""
+        start = AttemptCategory.objects.count()
+        new_categories = AttemptCategory.objects.bulk_create([
+            AttemptCategory(
+                attempt_type=AttemptCategory.AttemptType.values[i % 2],
+                place=f"Стадіон {i}",
+                date=date(2022, 1, 1) + timedelta(days=7 * i),
+                rank=i % 5 + 1 if i % 2 else None,
+            )
+            for i in range(start, start + categories)
+        ])
+        targets = new_categories + [cls.category]
+        videos = []
+        for category in targets:
+            for n in range(videos_per_category):
+                event = EVENTS[n % len(EVENTS)]
+                result = RESULTS[event].format(n % 100)
+                # result_value/points рахує save(), а bulk_create його не викликає
+                videos.append(AttemptVideo(
+                    category=category, video=f"attempt_videos/{category.pk}_{n}.mp4", event_type=event,
+                    result=result, result_value=parse_result(result),
+                    points=points_for(event, parse_result(result)), attempt_number=n + 2,
+                ))
+        videos = AttemptVideo.objects.bulk_create(videos)
+        AttemptVideoAnnotation.objects.bulk_create([
+            # data_from_shapes — як save(): компактні "qpts" замість сирих "pts"
+            AttemptVideoAnnotation(
+                video=video, data=data_from_shapes(_shapes(2 + i % 4)), updated_by=cls.user, version=1,
+            )
+            for i, video in enumerate(videos)
+            if i % 3
+        ])
+        category_stats.reconcile()
+        best_results.rebuild_all()
+        search.rebuild_index()
+        annotation_shapes.rebuild_all()
+        annotation_metrics.rebuild_all()
+
+    def _grow(self) -> None:
+        """У рази більше рядків скрізь: категорій, відео, анотацій, фігур і версій."""
+        self._seed(categories=25, videos_per_category=12)
+        self.annotation.set_shapes(_shapes(40, offset=100))
+        self.annotation.version += 1
+        self.annotation.save()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        _replica_reads_default(self)
+        news = mock.patch("dashboard.views.afetch_sport_news", mock.AsyncMock(return_value=[]))
+        news.start()
+        self.addCleanup(news.stop)
+
+    def _urls(self) -> dict:
+        video_ids = ",".join(str(pk) for pk in AttemptVideo.objects.order_by("id").values_list("id", flat=True)[:50])
+        return {
+            "index": reverse("index"),
+            "upload": reverse("upload"),
+            "library": reverse("library"),
+            "leaderboard": reverse("leaderboard"),
+            "search": reverse("search") + "?q=Стадіон",
+            "progress": reverse("progress"),
+            "progress_api": reverse("progress_api"),
+            "export_attempts": reverse("export_attempts", args=["ndjson"]),
+            "edit_category": reverse("edit_category", args=[self.category.pk]),
+            "category_detail": reverse("category_detail", args=[self.category.pk]),
+            "edit_video": reverse("edit_video", args=[self.video.pk]),
+            "annotations_list": reverse("annotations_list"),
+            "annotate_video": reverse("annotate_video", args=[self.video.pk]),
+            "annotations_api": reverse("annotations_api", args=[self.video.pk]),
+            "annotations_batch": reverse("annotations_batch") + f"?ids={video_ids}",
+            "annotation_revisions": reverse("annotation_revisions", args=[self.video.pk]),
+            "annotation_revision": reverse("annotation_revision", args=[self.video.pk, 1]),
+            "api-category-list": reverse("api-category-list", kwargs={"version": "v1"}),
+            "api-category-detail": reverse("api-category-detail", kwargs={"version": "v1", "pk": self.category.pk}),
+            "api-video-list": reverse("api-video-list", kwargs={"version": "v1"}),
+            "api-video-detail": reverse("api-video-detail", kwargs={"version": "v1", "pk": self.video.pk}),
+            "api-annotation-list": reverse("api-annotation-list", kwargs={"version": "v1"}),
+            "api-annotation-detail": reverse(
+                "api-annotation-detail", kwargs={"version": "v1", "pk": self.annotation.pk},
+            ),
+            "debug_news": reverse("debug_news"),
+        }
+
+    def _count_queries(self, url: str) -> int:
+        cache.clear()
+        unique = {id(conn): conn for conn in connections.all()}.values()
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in unique]
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return sum(len(queries) for queries in captured)
+
+    def test_seed_exercises_compaction_and_metrics(self):
+        # інакше бюджети міряли б гілки без фігур, метрик і прев'ю
+        self.assertTrue(AnnotationMetric.objects.exists())
+        self.assertTrue(AnnotationShape.objects.exists())
+        for data in AttemptVideoAnnotation.objects.values_list("data", flat=True):
+            self.assertTrue(all("qpts" in shape and "pts" not in shape for shape in data["shapes"]))
+        for url in (reverse("annotations_list"), reverse("category_detail", args=[self.category.pk])):
+            self.assertContains(self.client.get(url), "<polyline")
+
+    def test_every_route_has_a_budget(self):
+        routes = set(_route_names(urlpatterns))
+        self.assertEqual(routes - NOT_BUDGETED - set(QUERY_BUDGETS), set())
+        self.assertEqual(set(QUERY_BUDGETS) - routes, set())
+
+    def test_query_count_does_not_grow_with_data(self):
+        small = {name: self._count_queries(url) for name, url in self._urls().items()}
+        self._grow()
+        large = {name: self._count_queries(url) for name, url in self._urls().items()}
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(route=name):
+                # менше — можна (напр., у пошуку на великих даних топ-N з одного виду), більше — ні
+                self.assertLessEqual(large[name], small[name], f"{name}: queries grow with data (N+1?)")
+                self.assertLessEqual(large[name], budget)
+
+
+class SeasonFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("coach", "coach@example.com", "pass")
+        for year in (2023, 2024):
+            AttemptCategory.objects.create(
+                attempt_type=AttemptCategory.AttemptType.TRAINING, place=f"Стадіон {year}", date=date(year, 5, 1),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        _replica_reads_default(self)
+
+    def test_library_season(self):
+        response = self.client.get(reverse("library"), {"season": "2024"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["season"], 2024)
+        self.assertContains(response, "Стадіон 2024")
+        self.assertNotContains(response, "Стадіон 2023")
+
+    def test_library_ignores_out_of_range_season(self):
+        for raw in ("99999", "0", "9" * 5000, "²", "-1"):
+            with self.subTest(season=raw[:10]):
+                response = self.client.get(reverse("library"), {"season": raw})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context["season"], "")
+
+    def test_export_ignores_out_of_range_season(self):
+        url = reverse("export_attempts", args=["ndjson"])
+        for raw in ("99999", "0", "²"):
+            with self.subTest(season=raw):
+                response = self.client.get(url, {"season": raw})
+                self.assertEqual(response.status_code, 200)
+                # стрім має дочитатися до кінця, без ValueError посередині
+                b"".join(response.streaming_content)
+
+
+class VideoResultTests(TestCase):
+    UNPARSED = ("X", "NM", "DNF", "7.45 (+1.2)", "10.8w")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = AttemptCategory.objects.create(
+            attempt_type=AttemptCategory.AttemptType.TRAINING, place="Київ", date=date(2024, 6, 1),
+        )
+
+    def test_form_accepts_unparsed_results(self):
+        for result in self.UNPARSED:
+            with self.subTest(result=result):
+                form = AttemptVideoForm(
+                    {"category": self.category.pk, "event_type": "jump", "result": result, "attempt_number": 1},
+                    {"video": SimpleUploadedFile("a.mp4", b"\x00", content_type="video/mp4")},
+                )
+                self.assertTrue(form.is_valid(), form.errors)
+
+    def test_unparsed_result_is_stored_without_value(self):
+        for n, result in enumerate(self.UNPARSED, 1):
+            video = AttemptVideo.objects.create(
+                category=self.category, video="attempt_videos/r.mp4", event_type="jump", result=result,
+                attempt_number=n,
+            )
+            video.refresh_from_db()
+            self.assertEqual((video.result, video.result_value, video.points), (result, None, None))
+
+    def test_form_rejects_event_from_another_discipline(self):
+        form = AttemptVideoForm(
+            {"category": self.category.pk, "event_type": "jump", "discipline": "sp", "result": "7.45",
+             "attempt_number": 1},
+            {"video": SimpleUploadedFile("a.mp4", b"\x00", content_type="video/mp4")},
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("discipline", form.errors)
+
+
+class ScoringTests(SimpleTestCase):
+    # (event_type, результат, очікувана таблиця) — без явної дисципліни
+    INFERRED = [
+        ("run", 10.50, "100m"),
+        ("run", 21.0, "200m"),
+        ("run", 48.0, "400m"),
+        ("run", 125.0, "800m"),
+        ("run", 240.0, "1500m"),
+        ("jump", 2.10, "hj"),
+        ("jump", 7.45, "lj"),
+        ("jump", 14.5, "tj"),
+        ("throw", 16.0, "sp"),
+        ("throw", 50.0, "dt"),
+        ("throw", 80.0, "jt"),
+    ]
+
+    @staticmethod
+    def _table_points(code: str, value: float) -> int:
+        _event, a, b, c, unit, is_track, _range = SCORING_TABLES[code]
+        diff = b - value * unit if is_track else value * unit - b
+        return int(a * diff ** c)
+
+    def test_every_band_uses_its_own_table(self):
+        for event_type, value, code in self.INFERRED:
+            with self.subTest(event=event_type, value=value):
+                points = points_for(event_type, value)
+                self.assertEqual(points, self._table_points(code, value))
+                self.assertEqual(points_for(event_type, value, code), points)
+                self.assertTrue(300 < points < 1300, points)
+
+    def test_reported_marks(self):
+        # 200 м за 21.0 с — не 0 за таблицею 100 м; 800 м за 2:05 і потрійний 14.5 м — не тисячі очок
+        self.assertEqual(points_for("run", 21.0), 985)
+        self.assertEqual(points_for("run", 125.0), 1039)
+        self.assertEqual(points_for("jump", 14.5), 836)
+
+    def test_explicit_discipline_for_overlapping_marks(self):
+        # 5.50 м: жердина чи довжина; 60 м: диск чи спис — за числом не відрізнити
+        self.assertEqual(points_for("jump", 5.50, "pv"), self._table_points("pv", 5.50))
+        self.assertEqual(points_for("jump", 5.50), self._table_points("lj", 5.50))
+        self.assertEqual(points_for("throw", 60.0, "jt"), self._table_points("jt", 60.0))
+        self.assertEqual(points_for("throw", 60.0), self._table_points("dt", 60.0))
+        # дисципліна з чужої групи ігнорується
+        self.assertEqual(points_for("jump", 7.45, "sp"), points_for("jump", 7.45))
+
+    def test_out_of_range_is_null(self):
+        for event_type, value, discipline in [
+            ("run", 9.0, ""), ("run", 40.0, ""), ("run", 90.0, ""), ("run", 600.0, ""),
+            ("jump", 0.5, ""), ("jump", 19.0, ""), ("throw", 1.0, ""), ("throw", 120.0, ""),
+            ("run", 21.0, "100m"), ("jump", 7.0, "hj"), ("run", None, ""),
+        ]:
+            with self.subTest(event=event_type, value=value, discipline=discipline):
+                self.assertIsNone(points_for(event_type, value, discipline))
+
+
+class NewsInflightTests(SimpleTestCase):
+    FEEDS = ["https://example.com/rss"]
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.fetches = 0
+
+    async def _slow_feed(self, client, url):
+        self.fetches += 1
+        await asyncio.sleep(0.2)
+        return [{"title": "t", "link": url, "summary": "", "image": None, "date": "2025-01-01", "source": "s"}]
+
+    def test_parallel_loops_on_cold_cache(self):
+        # як під WSGI: кожен потік — свій asyncio.run (async_to_sync), кеш холодний
+        barrier = threading.Barrier(2)
+        results, errors = [], []
+
+        def worker():
+            barrier.wait()
+            try:
+                results.append(asyncio.run(utils.afetch_sport_news(feeds=self.FEEDS, lang="uk")))
+            except Exception as exc:
+                errors.append(exc)
+
+        with mock.patch("dashboard.utils._afetch_feed", self._slow_feed):
+            threads = [threading.Thread(target=worker) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], results[1])
+        # завершені Task-и прибрано; loop-и, що вже зникли, випадають із WeakKeyDictionary самі
+        self.assertFalse(any(utils._news_inflight.values()))
+
+    def test_same_loop_requests_share_one_fetch(self):
+        async def two_requests():
+            return await asyncio.gather(*(utils.afetch_sport_news(feeds=self.FEEDS, lang="uk") for _ in range(2)))
+
+        with mock.patch("dashboard.utils._afetch_feed", self._slow_feed):
+            first, second = asyncio.run(two_requests())
+        self.assertEqual(first, second)
+        self.assertEqual(self.fetches, 1)
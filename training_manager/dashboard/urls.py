@@ -1,7 +1,16 @@
 # training_manager/dashboard/urls.py
-from django.urls import path
+from django.urls import include, path, re_path
 from django.views.i18n import set_language, JavaScriptCatalog  # + JS i18n
-from . import views
+from rest_framework.routers import DefaultRouter
+
+from . import api, views
+
+# REST API (лише читання), версія в шляху: /api/v1/...
+api_router = DefaultRouter()
+api_router.APIRootView = api.ApiRootView
+api_router.register("categories", api.CategoryViewSet, basename="api-category")
+api_router.register("videos", api.VideoViewSet, basename="api-video")
+api_router.register("annotations", api.AnnotationViewSet, basename="api-annotation")
 
 urlpatterns = [
     # --- Публічні ---
@@ -18,6 +27,11 @@ urlpatterns = [
     path("home/", views.dashboard_home, name="home"),
     path("upload/", views.upload, name="upload"),
     path("library/", views.library_view, name="library"),
+    path("leaderboard/", views.leaderboard, name="leaderboard"),
+    path("search/", views.search_view, name="search"),
+    path("progress/", views.progress_view, name="progress"),
+    path("api/analytics/progress/", views.progress_api, name="progress_api"),
+    path("export/attempts.<str:fmt>", views.export_attempts, name="export_attempts"),
     path("logout/", views.logout_view, name="logout"),
 
     # --- Категорії ---
@@ -33,7 +47,23 @@ urlpatterns = [
     path("annotations/", views.annotations_list, name="annotations_list"),
     path("annotate/<int:video_id>/", views.annotate_video, name="annotate_video"),
     path("api/videos/<int:video_id>/annotations/", views.annotations_api, name="annotations_api"),
+    path("api/annotations/batch/", views.annotations_batch, name="annotations_batch"),
+    path("api/videos/<int:video_id>/annotations/revisions/", views.annotation_revisions, name="annotation_revisions"),
+    path(
+        "api/videos/<int:video_id>/annotations/revisions/<int:version>/",
+        views.annotation_revision,
+        name="annotation_revision",
+    ),
+    path(
+        "api/videos/<int:video_id>/annotations/revisions/<int:version>/restore/",
+        views.annotation_revision_restore,
+        name="annotation_revision_restore",
+    ),
+
+    # --- REST API ---
+    re_path(r"^api/(?P<version>v1)/", include(api_router.urls)),
 
     # --- Debug ---
     path("debug/news", views.debug_news, name="debug_news"),
+    path("metrics", views.metrics, name="metrics"),
 ]
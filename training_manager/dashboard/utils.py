@@ -1,6 +1,8 @@
 # training_manager/dashboard/utils.py
 import re
+import asyncio
 import hashlib
+import weakref
 from datetime import datetime, timezone
 from dateutil import parser as date_parser
 
@@ -9,8 +11,11 @@ from django.core.cache import cache
 from django.utils.translation import get_language, gettext as _
 
 import feedparser
+import httpx
 import requests
 
+from .metrics import cache_lookup, track_outbound
+
 
 # =========================
 # Helpers / infrastructure
@@ -47,6 +52,7 @@ def _ua_headers(lang: str | None = None):
 
 def _cache_get_or_set(key: str, fetch_fn, ttl_seconds: int):
     data = cache.get(key)
+    cache_lookup(key, hit=data is not None)
     if data is not None:
         return data
     data = fetch_fn()
@@ -57,6 +63,74 @@ def _cache_get_or_set(key: str, fetch_fn, ttl_seconds: int):
 # =========================
 # News (RSS) — ONLY
 # =========================
+def _news_cache_key(lang: str, feed_urls, limit: int) -> str:
+    # Кеш розділяємо по мові та набору фідів
+    cache_fingerprint = f"{lang}|{ '|'.join(feed_urls) }|{limit}"
+    return "sport_news__" + hashlib.md5(cache_fingerprint.encode()).hexdigest()
+
+
+def _feed_items(feed) -> list:
+    """Розібраний feedparser-ом фід -> список новин {title, link, summary, image, date, source}."""
+    items = []
+    source_title = (getattr(feed, "feed", {}) or {}).get("title") or _("Джерело")
+
+    for e in getattr(feed, "entries", []):
+        title = (getattr(e, "title", "") or "").strip()
+        link = (getattr(e, "link", "") or "").strip()
+        summary = _clean_html(getattr(e, "summary", ""))[:220] if hasattr(e, "summary") else ""
+
+        # дата
+        dt = None
+        for field in ("published", "updated", "created"):
+            if hasattr(e, field):
+                try:
+                    dt = date_parser.parse(getattr(e, field))
+                    break
+                except Exception:
+                    pass
+        if not dt:
+            dt = datetime.now(timezone.utc)
+
+        # картинка
+        image = None
+        media = getattr(e, "media_content", None)
+        if media and isinstance(media, list):
+            for m in media:
+                if m.get("url"):
+                    image = m["url"]
+                    break
+        if not image:
+            thumbs = getattr(e, "media_thumbnail", None)
+            if thumbs and isinstance(thumbs, list):
+                for t in thumbs:
+                    if t.get("url"):
+                        image = t["url"]
+                        break
+        if not image:
+            for l in (getattr(e, "links", []) or []):
+                if l.get("rel") == "enclosure" and "image" in (l.get("type") or ""):
+                    image = l.get("href")
+                    break
+
+        items.append(
+            {
+                "title": title,
+                "link": link,
+                "summary": summary,
+                "image": image,
+                "date": dt,          # форматування дати робиться у шаблоні відповідно до мови
+                "source": source_title,
+            }
+        )
+    return items
+
+
+def _latest(items: list, limit: int) -> list:
+    # свіже вище
+    items.sort(key=lambda x: x["date"], reverse=True)
+    return items[:limit]
+
+
 def fetch_sport_news(
     limit: int = 9,
     feeds=None,
@@ -72,14 +146,13 @@ def fetch_sport_news(
                   (у views.index уже підставляється мапа за мовою)
     :param ttl_seconds: TTL кешу
     :param lang: примусова локаль (якщо None — поточна мова інтерфейсу)
+
+    Асинхронний варіант (фіди паралельно) — afetch_sport_news.
     """
     # Визначаємо мову
     lang = lang or get_language() or getattr(settings, "LANGUAGE_CODE", "en")
     feed_urls = feeds if feeds else getattr(settings, "SPORT_NEWS_FEEDS", [])
-
-    # Кеш розділяємо по мові та набору фідів
-    cache_fingerprint = f"{lang}|{ '|'.join(feed_urls) }|{limit}"
-    cache_key = "sport_news__" + hashlib.md5(cache_fingerprint.encode()).hexdigest()
+    cache_key = _news_cache_key(lang, feed_urls, limit)
 
     def _fetch():
         items = []
@@ -87,69 +160,81 @@ def fetch_sport_news(
             try:
                 # спочатку пробуємо завантажити з нашими headers (вкл. Accept-Language)
                 try:
-                    resp = requests.get(url, timeout=10, headers=_ua_headers(lang))
-                    resp.raise_for_status()
+                    with track_outbound("news"):
+                        resp = requests.get(url, timeout=10, headers=_ua_headers(lang))
+                        resp.raise_for_status()
                     feed = feedparser.parse(resp.content)
                 except Exception:
                     # fallback — нехай feedparser сам сходить
                     feed = feedparser.parse(url)
-
-                source_title = (getattr(feed, "feed", {}) or {}).get("title") or _("Джерело")
-
-                for e in getattr(feed, "entries", []):
-                    title = (getattr(e, "title", "") or "").strip()
-                    link = (getattr(e, "link", "") or "").strip()
-                    summary = _clean_html(getattr(e, "summary", ""))[:220] if hasattr(e, "summary") else ""
-
-                    # дата
-                    dt = None
-                    for field in ("published", "updated", "created"):
-                        if hasattr(e, field):
-                            try:
-                                dt = date_parser.parse(getattr(e, field))
-                                break
-                            except Exception:
-                                pass
-                    if not dt:
-                        dt = datetime.now(timezone.utc)
-
-                    # картинка
-                    image = None
-                    media = getattr(e, "media_content", None)
-                    if media and isinstance(media, list):
-                        for m in media:
-                            if m.get("url"):
-                                image = m["url"]
-                                break
-                    if not image:
-                        thumbs = getattr(e, "media_thumbnail", None)
-                        if thumbs and isinstance(thumbs, list):
-                            for t in thumbs:
-                                if t.get("url"):
-                                    image = t["url"]
-                                    break
-                    if not image:
-                        for l in (getattr(e, "links", []) or []):
-                            if l.get("rel") == "enclosure" and "image" in (l.get("type") or ""):
-                                image = l.get("href")
-                                break
-
-                    items.append(
-                        {
-                            "title": title,
-                            "link": link,
-                            "summary": summary,
-                            "image": image,
-                            "date": dt,          # форматування дати робиться у шаблоні відповідно до мови
-                            "source": source_title,
-                        }
-                    )
+                items.extend(_feed_items(feed))
             except Exception:
                 # якщо помилка з конкретним фідом — пропускаємо
                 continue
-
-        # свіже вище
-        items.sort(key=lambda x: x["date"], reverse=True)
-        return items[:limit]
+        return _latest(items, limit)
 
     return _cache_get_or_set(cache_key, _fetch, ttl_seconds)
+
+
+# запити до фідів, що вже виконуються: event loop -> {ключ кешу: Task}. Паралельні
+# запити на холодний кеш чекають один і той самий збір, а не ходять у мережу кожен.
+# Task належить своєму loop: під WSGI кожен async-view крутиться у власному loop
+# (async_to_sync), тож спільний на процес dict віддав би чужий Task -> RuntimeError.
+_news_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _afetch_feed(client, url: str) -> list:
+    try:
+        try:
+            with track_outbound("news"):
+                resp = await client.get(url)
+                resp.raise_for_status()
+            # розбір — CPU, не тримаємо event loop
+            feed = await asyncio.to_thread(feedparser.parse, resp.content)
+        except Exception:
+            # fallback — нехай feedparser сам сходить (блокуючий — у потоці)
+            feed = await asyncio.to_thread(feedparser.parse, url)
+        return await asyncio.to_thread(_feed_items, feed)
+    except Exception:
+        # якщо помилка з конкретним фідом — пропускаємо
+        return []
+
+
+async def _afetch_all(feed_urls, lang: str, limit: int, cache_key: str, ttl_seconds: int) -> list:
+    async with httpx.AsyncClient(timeout=10, headers=_ua_headers(lang), follow_redirects=True) as client:
+        results = await asyncio.gather(*(_afetch_feed(client, url) for url in feed_urls))
+    items = _latest([item for feed_items in results for item in feed_items], limit)
+    await cache.aset(cache_key, items, ttl_seconds)
+    return items
+
+
+async def afetch_sport_news(
+    limit: int = 9,
+    feeds=None,
+    ttl_seconds: int = 60 * 30,
+    lang: str | None = None,
+):
+    """
+    Асинхронний fetch_sport_news для async-view під ASGI: той самий кеш і формат,
+    фіди завантажуються паралельно (httpx.AsyncClient + gather), кеш — aget/aset.
+    Воркер не блокується, поки чекає на повільні фіди.
+    """
+    lang = lang or get_language() or getattr(settings, "LANGUAGE_CODE", "en")
+    feed_urls = feeds if feeds else getattr(settings, "SPORT_NEWS_FEEDS", [])
+    cache_key = _news_cache_key(lang, feed_urls, limit)
+
+    items = await cache.aget(cache_key)
+    cache_lookup(cache_key, hit=items is not None)
+    if items is not None:
+        return items
+
+    inflight = _news_inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_afetch_all(feed_urls, lang, limit, cache_key, ttl_seconds))
+        inflight[cache_key] = task
+        task.add_done_callback(lambda _t: inflight.pop(cache_key, None))
+    # shield: скасування одного запиту (клієнт пішов) не скасовує збір для інших
+    return await asyncio.shield(task)
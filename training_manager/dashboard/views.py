@@ -1,8 +1,10 @@
 # training_manager/dashboard/views.py
 import json
 import logging
+import calendar
+import math
 import hmac
-from datetime import timedelta
+from datetime import MAXYEAR, MINYEAR, date, timedelta
 
 from django.conf import settings
 from django.contrib.auth import login as django_login, logout as django_logout
@@ -10,18 +12,42 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count
-from django.http import HttpResponseBadRequest, HttpResponseRedirect, JsonResponse
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q
+from django.db.models.functions import Coalesce, TruncMonth
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.crypto import get_random_string
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import parse_etags, urlencode
 from django.utils.translation import activate, get_language, gettext as _
 from django.views.decorators.http import require_http_methods, require_POST
 
+from asgiref.sync import sync_to_async
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation, OTPCode
-from .utils import fetch_sport_news
+from .analytics import cached_progression
+from .annotation_history import revision_shapes
+from .annotation_ops import AnnotationOpError, apply_ops
+from .annotation_preview import attach_previews
+from .annotation_shapes import shapes_in_window
+from .cache_versions import LIST_CACHE_TTL, cached_for, generation_token
+from .db_functions import JSONArrayLength
+from .db_router import read_from_replica
+from .export import EXPORT_FORMATS, export_queryset, stream_export
+from .models import AttemptCategory, AttemptVideo, AttemptVideoAnnotation, BestResult, OTPCode
+from .results import is_better
+from . import metrics as perf
+from . import search as fulltext
+from .shape_codec import decode_shapes, shapes_from_data
+from .utils import afetch_sport_news
 from .gmail_api import send_gmail
 from .forms import (
     AttemptCategoryForm,
@@ -43,18 +69,25 @@ REFRESH_MAX_AGE = int(
     .total_seconds()
 )
 
+ANNOTATIONS_PAGE_SIZE = 50
+ANNOTATIONS_BATCH_MAX = 100
+LEADERBOARD_TOP_POINTS = 10
+
 
 # -------------------------
 # ПУБЛІЧНА ГОЛОВНА (LIVE)
 # -------------------------
-def index(request):
+async def index(request):
     """
     Головна: відео + новини (RSS).
+    Async: під ASGI холодний кеш новин не блокує потік воркера — фіди
+    тягнуться паралельно (afetch_sport_news). Шаблон рендериться в потоці:
+    контекст-процесори (user, messages) читають сесію через синхронний ORM.
     """
     lang = get_language() or settings.LANGUAGE_CODE
     feeds = getattr(settings, "SPORT_NEWS_FEEDS_MAP", {}).get(lang, settings.SPORT_NEWS_FEEDS)
-    news = fetch_sport_news(limit=9, feeds=feeds)
-    return render(request, "dashboard/index.html", {"news": news})
+    news = await afetch_sport_news(limit=9, feeds=feeds)
+    return await sync_to_async(render)(request, "dashboard/index.html", {"news": news})
 
 
 def set_jwt_cookies(response, user):
@@ -86,6 +119,18 @@ def set_jwt_cookies(response, user):
     return response
 
 
+def _categories_meta():
+    """
+    Метадані категорій (id + attempt_type) для фронту — щоб ховати/показувати
+    «Місце в протоколі» лише для змагальних. Кешуються до зміни категорій.
+    """
+    return cached_for(
+        [AttemptCategory],
+        "categories_meta",
+        lambda: list(AttemptCategory.objects.values("id", "attempt_type")),
+    )
+
+
 def clear_jwt_cookies(response):
     response.delete_cookie("access_token", path="/")
     response.delete_cookie("refresh_token", path="/")
@@ -243,7 +288,7 @@ def upload(request):
     videos = AttemptVideo.objects.select_related("category").all().order_by("-id")
 
     # метадані для фронту (id + attempt_type) — для показу/приховування «Місце в протоколі»
-    categories_meta = list(AttemptCategory.objects.values("id", "attempt_type"))
+    categories_meta = _categories_meta()
 
     return render(
         request,
@@ -258,16 +303,45 @@ def upload(request):
     )
 
 
+def _parse_iso_date(raw):
+    try:
+        return date.fromisoformat((raw or "").strip())
+    except ValueError:
+        return None
+
+
+def _parse_season(raw):
+    """Рік сезону з GET або None: поза 1..9999 date__year падає з ValueError (-> 500)."""
+    raw = (raw or "").strip()
+    # isdecimal, а не isdigit: "²" — digit, але int() його не приймає
+    if not raw.isdecimal() or len(raw) > len(str(MAXYEAR)):
+        return None
+    season = int(raw)
+    return season if MINYEAR <= season <= MAXYEAR else None
+
+
 @login_required
+@read_from_replica
 def library_view(request):
     """
     Каталог категорій:
-      • фільтр за типом категорії (training/competition)
-      • сортування (дата/місце/тип/к-сть відео)
-      • підрахунок кількості відео в кожній категорії
+      • фільтр за типом категорії (training/competition), датами (від/до) та сезоном
+      • сортування (дата/місце/тип/к-сть відео) — кожен варіант має свій складений
+        індекс (див. AttemptCategory.Meta.indexes), тож без скану і тимчасового B-tree.
+        Виняток — діапазон дат/сезон разом із place_*, videos_* чи type_* (type_* —
+        коли тип не задано фільтром): SQLite бере індекс date під діапазон і сортує
+        відібрані рядки в пам'яті (USE TEMP B-TREE). Складений (date, place) цього не
+        прибирає — після діапазону за першим стовпцем порядку за другим немає; сортується
+        лише сезон/діапазон, не вся таблиця
+      • к-сть категорій по місяцях (фасети) — один GROUP BY
+      • кількість відео / кращий результат / останнє відео — денормалізовані поля
+        (без GROUP BY по таблиці відео; сортування за к-стю відео йде по індексу)
     """
     filter_attempt_type = (request.GET.get("attempt_type") or "").strip()
     sort = (request.GET.get("sort") or "date_desc").strip()
+    date_from = _parse_iso_date(request.GET.get("date_from"))
+    date_to = _parse_iso_date(request.GET.get("date_to"))
+    season = _parse_season(request.GET.get("season"))
 
     qs = AttemptCategory.objects.all()
 
@@ -275,25 +349,63 @@ def library_view(request):
     valid_types = {k for k, _ in AttemptCategory.AttemptType.choices}
     if filter_attempt_type in valid_types:
         qs = qs.filter(attempt_type=filter_attempt_type)
+    else:
+        filter_attempt_type = ""
+
+    # діапазон дат; сезон = календарний рік (date BETWEEN — іде по індексу)
+    if date_from:
+        qs = qs.filter(date__gte=date_from)
+    if date_to:
+        qs = qs.filter(date__lte=date_to)
+    if season:
+        qs = qs.filter(date__year=season)
+
+    # фасети за місяцями для поточних фільтрів — кешуються до зміни категорій
+    facet_key = f"library_months__{filter_attempt_type}__{date_from}__{date_to}__{season}"
+    month_facets = cached_for(
+        [AttemptCategory],
+        facet_key,
+        lambda: [
+            {
+                "month": row["month"],
+                "count": row["count"],
+                "date_from": row["month"].isoformat(),
+                "date_to": row["month"].replace(
+                    day=calendar.monthrange(row["month"].year, row["month"].month)[1]
+                ).isoformat(),
+            }
+            for row in qs.order_by()
+            .annotate(month=TruncMonth("date"))
+            .values("month")
+            .annotate(count=Count("id"))
+            .order_by("-month")
+        ],
+    )
+    seasons = cached_for(
+        [AttemptCategory],
+        "library_seasons",
+        lambda: [d.year for d in AttemptCategory.objects.dates("date", "year", order="DESC")],
+    )
 
-    # кількість відео (related_name='videos' у FK)
-    qs = qs.annotate(videos_count=Count("videos"))
-
-    # сортування
+    # сортування: однаковий напрям усіх полів + id як тай-брейк,
+    # щоб індекс читався прямо або задом наперед без дозбирання
     order_map = {
-        "date_desc": ("-date", "place"),
-        "date_asc": ("date", "place"),
-        "place_asc": ("place", "-date"),
-        "place_desc": ("-place", "-date"),
-        "type_asc": ("attempt_type", "-date"),
-        "type_desc": ("-attempt_type", "-date"),
-        "videos_desc": ("-videos_count", "-date"),
-        "videos_asc": ("videos_count", "-date"),
+        "date_desc": ("-date", "-id"),
+        "date_asc": ("date", "id"),
+        "place_asc": ("place", "date", "id"),
+        "place_desc": ("-place", "-date", "-id"),
+        "type_asc": ("attempt_type", "date", "id"),
+        "type_desc": ("-attempt_type", "-date", "-id"),
+        "videos_desc": ("-videos_count", "-date", "-id"),
+        "videos_asc": ("videos_count", "date", "id"),
     }
-    qs = qs.order_by(*order_map.get(sort, ("-date", "place")))
+    if sort not in order_map:
+        sort = "date_desc"
+    qs = qs.order_by(*order_map[sort])
 
-    # пагінація
-    page_obj = Paginator(qs, 12).get_page(request.GET.get("page"))
+    # пагінація — ліниво: при влучанні у кеш фрагмента запитів до БД немає зовсім
+    page_number = request.GET.get("page") or "1"
+    page_obj = SimpleLazyObject(lambda: Paginator(qs, 12).get_page(page_number))
 
     return render(
         request,
@@ -303,17 +415,34 @@ def library_view(request):
             "attempt_type_choices": AttemptCategory.AttemptType.choices,
             "filter_attempt_type": filter_attempt_type,
             "sort": sort,
+            "date_from": date_from.isoformat() if date_from else "",
+            "date_to": date_to.isoformat() if date_to else "",
+            "season": season or "",
+            "seasons": seasons,
+            "month_facets": month_facets,
+            "page_number": page_number,
+            # поточні фільтри для посилань пагінації
+            "filter_query": urlencode({
+                "attempt_type": filter_attempt_type,
+                "sort": sort,
+                "date_from": date_from.isoformat() if date_from else "",
+                "date_to": date_to.isoformat() if date_to else "",
+                "season": season or "",
+            }),
+            "cache_gen": generation_token(AttemptCategory, AttemptVideo),
+            "cache_ttl": LIST_CACHE_TTL,
         },
     )
 
 
 @login_required
+@read_from_replica
 def category_detail(request, pk: int):
     """
     Сторінка категорії:
       • фільтр за дисципліною відео
       • сортування: спроба ↑/↓, час ↑/↓, додані новіші/старіші,
-        + результат (залежно від дисципліни)
+        очки (між дисциплінами), + результат (залежно від дисципліни)
       • без сортування за місцем
     """
     category = get_object_or_404(AttemptCategory, pk=pk)
@@ -336,6 +465,8 @@ def category_detail(request, pk: int):
         "time_desc": ("-time", "-id"),
         "created_desc": ("-id",),  # новіші першими
         "created_asc": ("id",),  # старіші першими
+        # очки порівнювані між дисциплінами (індекс category+points)
+        "points_desc": (F("points").desc(nulls_last=True), "-id"),
     }
 
     # динамічне сортування за результатом
@@ -346,34 +477,186 @@ def category_detail(request, pk: int):
             result_sort_disabled = True
         else:
             result_sort_disabled = False
+            # числовий result_value (індекс category+event_type+result_value);
+            # нерозпізнані результати — завжди в кінці
+            asc = (F("result_value").asc(nulls_last=True), "id")
+            desc = (F("result_value").desc(nulls_last=True), "-id")
             if filter_event == AttemptVideo.EventType.RUN:
                 # для бігу менше — краще
-                order_fields = ("result", "id") if sort == "result_best" else ("-result", "-id")
+                order_fields = asc if sort == "result_best" else desc
             elif filter_event in (AttemptVideo.EventType.JUMP, AttemptVideo.EventType.THROW):
                 # для стрибків/метань більше — краще
-                order_fields = ("-result", "-id") if sort == "result_best" else ("result", "id")
+                order_fields = desc if sort == "result_best" else asc
             else:
                 order_fields = base_order_map["attempt_asc"]
     else:
         order_fields = base_order_map.get(sort, base_order_map["attempt_asc"])
         result_sort_disabled = False
 
-    videos = videos.order_by(*order_fields)
+    videos = videos.order_by(*order_fields).annotate(annotation_updated_at=F("annotation__updated_at"))
 
     return render(
         request,
         "dashboard/category_detail.html",
         {
             "category": category,
-            "videos": videos,
+            # лінь: запит і мініатюри — лише коли фрагмент {% cache %} не в кеші
+            "videos": SimpleLazyObject(lambda: attach_previews(videos)),
             "event_choices": AttemptVideo.EventType.choices,
             "filter_event": filter_event,
             "sort": sort,
             "result_sort_disabled": result_sort_disabled,
+            "cache_gen": generation_token(AttemptVideo, AttemptVideoAnnotation),
+            "cache_ttl": LIST_CACHE_TTL,
+        },
+    )
+
+
+@login_required
+def leaderboard(request):
+    """
+    Найкращі результати сезону та PB (дисципліна × тип спроби) — один запит
+    до матеріалізованої BestResult; плюс топ за очками — індексований сорт.
+    """
+    bests = list(
+        BestResult.objects.select_related("video__category").order_by(
+            "-season", "event_type", "attempt_type"
+        )
+    )
+
+    # PB — найкращий серед сезонних рекордів свого кошика
+    personal_bests = {}
+    for best in bests:
+        key = (best.event_type, best.attempt_type)
+        current = personal_bests.get(key)
+        if current is None or is_better(best.event_type, best.result_value, current.result_value):
+            personal_bests[key] = best
+
+    seasons = {}
+    for best in bests:
+        seasons.setdefault(best.season, []).append(best)
+
+    top_by_points = (
+        AttemptVideo.objects.filter(points__isnull=False)
+        .select_related("category")
+        .order_by("-points", "-id")[:LEADERBOARD_TOP_POINTS]
+    )
+
+    return render(
+        request,
+        "dashboard/leaderboard.html",
+        {
+            "personal_bests": sorted(
+                personal_bests.values(), key=lambda b: (b.event_type, b.attempt_type)
+            ),
+            "seasons": list(seasons.items()),
+            "top_by_points": top_by_points,
+        },
+    )
+
+
+def _int_param(request, name: str, default: int, lo: int, hi: int) -> int:
+    try:
+        return min(max(int(request.GET.get(name, default)), lo), hi)
+    except ValueError:
+        return default
+
+
+@login_required
+def progress_view(request):
+    """Сторінка графіків прогресу; дані підтягує JS з progress_api."""
+    return render(
+        request,
+        "dashboard/progress.html",
+        {
+            "attempt_type_choices": AttemptCategory.AttemptType.choices,
+            "event_choices": AttemptVideo.EventType.choices,
         },
     )
 
 
+@login_required
+def progress_api(request):
+    """
+    GET /api/analytics/progress/?attempt_type=&window=5&best_of=3
+    Ряди по дисциплінах: результати, rolling mean, best-of-N, смуга ±std, темп покращення.
+    """
+    attempt_type = (request.GET.get("attempt_type") or "").strip()
+    if attempt_type not in {k for k, _ in AttemptCategory.AttemptType.choices}:
+        attempt_type = None
+
+    data = cached_progression(
+        attempt_type=attempt_type,
+        window=_int_param(request, "window", 5, 1, 100),
+        best_of=_int_param(request, "best_of", 3, 1, 50),
+        max_points=_int_param(request, "max_points", 500, 10, 5000),
+    )
+    return JsonResponse({"ok": True, **data})
+
+
+@login_required
+def search_view(request):
+    """
+    GET /search/?q=київ 2024 — ранжований повнотекстовий пошук (FTS5, префікси).
+    Повертає JSON: категорії та відео впереміш за релевантністю.
+    """
+    query = (request.GET.get("q") or "").strip()
+    limit = _int_param(request, "limit", 20, 1, 50)
+
+    hits = fulltext.search(query, limit=limit)
+    categories = AttemptCategory.objects.in_bulk(
+        [h["id"] for h in hits if h["kind"] == fulltext.KIND_CATEGORY]
+    )
+    videos = AttemptVideo.objects.select_related("category").in_bulk(
+        [h["id"] for h in hits if h["kind"] == fulltext.KIND_VIDEO]
+    )
+
+    items = []
+    for hit in hits:
+        if hit["kind"] == fulltext.KIND_CATEGORY and hit["id"] in categories:
+            obj = categories[hit["id"]]
+            url = reverse("category_detail", args=[obj.pk])
+        elif hit["kind"] == fulltext.KIND_VIDEO and hit["id"] in videos:
+            obj = videos[hit["id"]]
+            url = reverse("annotate_video", args=[obj.pk]) + f"?mode=view&from=category&cat={obj.category_id}"
+        else:
+            continue  # індекс трохи відстав від даних — пропускаємо
+        items.append({
+            "kind": hit["kind"],
+            "id": obj.pk,
+            "title": str(obj),
+            "url": url,
+            "rank": round(hit["rank"], 4),
+        })
+
+    return JsonResponse({"ok": True, "query": query, "count": len(items), "items": items})
+
+
+@login_required
+@read_from_replica
+def export_attempts(request, fmt: str):
+    """
+    GET /export/attempts.csv | .ndjson — усі спроби з категорією та анотацією.
+    Фільтри: date_from, date_to, season, event, attempt_type.
+    Відповідь стрімиться (iterator пачками), пам'ять стала на будь-якому обсязі.
+    """
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(_("Невідомий формат експорту"))
+
+    # фільтри розбираються тут, до стріму: помилка всередині генератора
+    # обірвала б уже відданий 200 посеред файлу
+    qs = export_queryset(
+        date_from=_parse_iso_date(request.GET.get("date_from")),
+        date_to=_parse_iso_date(request.GET.get("date_to")),
+        season=_parse_season(request.GET.get("season")),
+        event_type=(request.GET.get("event") or "").strip(),
+        attempt_type=(request.GET.get("attempt_type") or "").strip(),
+    ).using(request.read_db)  # стрім читається вже після виходу з view — аліас явно
+    response = StreamingHttpResponse(stream_export(fmt, qs), content_type=EXPORT_FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="attempts-{date.today():%Y%m%d}.{fmt}"'
+    return response
+
+
 @require_http_methods(["GET", "POST"])
 @login_required
 def edit_category(request, category_id):
@@ -414,9 +697,7 @@ def edit_video(request, video_id):
     else:
         form = AttemptVideoForm(instance=video)
 
-    # метадані категорій для фронту (id + attempt_type),
-    # щоб ховати/показувати "Місце в протоколі" лише для змагальних
-    categories_meta = list(AttemptCategory.objects.values("id", "attempt_type"))
+    categories_meta = _categories_meta()
 
     return render(
         request,
@@ -478,11 +759,11 @@ def settings_view(request):
 # -------------------------
 # DEBUG-ЕНДПОЇНТИ (опційно)
 # -------------------------
-def debug_news(request):
+async def debug_news(request):
     """
     GET /debug/news — перевірка RSS. Повертає JSON із 5 останніх.
     """
-    items = fetch_sport_news(limit=5)
+    items = await afetch_sport_news(limit=5)
     serialized = [
         {
             **i,
@@ -493,6 +774,22 @@ def debug_news(request):
     return JsonResponse({"ok": True, "count": len(serialized), "items": serialized})
 
 
+def metrics(request):
+    """
+    GET /metrics — метрики процесу в текстовому форматі Prometheus (див. metrics.py).
+    Доступ: заголовок "Authorization: Bearer <METRICS_TOKEN>"; якщо токен не
+    задано — лише staff-користувачам або в DEBUG.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        allowed = hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = settings.DEBUG or request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(perf.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @login_required
 def annotate_video(request, video_id):
     """
@@ -520,41 +817,319 @@ def annotate_video(request, video_id):
     )
 
 
-@require_http_methods(["GET", "POST"])
+def _parse_seconds(raw, default: float) -> float | None:
+    """Параметр часу відео: порожній -> default, невалідний/від'ємний -> None."""
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) and value >= 0 else None
+
+
+def _annotation_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _expected_version(request, body=None):
+    """
+    Версія, на яку розраховує клієнт: If-Match: "7" (або W/"7"), інакше body["version"].
+    Немає — None; "*" — будь-яка наявна (None теж).
+    """
+    for tag in parse_etags(request.headers.get("If-Match", "")):
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.isdigit():
+            return int(tag)
+    version = (body or {}).get("version")
+    return version if isinstance(version, int) and version >= 0 else None
+
+
+def _write_annotation(request, video, expected_version, mutate):
+    """
+    Атомарний запис фігур з перевіркою версії.
+    mutate(ann) змінює ann.data (може кинути AnnotationOpError).
+    Повертає (анотація, True) або (анотація зі свіжою версією, False) при конфлікті.
+    """
+    with transaction.atomic():
+        ann, _created = AttemptVideoAnnotation.objects.select_for_update().get_or_create(video=video)
+        if expected_version is not None and ann.version != expected_version:
+            return ann, False
+        # умовний UPDATE без зміни значень — compare-and-swap: на SQLite
+        # select_for_update нічого не блокує, а цей запис бере write-lock і
+        # відсікає паралельного автора (версію в БД збільшує save() нижче)
+        locked = AttemptVideoAnnotation.objects.filter(pk=ann.pk, version=ann.version).update(
+            version=F("version")
+        )
+        if not locked:
+            ann.refresh_from_db(fields=["version"])
+            return ann, False
+
+        mutate(ann)
+        ann.version += 1
+        ann.updated_by = request.user
+        ann.save(update_fields=["data", "updated_by", "updated_at", "version"])
+    return ann, True
+
+
+def _annotation_write_response(ann, ok: bool):
+    if not ok:
+        response = JsonResponse(
+            {"ok": False, "error": _("Анотації вже змінив інший користувач"), "version": ann.version},
+            status=412,
+        )
+    else:
+        response = JsonResponse({"ok": True, "version": ann.version, "updated_at": ann.updated_at.isoformat()})
+    response["ETag"] = _annotation_etag(ann.version)
+    return response
+
+
+@require_http_methods(["GET", "POST", "PATCH"])
 @login_required
 def annotations_api(request, video_id):
+    """
+    GET   — {"shapes": [...], "version": N} + ETag "N";
+            ?from=&to= (секунди) — лише фігури, видимі в цьому вікні часу
+    POST  — повна заміна {"shapes": [...]}; If-Match необов'язковий
+    PATCH — {"ops": [...]} (annotation_ops.py); If-Match обов'язковий,
+            застаріла версія -> 412 з актуальною версією
+    """
     video = get_object_or_404(AttemptVideo, id=video_id)
 
     if request.method == "GET":
         ann = getattr(video, "annotation", None)
-        shapes = ann.data.get("shapes", []) if ann and isinstance(ann.data, dict) else []
-        return JsonResponse({"shapes": shapes})
+        version = ann.version if ann else 0
+        payload = {"version": version}
+        if "from" in request.GET or "to" in request.GET:
+            t_from = _parse_seconds(request.GET.get("from"), 0.0)
+            t_to = _parse_seconds(request.GET.get("to"), float("inf"))
+            if t_from is None or t_to is None or t_from > t_to:
+                return HttpResponseBadRequest(_("Невалідне вікно часу"))
+            payload["shapes"] = shapes_in_window(ann.pk, t_from, t_to) if ann else []
+            payload["from"] = t_from
+            payload["to"] = t_to if t_to != float("inf") else None
+        else:
+            payload["shapes"] = ann.get_shapes() if ann else []
+        response = JsonResponse(payload)
+        response["ETag"] = _annotation_etag(version)
+        return response
 
-    # POST
     try:
         body = json.loads(request.body.decode("utf-8"))
     except Exception:
         return HttpResponseBadRequest(_("Невалідний JSON"))
+    if not isinstance(body, dict):
+        return HttpResponseBadRequest(_("Невалідний JSON"))
 
+    expected_version = _expected_version(request, body)
+
+    if request.method == "PATCH":
+        if expected_version is None:
+            return JsonResponse({"ok": False, "error": _("Потрібен заголовок If-Match з версією")}, status=428)
+        ops = body.get("ops")
+        try:
+            ann, ok = _write_annotation(
+                request, video, expected_version, lambda a: a.set_shapes(apply_ops(a.get_shapes(), ops))
+            )
+        except AnnotationOpError as exc:
+            return HttpResponseBadRequest(str(exc))
+        return _annotation_write_response(ann, ok)
+
+    # POST
     shapes = body.get("shapes", None)
     if not isinstance(shapes, list):
         return HttpResponseBadRequest(_("`shapes` має бути списком"))
 
-    ann, created = AttemptVideoAnnotation.objects.get_or_create(video=video)
-    ann.data = {"shapes": shapes}
-    ann.updated_by = request.user
-    ann.save(update_fields=["data", "updated_by", "updated_at"])
-    return JsonResponse({"ok": True, "updated_at": ann.updated_at.isoformat()})
+    ann, ok = _write_annotation(request, video, expected_version, lambda a: a.set_shapes(shapes))
+    return _annotation_write_response(ann, ok)
+
+
+@require_http_methods(["GET"])
+@login_required
+def annotations_batch(request):
+    """
+    GET ?ids=1,2,3 — фігури анотацій багатьох відео одним запитом
+    (до ANNOTATIONS_BATCH_MAX id). Відео без анотації — у "missing".
+    """
+    ids = []
+    for part in (request.GET.get("ids") or "").split(","):
+        part = part.strip()
+        if not part.isdigit():
+            if part:
+                return JsonResponse({"ok": False, "error": _("Невалідний id відео")}, status=400)
+            continue
+        if int(part) not in ids:
+            ids.append(int(part))
+    if not ids:
+        return JsonResponse({"ok": False, "error": _("Потрібен параметр ids")}, status=400)
+    if len(ids) > ANNOTATIONS_BATCH_MAX:
+        return JsonResponse(
+            {"ok": False, "error": _("Забагато id (максимум %(n)s)") % {"n": ANNOTATIONS_BATCH_MAX}}, status=400
+        )
 
+    rows = AttemptVideoAnnotation.objects.filter(video_id__in=ids).values_list(
+        "video_id", "version", "updated_at", "data"
+    )
+    items = {
+        str(video_id): {"version": version, "updated_at": updated_at.isoformat(), "shapes": shapes_from_data(data)}
+        for video_id, version, updated_at, data in rows
+    }
+    return JsonResponse({
+        "ok": True,
+        "items": items,
+        "missing": [video_id for video_id in ids if str(video_id) not in items],
+    })
 
+
+REVISIONS_PAGE_SIZE = 50
+
+
+def _revision_item(revision) -> dict:
+    return {
+        "version": revision.version,
+        "kind": revision.kind,
+        "shapes_count": revision.shapes_count,
+        "created_by": revision.created_by.username if revision.created_by else None,
+        "created_at": revision.created_at.isoformat(),
+    }
+
+
+@require_http_methods(["GET"])
+@login_required
+def annotation_revisions(request, video_id):
+    """
+    GET — версії анотації, новіші першими (keyset: ?before=<version>).
+    """
+    ann = get_object_or_404(AttemptVideoAnnotation, video_id=video_id)
+    revisions = ann.revisions.select_related("created_by").defer("payload").order_by("-version")
+    before = request.GET.get("before", "")
+    if before.isdigit():
+        revisions = revisions.filter(version__lt=int(before))
+    page = list(revisions[: REVISIONS_PAGE_SIZE + 1])
+    has_more = len(page) > REVISIONS_PAGE_SIZE
+    page = page[:REVISIONS_PAGE_SIZE]
+    return JsonResponse({
+        "ok": True,
+        "version": ann.version,
+        "items": [_revision_item(r) for r in page],
+        "next_before": page[-1].version if has_more else None,
+    })
+
+
+@require_http_methods(["GET"])
 @login_required
+def annotation_revision(request, video_id, version):
+    """GET — фігури конкретної версії (знімок + дельти)."""
+    ann = get_object_or_404(AttemptVideoAnnotation, video_id=video_id)
+    revision = get_object_or_404(ann.revisions.select_related("created_by").defer("payload"), version=version)
+    shapes = revision_shapes(ann.pk, version)
+    return JsonResponse({"ok": True, **_revision_item(revision), "shapes": decode_shapes(shapes or [])})
+
+
+@require_POST
+@login_required
+def annotation_revision_restore(request, video_id, version):
+    """
+    POST — відновлює версію як НОВУ версію (історія не переписується).
+    If-Match з поточною версією необов'язковий; застаріла -> 412.
+    """
+    video = get_object_or_404(AttemptVideo, id=video_id)
+    ann = get_object_or_404(AttemptVideoAnnotation, video=video)
+    shapes = revision_shapes(ann.pk, version)
+    if shapes is None:
+        return JsonResponse({"ok": False, "error": _("Версію не знайдено")}, status=404)
+
+    def restore(a):
+        # фігури вже компактні — без повторного спрощення
+        a.data = {"shapes": shapes}
+
+    ann, ok = _write_annotation(request, video, _expected_version(request), restore)
+    return _annotation_write_response(ann, ok)
+
+
+def _parse_keyset_cursor(raw):
+    """
+    Курсор keyset-пагінації: "<YYYY-MM-DD>_<category_id>_<video_id>".
+    Невалідний курсор -> None (перша сторінка).
+    """
+    try:
+        d, cat_id, video_id = (raw or "").split("_")
+        return date.fromisoformat(d), int(cat_id), int(video_id)
+    except ValueError:
+        return None
+
+
+@login_required
+@read_from_replica
 def annotations_list(request):
+    """
+    Список відео для анотування:
+      • keyset-пагінація (без OFFSET/COUNT — швидко на будь-якому обсязі)
+      • для кожного рядка: чи є анотація, к-сть фігур, дата оновлення (один LEFT JOIN)
+      • фільтри: анотовані/без анотацій, дисципліна
+    """
+    filter_event = (request.GET.get("event") or "").strip()
+    filter_annotated = (request.GET.get("annotated") or "").strip()  # "yes" | "no" | ""
+    cursor = _parse_keyset_cursor(request.GET.get("after"))
+
     videos = (
-        AttemptVideo.objects.select_related("category").order_by(
-            "-category__date", "event_type", "attempt_number"
+        AttemptVideo.objects.select_related("category")
+        .annotate(
+            has_annotation=ExpressionWrapper(
+                Q(annotation__isnull=False), output_field=BooleanField()
+            ),
+            shapes_count=Coalesce(JSONArrayLength("annotation__data", path="$.shapes"), 0),
+            annotation_updated_at=F("annotation__updated_at"),
         )
     )
-    return render(request, "dashboard/annotations_list.html", {"videos": videos})
+
+    valid_events = {k for k, _ in AttemptVideo.EventType.choices}
+    if filter_event in valid_events:
+        videos = videos.filter(event_type=filter_event)
+    else:
+        filter_event = ""
+
+    if filter_annotated == "yes":
+        videos = videos.filter(has_annotation=True)
+    elif filter_annotated == "no":
+        videos = videos.filter(has_annotation=False)
+    else:
+        filter_annotated = ""
+
+    # (date, category_id, id) — стабільний порядок для курсора (останній рядок попередньої
+    # сторінки). Повністю з індексу його не віддати: ORDER BY іде по двох таблицях, тож
+    # SQLite сортує в пам'яті (USE TEMP B-TREE) — без ANALYZE весь ORDER BY, з ANALYZE
+    # лише праву частину (category_id, id) у межах кожної дати. Сортується лише відібране
+    # курсором і фільтрами, а LIMIT обриває після першої сторінки — глибокі сторінки швидкі
+    if cursor:
+        d, cat_id, video_id = cursor
+        videos = videos.filter(
+            Q(category__date__lt=d)
+            | Q(category__date=d, category_id__lt=cat_id)
+            | Q(category__date=d, category_id=cat_id, id__lt=video_id)
+        )
+    videos = videos.order_by("-category__date", "-category_id", "-id")
+
+    # +1 рядок, щоб дізнатися, чи є наступна сторінка
+    page = list(videos[: ANNOTATIONS_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(page) > ANNOTATIONS_PAGE_SIZE:
+        page = page[:ANNOTATIONS_PAGE_SIZE]
+        last = page[-1]
+        next_cursor = f"{last.category.date.isoformat()}_{last.category_id}_{last.id}"
+
+    return render(
+        request,
+        "dashboard/annotations_list.html",
+        {
+            "videos": attach_previews(page),
+            "event_choices": AttemptVideo.EventType.choices,
+            "filter_event": filter_event,
+            "filter_annotated": filter_annotated,
+            "next_cursor": next_cursor,
+            "is_first_page": cursor is None,
+        },
+    )
 
 
 @require_POST
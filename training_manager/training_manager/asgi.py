@@ -2,6 +2,9 @@
 ASGI config for training_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSocket connections (live annotation editing) go to
+``dashboard.live``. Run with an ASGI server, e.g.
+``uvicorn training_manager.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +15,16 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'training_manager.settings')
+# до імпорту settings: під ASGI інший дефолт CONN_MAX_AGE (див. settings.DATABASES)
+os.environ.setdefault('DJANGO_SERVER_INTERFACE', 'asgi')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# після django.setup() у get_asgi_application — модуль імпортує моделі
+from dashboard.live import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
 
+    "rest_framework",
     "dashboard",
 
     # --- JWT: блэкліст refresh токенів (потребує міграцій) ---
@@ -40,13 +41,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # метрики (/metrics) — першим, щоб латентність охоплювала весь ланцюжок
+    "dashboard.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # стиснення (gzip / brotli для JSON) — якомога вище, щоб бачити фінальне тіло
+    "dashboard.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # ВАЖЛИВО: LocaleMiddleware ПІСЛЯ Session і ПЕРЕД Common
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # після запису сесія читає з default, доки репліка не наздожене
+    "dashboard.middleware.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -73,13 +80,48 @@ TEMPLATES = [
 WSGI_APPLICATION = "training_manager.wsgi.application"
 
 # --- База даних ---
+# dashboard.sqlite_backend — sqlite3 + WAL/busy_timeout/mmap, BEGIN IMMEDIATE і
+# повтор при "database is locked"; PRAGMA можна перевизначити в OPTIONS["pragmas"]
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "dashboard.sqlite_backend",
         "NAME": BASE_DIR / "db.sqlite3",
+        # з'єднання живе між запитами (а не відкривається щоразу); перевірка перед використанням.
+        # Під ASGI (asgi.py ставить DJANGO_SERVER_INTERFACE) за замовчуванням 0: sync-код
+        # іде в потоки sync_to_async, і постійні з'єднання там накопичуються (документація Django)
+        "CONN_MAX_AGE": int(os.getenv(
+            "DB_CONN_MAX_AGE", "0" if os.getenv("DJANGO_SERVER_INTERFACE") == "asgi" else "600",
+        )),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {
+                "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            },
+        },
     }
 }
 
+# Репліка для важких сторінок на читання (dashboard.db_router, @read_from_replica).
+# Вмикається DB_REPLICA_NAME. Локально — друга SQLite-копія, яку оновлює
+# `manage.py snapshot_replica` (запустити перед стартом і далі періодично).
+# query_only — захист від випадкового запису в копію (тож і BEGIN лише DEFERRED:
+# IMMEDIATE бере write-lock); у тестах — дзеркало default.
+if os.getenv("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / os.getenv("DB_REPLICA_NAME"),
+        "OPTIONS": {
+            **DATABASES["default"]["OPTIONS"],
+            "transaction_mode": "DEFERRED",
+            "pragmas": {**DATABASES["default"]["OPTIONS"]["pragmas"], "query_only": 1},
+        },
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["dashboard.db_router.ReplicaRouter"]
+# без мітки синхронізації (не snapshot_replica) — скільки секунд після запису читати з default
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "30"))
+
 # --- Паролі ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -177,6 +219,29 @@ SIMPLE_JWT = {
     # SIGNING_KEY за замовчуванням SECRET_KEY; ALGORITHM = 'HS256'
 }
 
+# --- Анотації: допуск спрощення ліній олівця (частка кадру, shape_codec) ---
+ANNOTATION_RDP_TOLERANCE = float(os.getenv("ANNOTATION_RDP_TOLERANCE", "0.0008"))
+# пропорції кадру (ширина/висота) для метрик фігур без поля "ar" (annotation_metrics)
+ANNOTATION_FRAME_ASPECT = float(os.getenv("ANNOTATION_FRAME_ASPECT", str(16 / 9)))
+
+# --- Живе редагування анотацій (dashboard/live.py, WebSocket через asgi.py) ---
+# бекенд pub/sub: InMemoryPubSub — один процес; для кількох воркерів — зовнішній
+ANNOTATION_PUBSUB_BACKEND = os.getenv("ANNOTATION_PUBSUB_BACKEND", "dashboard.pubsub.InMemoryPubSub")
+LIVE_FLUSH_SECONDS = float(os.getenv("LIVE_FLUSH_SECONDS", "1.0"))  # затримка запису ops у БД
+LIVE_FLUSH_MAX_OPS = int(os.getenv("LIVE_FLUSH_MAX_OPS", "200"))     # або одразу після стількох ops
+
+# --- REST API (dashboard/api.py): сесія або JWT ---
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "dashboard.authentication.CookieJWTAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
+    "ALLOWED_VERSIONS": ["v1"],
+    "DEFAULT_VERSION": "v1",
+}
+
 # --- Cookie-політики ---
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
@@ -189,10 +254,35 @@ SECURE_HSTS_SECONDS = int(os.getenv("SECURE_HSTS_SECONDS", "0"))
 SECURE_HSTS_INCLUDE_SUBDOMAINS = os.getenv("SECURE_HSTS_INCLUDE_SUBDOMAINS", "False") == "True"
 SECURE_HSTS_PRELOAD = os.getenv("SECURE_HSTS_PRELOAD", "False") == "True"
 
+# --- Метрики (dashboard.metrics, GET /metrics) ---
+# Bearer-токен для Prometheus; без нього /metrics бачать лише staff (або DEBUG)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- Повільні запити (dashboard.slow_queries, `manage.py slow_query_report`) ---
+# поріг у мс (0 — вимкнено); запис — JSON-рядок із планом EXPLAIN QUERY PLAN
+# за замовчуванням файл у BASE_DIR (у .gitignore разом із ротованими .1, .2, ...)
+SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", str(BASE_DIR / "slow_queries.log"))
+
 # --- Логи ---
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_queries": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": SLOW_QUERY_LOG,
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
+            "encoding": "utf-8",
+            "delay": True,  # файл з'являється лише з першим повільним запитом
+            "formatter": "message",
+        },
+    },
+    "loggers": {
+        "dashboard.slow_queries": {"handlers": ["slow_queries"], "level": "INFO", "propagate": False},
+    },
     "root": {"handlers": ["console"], "level": "INFO" if DEBUG else "WARNING"},
 }